@@ -0,0 +1,109 @@
+"""
+Headless stand-ins for the hardware and network modules, shared by the
+benchmark scripts — the same stubs the test-suite uses, plus googletrans and
+firebase_admin so the translation and storage paths can be timed offline.
+"""
+import os
+import sys
+import time
+import types
+from unittest.mock import MagicMock
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+class StubEngine:
+    """pyttsx3 engine with an optional simulated per-line speaking delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self._pending = 0
+        self.spoken = 0
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return None
+
+    def say(self, text):
+        self._pending += 1
+
+    def runAndWait(self):
+        if self.delay:
+            time.sleep(self.delay * self._pending)
+        self.spoken += self._pending
+        self._pending = 0
+
+    def stop(self):
+        self._pending = 0
+
+
+class StubTranslator:
+    """googletrans.Translator replacement — Devanagari in, fixed English out."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def translate(self, text, src='hi', dest='en'):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        english = '\n'.join(' '.join(f"word{len(w)}" for w in line.split())
+                            for line in text.split('\n')) if src == 'hi' else text
+        return types.SimpleNamespace(text=english, src=src)
+
+
+class StubRef:
+    """firebase_admin.db.reference stand-in that keeps writes in memory."""
+
+    def __init__(self):
+        self.data = {}
+
+    def child(self, path):
+        ref = self
+
+        class _Child:
+            def set(self, value):
+                ref.data[path] = value
+        return _Child()
+
+    def update(self, values):
+        self.data.update(values)
+
+
+def _stub_module(name, **attrs):
+    mod = types.ModuleType(name)
+    for k, v in attrs.items():
+        setattr(mod, k, v)
+    sys.modules[name] = mod
+    return mod
+
+
+class StubAudioData:
+    """sr.AudioData: raw PCM frames with their rate and sample width."""
+
+    def __init__(self, frame_data, sample_rate, sample_width):
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+
+def install(tts_delay: float = 0.0, translate_latency: float = 0.0):
+    """Install the stubs and put src/ on sys.path. Returns the stub objects."""
+    if SRC not in sys.path:
+        sys.path.insert(0, SRC)
+    engine = StubEngine(tts_delay)
+    translator = StubTranslator(translate_latency)
+    _stub_module('pyaudio', PyAudio=MagicMock, paInt16=8)
+    _stub_module('pyttsx3', init=lambda *a, **k: engine)
+    _stub_module('speech_recognition',
+                 Recognizer=MagicMock,
+                 Microphone=MagicMock,
+                 AudioData=StubAudioData,
+                 UnknownValueError=type('UnknownValueError', (Exception,), {}),
+                 RequestError=type('RequestError', (Exception,), {}),
+                 WaitTimeoutError=type('WaitTimeoutError', (Exception,), {}))
+    _stub_module('googletrans', Translator=lambda *a, **k: translator)
+    return types.SimpleNamespace(engine=engine, translator=translator)
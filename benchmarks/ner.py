@@ -0,0 +1,128 @@
+"""
+Entity-stage benchmark: gazetteer automaton against nltk's maxent ne_chunk.
+
+Times only the entity stage, over pre-tokenised and pre-tagged sentences of
+a reference corpus. The corpus is the NLTK treebank sample when its data
+is installed (--corpus treebank); otherwise it is a synthetic corpus in
+the assistant's domain, with medicine and place names mixed into everyday
+sentences. The gazetteer holds the domain phrases plus --entries generated
+filler phrases, so its size can be scaled:
+
+    python benchmarks/ner.py --sentences 2000 --entries 50000
+    python benchmarks/ner.py --corpus treebank --json ner.json
+
+The maxent cases are skipped if the chunker's data isn't installed.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _stubs  # noqa: E402
+from run import _EN_WORDS, format_table, measure  # noqa: E402
+
+MEDICINES = ['paracetamol', 'Dolo 650', 'Crocin', 'metformin', 'amlodipine', 'vitamin D3',
+             'azithromycin', 'pantoprazole', 'cetirizine', 'ORS']
+PLACES = ['Connaught Place', 'Lajpat Nagar', 'Chandni Chowk', 'Karol Bagh', 'New Delhi',
+          'Safdarjung Hospital', 'AIIMS', 'Noida Sector 18']
+
+
+def domain_gazetteer(entries: int, seed: int = 5):
+    from visual_assistant.gazetteer import Gazetteer
+    rng = random.Random(seed)
+    syllables = ['ka', 'lo', 'mi', 'ra', 'zen', 'tor', 'vex', 'pil', 'dra', 'sul']
+    filler = [(' '.join(''.join(rng.choices(syllables, k=3)) for _ in range(rng.randint(1, 3))), 'MEDICINE')
+              for _ in range(entries)]
+    return Gazetteer([(m, 'MEDICINE') for m in MEDICINES] + [(p, 'GPE') for p in PLACES] + filler)
+
+
+def synthetic_corpus(sentences: int, seed: int = 7) -> list:
+    """Token lists: everyday words with a domain phrase in about half the sentences."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(sentences):
+        words = rng.choices(_EN_WORDS, k=rng.randint(6, 16))
+        if rng.random() < 0.5:
+            phrase = rng.choice(MEDICINES + PLACES).split()
+            at = rng.randint(0, len(words))
+            words[at:at] = phrase
+        words[0] = words[0].capitalize()
+        out.append(words + ['.'])
+    return out
+
+
+def treebank_corpus(sentences: int):
+    """Tagged sentences of nltk's treebank sample, or None if it isn't installed."""
+    try:
+        from nltk.corpus import treebank
+        return [[(w, t) for w, t in s if t != '-NONE-'] for s in treebank.tagged_sents()[:sentences]]
+    except LookupError:
+        return None
+
+
+def run_cases(sentences: int, entries: int, corpus: str, repeat: int) -> list:
+    _stubs.install()
+    from visual_assistant.pipeline import load_chunker, load_tagger
+
+    tagged = treebank_corpus(sentences) if corpus == 'treebank' else None
+    if tagged is None:
+        if corpus == 'treebank':
+            print("treebank data not installed — using the synthetic corpus.")
+        tokens = synthetic_corpus(sentences)
+        try:
+            tagged = load_tagger().tag_sents(tokens)
+        except LookupError:
+            tagged = None
+    else:
+        tokens = [[w for w, _ in s] for s in tagged]
+    n_tokens = sum(len(s) for s in tokens)
+
+    results = []
+    gazetteer = domain_gazetteer(entries)
+    result = measure(f"ner/gazetteer/{len(gazetteer)}",
+                     lambda: [gazetteer.find(s) for s in tokens], repeat, units=n_tokens)
+    result['entities'] = sum(len(gazetteer.find(s)) for s in tokens)
+    results.append(result)
+
+    try:
+        chunker = load_chunker() if tagged is not None else None
+    except LookupError:
+        chunker = None
+    if chunker is None:
+        print("maxent chunker (or tagger) data not installed — ne_chunk cases skipped.")
+        return results
+    result = measure("ner/maxent", lambda: list(chunker.parse_sents(tagged)),
+                     max(1, repeat // 5), units=n_tokens)
+    result['entities'] = sum(1 for tree in chunker.parse_sents(tagged)
+                             for node in tree if hasattr(node, 'label'))
+    results.append(result)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sentences', type=int, default=1000)
+    parser.add_argument('--entries', type=int, default=10000, help="Filler gazetteer phrases.")
+    parser.add_argument('--corpus', choices=('synthetic', 'treebank'), default='synthetic')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help="Write the results to this file.")
+    parser.add_argument('--verbose', action='store_true', help="Keep application logging on.")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    results = run_cases(args.sentences, args.entries, args.corpus, args.repeat)
+    print(format_table(results).replace('units/s', 'tokens/s'))
+    for r in results:
+        print(f"{r['case']}: {r['entities']} entities")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'results': results}, fh, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
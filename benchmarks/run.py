@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the analysis and speech paths.
+
+Runs headless against the stubbed pyttsx3 / speech_recognition / googletrans
+modules in _stubs.py and times process_text (English, native Hindi and
+translated Hindi) over synthetic corpora from 1 to 10k sentences, plus
+speak, _safe_translate (googletrans stub and the offline dictionary backend) and
+store_in_firebase. Reports p50/p95/p99 latency, throughput and peak traced
+memory, and can save or gate against a JSON baseline:
+
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --max-slowdown 1.25
+
+The gate compares p50 latency per case and exits 1 on any regression.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _stubs  # noqa: E402
+
+DEFAULT_SIZES = (1, 10, 100, 1000, 10000)
+
+_EN_WORDS = (
+    "the doctor said my mother should take her medicine twice a day "
+    "please call the pharmacy near Connaught Place before five and ask "
+    "whether the new tablets arrived I feel much better today but the "
+    "cough is still bad at night John will drive us to the hospital"
+).split()
+_HI_WORDS = (
+    "डॉक्टर ने कहा माँ को दिन में दो बार दवा लेनी चाहिए कृपया फार्मेसी को "
+    "फोन करो और पूछो नई गोलियाँ आईं आज मैं बेहतर महसूस कर रहा हूँ"
+).split()
+
+
+# ─────────────────────────────────────────────
+# Synthetic corpora — deterministic for a given seed
+# ─────────────────────────────────────────────
+def english_corpus(sentences: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(sentences):
+        words = rng.choices(_EN_WORDS, k=rng.randint(5, 14))
+        out.append(' '.join(words).capitalize() + rng.choice('..!?'))
+    return ' '.join(out)
+
+
+def hindi_corpus(sentences: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    return ' '.join(' '.join(rng.choices(_HI_WORDS, k=rng.randint(4, 10))) + '।'
+                    for _ in range(sentences))
+
+
+# ─────────────────────────────────────────────
+# Measurement
+# ─────────────────────────────────────────────
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def measure(name: str, fn, iterations: int, units: int = 1, setup=None) -> dict:
+    """Time fn() iterations times, then once more under tracemalloc for peak memory."""
+    timings = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(iterations):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'case': name,
+        'iterations': iterations,
+        'p50_ms': _percentile(timings, 50) * 1000,
+        'p95_ms': _percentile(timings, 95) * 1000,
+        'p99_ms': _percentile(timings, 99) * 1000,
+        'throughput_per_s': units * iterations / total if total else 0.0,
+        'peak_kib': peak / 1024,
+    }
+
+
+def _iterations(repeat: int, sentences: int) -> int:
+    """Scale iterations down for big corpora so a full run stays in minutes."""
+    return max(3, min(repeat, 2000 // max(sentences, 1)))
+
+
+# ─────────────────────────────────────────────
+# Cases
+# ─────────────────────────────────────────────
+def run_cases(sizes, repeat: int, translate_latency: float = 0.0) -> list:
+    stubs = _stubs.install(translate_latency=translate_latency)
+    from visual_assistant import visually
+
+    assistant = visually.VisuallyImpairedAssistant()
+    results = []
+
+    def wait_for_speech():
+        assistant.speech.flush()
+
+    def cold():
+        # Every iteration analyses and translates from scratch.
+        visually._analysis_cache.clear()
+        visually._translation_cache.clear()
+
+    for n in sizes:
+        text = english_corpus(n)
+        results.append(measure(
+            f"process_text/en/{n}",
+            lambda: (assistant.process_text(text), wait_for_speech()),
+            _iterations(repeat, n), units=n, setup=cold,
+        ))
+
+    # The same turns repeated: every sentence comes from the analysis cache.
+    for n in sizes:
+        text = english_corpus(n)
+        assistant.process_text(text)
+        results.append(measure(
+            f"process_text/en_cached/{n}",
+            lambda: (assistant.process_text(text), wait_for_speech()),
+            _iterations(repeat, n), units=n,
+        ))
+
+    for n in sizes:
+        text = hindi_corpus(n)
+        results.append(measure(
+            f"process_text/hi/{n}",
+            lambda: (assistant.process_text(text, is_hindi=True), wait_for_speech()),
+            _iterations(repeat, n), units=n, setup=cold,
+        ))
+
+    # The same Hindi turns through the translate-then-analyse path, for comparison.
+    assistant.hindi_mode = 'translate'
+    for n in sizes:
+        text = hindi_corpus(n)
+        results.append(measure(
+            f"process_text/hi-translate/{n}",
+            lambda: (assistant.process_text(text, is_hindi=True), wait_for_speech()),
+            _iterations(repeat, n), units=n, setup=cold,
+        ))
+    assistant.hindi_mode = 'native'
+
+    for n in (1, 100):
+        lines = [f"Noun, singular: line {i}" for i in range(n)]
+        results.append(measure(
+            f"speak/{n}",
+            lambda: ([assistant.speak(line) for line in lines], wait_for_speech()),
+            _iterations(repeat * 5, n), units=n,
+        ))
+
+    results.append(measure(
+        "translate/miss", lambda: visually._safe_translate("नमस्ते दुनिया"),
+        repeat * 10, setup=visually._translation_cache.clear,
+    ))
+    visually._safe_translate("नमस्ते दुनिया")
+    results.append(measure(
+        "translate/hit", lambda: visually._safe_translate("नमस्ते दुनिया"), repeat * 10,
+    ))
+
+    # Speaking a translated Hindi description: one round trip per utterance
+    # (googletrans stub), then the same lines through the offline dictionary.
+    lines = [f"Noun, singular: शब्द{i} दवा" for i in range(20)]
+    calls = stubs.translator.calls
+    result = measure(
+        "speak/hi-translate/20",
+        lambda: (assistant.speak_lines(lines, is_hindi=True), wait_for_speech()),
+        repeat, units=len(lines), setup=cold,
+    )
+    result['round_trips'] = (stubs.translator.calls - calls) / (repeat + 1)
+    results.append(result)
+
+    from visual_assistant.translation import DictionaryBackend
+    visually._translation_backend = DictionaryBackend({'शब्द': 'word', 'दवा': 'medicine'})
+    results.append(measure(
+        "translate/dictionary/20", lambda: visually._safe_translate_many(lines),
+        repeat * 10, units=len(lines), setup=visually._translation_cache.clear,
+    ))
+    visually._translation_backend = None
+
+    # Trimming and resampling a 5 s, 44.1 kHz capture (1.5 s of silence
+    # either side) before upload.
+    from visual_assistant import audio as audio_prep
+    if audio_prep.numpy_available():
+        import numpy as np
+        t = np.arange(2 * 44100) / 44100
+        voiced = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+        silence = np.zeros(int(1.5 * 44100))
+        capture = _stubs.StubAudioData(
+            audio_prep.encode_pcm16(np.concatenate([silence, voiced, silence])), 44100, 2)
+        preprocessor = audio_prep.AudioPreprocessor()
+        result = measure("preprocess/44k-5s", lambda: preprocessor.process(capture), repeat * 5)
+        result['upload_ratio'] = preprocessor.stats()['ratio']
+        results.append(result)
+
+    visually.FIREBASE_ENABLED = True
+    visually.firebase_ref = _stubs.StubRef()
+    payload = {'raw_text': english_corpus(3), 'processed': ["\nAnalysing sentence 1: x"] * 3}
+    results.append(measure(
+        "store_in_firebase", lambda: assistant.store_in_firebase(payload), repeat * 10,
+    ))
+
+    assistant.speech.close()
+    logging.debug("Stub translator calls: %d", stubs.translator.calls)
+    return results
+
+
+# ─────────────────────────────────────────────
+# Reporting and regression gate
+# ─────────────────────────────────────────────
+def format_table(results: list) -> str:
+    lines = [f"{'case':<32} {'iters':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} "
+             f"{'units/s':>12} {'peak KiB':>10}"]
+    for r in results:
+        lines.append(f"{r['case']:<32} {r['iterations']:>6} {r['p50_ms']:>10.3f} "
+                     f"{r['p95_ms']:>10.3f} {r['p99_ms']:>10.3f} "
+                     f"{r['throughput_per_s']:>12.1f} {r['peak_kib']:>10.1f}")
+    return '\n'.join(lines)
+
+
+def compare(results: list, baseline: dict, max_slowdown: float) -> list:
+    """Return human-readable regressions (p50 slower than baseline * max_slowdown)."""
+    base = {r['case']: r for r in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        old = base.get(r['case'])
+        if not old or old['p50_ms'] <= 0:
+            continue
+        ratio = r['p50_ms'] / old['p50_ms']
+        if ratio > max_slowdown:
+            regressions.append(f"{r['case']}: p50 {old['p50_ms']:.3f} ms -> "
+                               f"{r['p50_ms']:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=lambda s: [int(x) for x in s.split(',')],
+                        default=list(DEFAULT_SIZES), help="Comma-separated sentence counts.")
+    parser.add_argument('--repeat', type=int, default=20, help="Iterations for small cases.")
+    parser.add_argument('--json', help="Write the full results to this file.")
+    parser.add_argument('--save-baseline', help="Write results as a baseline file.")
+    parser.add_argument('--baseline', help="Compare against this baseline file.")
+    parser.add_argument('--max-slowdown', type=float, default=1.25,
+                        help="Fail if a case's p50 exceeds baseline p50 by this factor.")
+    parser.add_argument('--translate-latency', type=float, default=0.0, metavar='SECONDS',
+                        help="Simulated googletrans round trip per request.")
+    parser.add_argument('--verbose', action='store_true', help="Keep application logging on.")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    results = run_cases(args.sizes, args.repeat, args.translate_latency)
+    print(format_table(results))
+
+    document = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'results': results,
+    }
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as fh:
+                json.dump(document, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            regressions = compare(results, json.load(fh), args.max_slowdown)
+        if regressions:
+            print("\nRegressions beyond %.2fx:" % args.max_slowdown)
+            print('\n'.join(regressions))
+            return 1
+        print("\nNo regressions beyond %.2fx." % args.max_slowdown)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
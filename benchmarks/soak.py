@@ -0,0 +1,189 @@
+"""
+Soak test for the live assistant loop.
+
+Drives thousands of simulated turns (recognize_audio → process_text →
+store_in_firebase → end_turn) through the stubbed audio, TTS, translation
+and Firebase modules in _stubs.py, and samples traced Python memory, RSS,
+threads and open file descriptors along the way. Memory growth is reported
+per 1000 turns (least-squares slope after a warm-up), with the allocation
+sites that grew most:
+
+    python benchmarks/soak.py --turns 5000
+    python benchmarks/soak.py --turns 20000 --recycle-turns 2000 --max-growth-kib 256
+
+--max-growth-kib exits 1 if traced memory grows faster than that per 1000
+turns. --max-rss-mb / --recycle-turns exercise the watchdog's recycling.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _stubs  # noqa: E402
+from run import english_corpus, hindi_corpus  # noqa: E402
+
+
+class SoakRecognizer:
+    """Answers each turn with the next scripted utterance; keeps no history."""
+
+    def __init__(self, utterances):
+        self.utterances = utterances
+        self.next = None
+
+    def recognize(self, audio, language: str) -> str:
+        text, is_hindi = self.next
+        if is_hindi != (language == 'hi-IN'):
+            from visual_assistant.recognition import sr
+            raise sr.UnknownValueError()
+        return text
+
+
+class NullRef:
+    """Firebase reference that drops writes, so the stub itself doesn't grow."""
+
+    def update(self, values):
+        pass
+
+    def child(self, path):
+        return self
+
+
+def utterance_pool(size: int, seed: int = 11) -> list:
+    """A fixed pool of (text, is_hindi) turns; repeats exercise the caches as a kiosk would."""
+    rng = random.Random(seed)
+    return [(hindi_corpus(rng.randint(1, 3), seed=i), True) if rng.random() < 0.3
+            else (english_corpus(rng.randint(1, 4), seed=i), False)
+            for i in range(size)]
+
+
+def _slope(points) -> float:
+    """Least-squares slope of (x, y) points."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mx = sum(x for x, _ in points) / n
+    my = sum(y for _, y in points) / n
+    var = sum((x - mx) ** 2 for x, _ in points)
+    return sum((x - mx) * (y - my) for x, y in points) / var if var else 0.0
+
+
+def soak(turns: int, sample_every: int = 100, pool: int = 200, warmup: float = 0.1,
+         max_rss_mb=None, recycle_turns=None, top: int = 8) -> dict:
+    _stubs.install()
+    from visual_assistant import visually
+    from visual_assistant.watchdog import current_rss, open_handles
+
+    visually.FIREBASE_ENABLED = True
+    visually.firebase_ref = NullRef()
+    assistant = visually.VisuallyImpairedAssistant(microphone=False)
+    assistant.watchdog.max_rss = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+    assistant.watchdog.max_turns = recycle_turns
+    utterances = utterance_pool(pool)
+    backend = assistant.recognizer_backend = SoakRecognizer(utterances)
+
+    tracemalloc.start(10)
+    samples, baseline = [], None
+    warmup_turns = int(turns * warmup)
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for turn in range(1, turns + 1):
+            backend.next = utterances[turn % len(utterances)]
+            text, is_hindi = assistant.recognize_audio(object())
+            processed = assistant.process_text(text, is_hindi) if text else None
+            if processed:
+                assistant.store_in_firebase({'raw_text': text, 'processed': processed})
+            assistant.end_turn()
+            assistant.speech.flush()
+
+            if turn == warmup_turns:
+                baseline = tracemalloc.take_snapshot()
+            if turn % sample_every == 0 or turn == turns:
+                assistant.firebase_writer.flush()
+                samples.append({
+                    'turn': turn,
+                    'traced_kib': tracemalloc.get_traced_memory()[0] / 1024,
+                    'rss_mib': (current_rss() or 0) / (1024 * 1024),
+                    'threads': threading.active_count(),
+                    'fds': open_handles(),
+                })
+    elapsed = time.perf_counter() - start
+
+    growth = []
+    if baseline is not None:
+        final = tracemalloc.take_snapshot()
+        for stat in final.compare_to(baseline, 'lineno')[:top]:
+            frame = stat.traceback[0]
+            growth.append({'where': f"{frame.filename}:{frame.lineno}",
+                           'size_diff_kib': stat.size_diff / 1024, 'count_diff': stat.count_diff})
+    tracemalloc.stop()
+    assistant.speech.close()
+    assistant.firebase_writer.close()
+
+    steady = [s for s in samples if s['turn'] > warmup_turns] or samples
+    return {
+        'turns': turns,
+        'seconds': elapsed,
+        'turns_per_s': turns / elapsed if elapsed else 0.0,
+        'traced_kib_per_1k_turns': _slope([(s['turn'], s['traced_kib']) for s in steady]) * 1000,
+        'rss_mib_per_1k_turns': _slope([(s['turn'], s['rss_mib']) for s in steady]) * 1000,
+        'watchdog': assistant.watchdog.stats(),
+        'samples': samples,
+        'top_growth': growth,
+    }
+
+
+def format_report(report: dict) -> str:
+    first, last = report['samples'][0], report['samples'][-1]
+    lines = [
+        f"{report['turns']} turns in {report['seconds']:.1f}s ({report['turns_per_s']:.0f} turns/s)",
+        f"traced memory: {first['traced_kib']:.0f} -> {last['traced_kib']:.0f} KiB, "
+        f"{report['traced_kib_per_1k_turns']:+.1f} KiB per 1000 turns after warm-up",
+        f"RSS: {first['rss_mib']:.1f} -> {last['rss_mib']:.1f} MiB, "
+        f"{report['rss_mib_per_1k_turns']:+.2f} MiB per 1000 turns",
+        f"threads: {first['threads']} -> {last['threads']}, open fds: {first['fds']} -> {last['fds']}",
+        f"recycles: {report['watchdog']['recycles']} (last: {report['watchdog']['last_reason']})",
+    ]
+    if report['top_growth']:
+        lines.append("largest growth since warm-up:")
+        lines += [f"  {g['size_diff_kib']:+9.1f} KiB {g['count_diff']:+7d}  {g['where']}"
+                  for g in report['top_growth']]
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--turns', type=int, default=5000)
+    parser.add_argument('--sample-every', type=int, default=100, help="Turns between samples.")
+    parser.add_argument('--pool', type=int, default=200, help="Distinct utterances cycled through.")
+    parser.add_argument('--max-rss-mb', type=float, help="Watchdog memory ceiling.")
+    parser.add_argument('--recycle-turns', type=int, help="Watchdog turn limit.")
+    parser.add_argument('--max-growth-kib', type=float,
+                        help="Fail if traced memory grows faster than this per 1000 turns.")
+    parser.add_argument('--json', help="Write the full report to this file.")
+    parser.add_argument('--verbose', action='store_true', help="Keep application logging on.")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    report = soak(args.turns, args.sample_every, args.pool,
+                  max_rss_mb=args.max_rss_mb, recycle_turns=args.recycle_turns)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+    if args.max_growth_kib is not None and report['traced_kib_per_1k_turns'] > args.max_growth_kib:
+        print(f"\nMemory grows {report['traced_kib_per_1k_turns']:.1f} KiB per 1000 turns "
+              f"(limit {args.max_growth_kib:.1f}).")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
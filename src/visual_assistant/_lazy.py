@@ -0,0 +1,29 @@
+"""Lazy module proxies — heavy or hardware-bound imports happen on first use."""
+import functools
+import importlib
+import importlib.util
+import sys
+
+
+class LazyModule:
+    """Stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        module = sys.modules.get(self._name) or importlib.import_module(self._name)
+        return getattr(module, attr)
+
+
+@functools.lru_cache(maxsize=None)
+def installed(name: str) -> bool:
+    """Whether a module can be imported, without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+nltk = LazyModule('nltk')
+sr = LazyModule('speech_recognition')
+pyttsx3 = LazyModule('pyttsx3')
+colorama = LazyModule('colorama')
+np = LazyModule('numpy')  # check installed('numpy') first; it is optional
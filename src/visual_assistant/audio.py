@@ -0,0 +1,230 @@
+"""
+Audio preprocessing for visual-impaired-assistant.
+
+listen() hands over whatever the device captured: leading and trailing
+silence, at the device's rate and sample width. Both recognition languages
+upload all of it. AudioPreprocessor cuts it down before the upload:
+
+    1. downmix to mono
+    2. trim leading/trailing silence (energy VAD over 20 ms frames)
+    3. low-pass and resample to 16 kHz (never upsampled)
+    4. quantise to 16-bit PCM
+
+recognize_google FLAC-encodes what it is given, so a smaller PCM payload
+means a smaller upload. Every step is a NumPy operation over the whole
+frame buffer. NumPy is optional and imported on first use: without it,
+audio passes through unchanged.
+"""
+import io
+import logging
+import os
+import threading
+import time
+import wave
+
+from ._lazy import installed, np
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+TARGET_RATE = 16000
+# Frames quieter than this (RMS, full scale = 1.0; about -46 dBFS) are
+# never speech, whatever the noise floor.
+MIN_THRESHOLD = 0.005
+_INT_DTYPES = {1: '<i1', 2: '<i2', 4: '<i4'}
+
+
+def numpy_available() -> bool:
+    return installed('numpy')
+
+
+# ─────────────────────────────────────────────
+# PCM conversion
+# ─────────────────────────────────────────────
+def decode_pcm(frames: bytes, sample_width: int, channels: int = 1):
+    """Signed little-endian PCM -> float32 in [-1, 1), shape (n,) or (n, channels)."""
+    usable = len(frames) - len(frames) % (sample_width * channels)
+    if sample_width == 3:
+        raw = np.frombuffer(frames, np.uint8, usable).reshape(-1, 3).astype(np.int32)
+        ints = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - (1 << 24), ints)
+    else:
+        ints = np.frombuffer(frames, _INT_DTYPES[sample_width], usable // sample_width)
+    samples = ints.astype(np.float32) / float(1 << (8 * sample_width - 1))
+    return samples.reshape(-1, channels) if channels > 1 else samples
+
+
+def encode_pcm16(samples) -> bytes:
+    return np.clip(np.round(samples * 32768.0), -32768, 32767).astype('<i2').tobytes()
+
+
+def downmix(samples):
+    return samples.mean(axis=1, dtype=np.float32) if samples.ndim > 1 else samples
+
+
+# ─────────────────────────────────────────────
+# Voice activity and resampling
+# ─────────────────────────────────────────────
+def frame_energy(samples, frame: int):
+    """RMS of each whole frame of mono samples."""
+    n = len(samples) // frame
+    if not n:
+        return np.zeros(0, np.float32)
+    blocks = samples[:n * frame].reshape(n, frame)
+    return np.sqrt(np.mean(np.square(blocks), axis=1))
+
+
+def voiced_span(samples, rate: int, frame_ms: int = 20, pad_ms: int = 200, threshold=None):
+    """
+    (start, end) sample indices from the first to the last voiced frame, padded.
+
+    threshold — RMS a frame must exceed; by default three times the noise
+                floor (10th percentile of frame energy), capped at a quarter
+                of the loudest frame and never below MIN_THRESHOLD
+
+    When no frame is voiced the whole buffer is kept: listen() already
+    heard something, and dropping it would only turn a poor transcript into none.
+    """
+    frame = max(1, rate * frame_ms // 1000)
+    energy = frame_energy(samples, frame)
+    if not energy.size:
+        return 0, len(samples)
+    if threshold is None:
+        floor = float(np.percentile(energy, 10))
+        threshold = max(MIN_THRESHOLD, min(3.0 * floor, 0.25 * float(energy.max())))
+    voiced = np.flatnonzero(energy > threshold)
+    if not voiced.size:
+        return 0, len(samples)
+    pad = rate * pad_ms // 1000
+    return max(0, voiced[0] * frame - pad), min(len(samples), (voiced[-1] + 1) * frame + pad)
+
+
+def _lowpass_kernel(cutoff: float, taps: int = 63):
+    """Hamming-windowed sinc; cutoff as a fraction of the sample rate."""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def resample(samples, src_rate: int, dst_rate: int):
+    """Linear-interpolation resampling of mono samples, low-passed first when downsampling."""
+    if src_rate == dst_rate or len(samples) < 2:
+        return samples
+    if dst_rate < src_rate:
+        # Anti-alias just below the new Nyquist frequency.
+        samples = np.convolve(samples, _lowpass_kernel(0.45 * dst_rate / src_rate), mode='same')
+    n_out = int(len(samples) * dst_rate / src_rate)
+    positions = np.arange(n_out, dtype=np.float64) * (src_rate / dst_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def preprocess_pcm(frames: bytes, sample_rate: int, sample_width: int, channels: int = 1,
+                   target_rate: int = TARGET_RATE, trim: bool = True, pad_ms: int = 200):
+    """Mono, trimmed, at most target_rate, 16-bit: returns (frames, rate, trimmed_seconds)."""
+    samples = downmix(decode_pcm(frames, sample_width, channels))
+    trimmed = 0.0
+    if trim:
+        start, end = voiced_span(samples, sample_rate, pad_ms=pad_ms)
+        trimmed = (len(samples) - (end - start)) / sample_rate
+        samples = samples[start:end]
+    rate = min(sample_rate, target_rate)
+    return encode_pcm16(resample(samples, sample_rate, rate)), rate, trimmed
+
+
+# ─────────────────────────────────────────────
+# WAV files
+# ─────────────────────────────────────────────
+def read_wav(source):
+    """(frames, rate, sample_width, channels) of a WAV path or bytes; 8-bit made signed."""
+    with wave.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source, 'rb') as wav:
+        frames = wav.readframes(wav.getnframes())
+        rate, width, channels = wav.getframerate(), wav.getsampwidth(), wav.getnchannels()
+    if width == 1:
+        frames = (np.frombuffer(frames, np.uint8) ^ 0x80).tobytes()
+    return frames, rate, width, channels
+
+
+def write_wav(target, frames: bytes, rate: int, sample_width: int = 2, channels: int = 1) -> None:
+    with wave.open(target, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+
+
+# ─────────────────────────────────────────────
+# Preprocessor
+# ─────────────────────────────────────────────
+class AudioPreprocessor:
+    """
+    Shrinks captured sr.AudioData before recognition; thread-safe counters.
+
+    target_rate — highest sample rate sent (lower rates are kept)
+    trim        — cut leading and trailing silence
+    pad_ms      — silence kept around the voiced span so word edges survive
+    """
+
+    def __init__(self, target_rate: int = TARGET_RATE, trim: bool = True, pad_ms: int = 200,
+                 enabled: bool = True):
+        self.target_rate = target_rate
+        self.trim = trim
+        self.pad_ms = pad_ms
+        self.enabled = enabled and numpy_available()
+        self.calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self.trimmed_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'AudioPreprocessor':
+        """VA_AUDIO_PREPROCESS=0 disables; VA_AUDIO_RATE sets the target rate."""
+        return cls(target_rate=int(os.environ.get('VA_AUDIO_RATE', str(TARGET_RATE))),
+                   enabled=os.environ.get('VA_AUDIO_PREPROCESS', '1') != '0')
+
+    def process(self, audio):
+        """
+        A smaller AudioData of the same type, with the capture it came from
+        as .original. Anything that isn't PCM audio (or any failure) passes
+        through unchanged.
+        """
+        frames = getattr(audio, 'frame_data', None)
+        if not self.enabled or not isinstance(frames, (bytes, bytearray)) or not frames:
+            return audio
+        start = time.perf_counter()
+        try:
+            with METRICS.timer('preprocess'):
+                out, rate, trimmed = preprocess_pcm(frames, audio.sample_rate, audio.sample_width,
+                                                    target_rate=self.target_rate, trim=self.trim,
+                                                    pad_ms=self.pad_ms)
+            processed = type(audio)(out, rate, 2)
+            # Lets backends that recognise by object (the replay stub) find the capture.
+            processed.original = getattr(audio, 'original', audio)
+        except Exception as exc:
+            logger.warning("Audio preprocessing failed (%s) — sending it unchanged.", exc)
+            return audio
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.calls += 1
+            self.bytes_in += len(frames)
+            self.bytes_out += len(out)
+            self.seconds += elapsed
+            self.trimmed_seconds += trimmed
+        METRICS.inc('audio_bytes_in', len(frames))
+        METRICS.inc('audio_bytes_out', len(out))
+        logger.debug("Audio %d -> %d bytes (%.2fs silence trimmed) in %.1f ms.",
+                     len(frames), len(out), trimmed, elapsed * 1000)
+        return processed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'bytes_saved': self.bytes_in - self.bytes_out,
+                'ratio': self.bytes_out / self.bytes_in if self.bytes_in else 1.0,
+                'seconds': self.seconds,
+                'trimmed_seconds': self.trimmed_seconds,
+            }
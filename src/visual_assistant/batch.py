@@ -0,0 +1,162 @@
+"""
+Offline corpus analysis for visual-impaired-assistant.
+
+Runs the same NLTK analysis as the live assistant over transcript files or
+stdin — no microphone, no TTS — fanned out over a process pool. Models are
+loaded once per worker, and results are written in input order, either as
+JSONL or as columnar binary blocks (results.dump) that are never rendered
+to text.
+"""
+import json
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import results as results_io
+from .gazetteer import ner_from_env
+from .pipeline import AnalysisPipeline, load_sentiment_analyzer
+from .recognition import contains_devanagari
+from .visually import _safe_translate
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state — populated once by _init_worker, reused for every chunk.
+_worker_pipeline = None
+
+
+def log_to_stderr() -> None:
+    """Move stdout log handlers to stderr so JSONL output stays clean."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+            handler.setStream(sys.stderr)
+
+
+def _init_worker() -> None:
+    """Load the analysis models once per worker process."""
+    global _worker_pipeline
+    log_to_stderr()
+    _worker_pipeline = AnalysisPipeline(load_sentiment_analyzer(), translate=_safe_translate,
+                                        **ner_from_env())
+
+
+def _analyze_chunk(records: list, translate: bool = True, render: bool = True) -> list:
+    """
+    Analyse a chunk of (record_id, source, text) tuples in one pipeline pass.
+    render=False keeps each description as an AnalysisResult.
+    """
+    flags = [contains_devanagari(text) for _, _, text in records]
+    descriptions = _worker_pipeline.describe_many(
+        [(text, is_hindi and translate) for (_, _, text), is_hindi in zip(records, flags)]
+    )
+    return [
+        {
+            'id': record_id,
+            'source': source,
+            'text': text,
+            'is_hindi': is_hindi,
+            'description': list(description) if render else description,
+        }
+        for (record_id, source, text), is_hindi, description in zip(records, flags, descriptions)
+    ]
+
+
+def iter_records(paths):
+    """Yield (record_id, source, text) for every non-blank input line."""
+    record_id = 0
+    for path in paths or ['-']:
+        if path == '-':
+            stream, source = sys.stdin, '<stdin>'
+        else:
+            stream, source = open(path, 'r', encoding='utf-8'), path
+        try:
+            for line in stream:
+                text = line.strip()
+                if text:
+                    yield record_id, source, text
+                    record_id += 1
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def _chunked(records, size: int):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze_corpus(records, workers: int = 0, chunk_size: int = 64,
+                   translate: bool = True, render: bool = True):
+    """
+    Yield one result dict per record, in input order.
+
+    Only a bounded window of chunks is in flight at a time, so arbitrarily
+    large inputs stream through with constant memory. workers=0 uses every
+    core; workers=1 runs inline.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker()
+        for chunk in _chunked(records, chunk_size):
+            yield from _analyze_chunk(chunk, translate, render)
+        return
+
+    max_inflight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in _chunked(records, chunk_size):
+            pending.append(pool.submit(_analyze_chunk, chunk, translate, render))
+            if len(pending) >= max_inflight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def run_analyze(paths, output=None, workers: int = 0,
+                chunk_size: int = 64, translate: bool = True, fmt: str = 'jsonl') -> int:
+    """Analyse paths (or stdin) and write JSONL (or fmt='columns' blocks) to output (or stdout)."""
+    if fmt == 'columns':
+        return _run_columns(paths, output, workers, chunk_size, translate)
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    count = 0
+    try:
+        for result in analyze_corpus(iter_records(paths), workers, chunk_size, translate):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    logger.info("Analysed %d utterances.", count)
+    return count
+
+
+def _run_columns(paths, output, workers: int, chunk_size: int, translate: bool,
+                 block_size: int = 1024) -> int:
+    """Write results in input order as columnar blocks of up to block_size utterances."""
+    out = open(output, 'wb') if output else sys.stdout.buffer
+    count, block = 0, []
+    try:
+        for result in analyze_corpus(iter_records(paths), workers, chunk_size, translate, render=False):
+            block.append(result['description'])
+            count += 1
+            if len(block) >= block_size:
+                results_io.dump(block, out)
+                block = []
+        if block:
+            results_io.dump(block, out)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    logger.info("Analysed %d utterances.", count)
+    return count
@@ -0,0 +1,201 @@
+"""
+Small caching helpers for visual-impaired-assistant.
+
+LRUCache is a thread-safe, bounded in-memory LRU with optional TTL, an
+optional byte budget and an optional persistent SQLite layer behind it, so
+results survive restarts. Keys and values must be JSON-serialisable when
+persistence is enabled.
+"""
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def approximate_size(key, value) -> int:
+    """Rough in-memory cost of an entry: the size of its JSON encoding."""
+    try:
+        return len(json.dumps([key, value], ensure_ascii=False, default=repr).encode('utf-8'))
+    except (TypeError, ValueError):
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Bounded LRU cache with TTL, hit/miss counters and optional disk backing.
+
+    maxsize  — entries kept in memory (least recently used evicted first)
+    max_bytes — approximate memory budget for values; None means entries only
+    sizeof   — callable(key, value) -> bytes; default approximate_size
+    ttl      — seconds an entry stays valid; None means no expiry
+    path     — SQLite file for the persistent layer; None keeps it in memory
+    disk_maxsize — rows kept on disk (least recently used evicted first)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 path: Optional[str] = None, disk_maxsize: int = 100_000, clock=time.time,
+                 max_bytes: Optional[int] = None, sizeof=approximate_size):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_maxsize = disk_maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._data: OrderedDict = OrderedDict()   # key -> (stored_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._db = None
+        if path:
+            self._open_db(path)
+
+    # ── Persistent layer ─────────────────────────────────────────────────────
+
+    def _open_db(self, path: str) -> None:
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            if self.ttl is not None:
+                self._db.execute("DELETE FROM cache WHERE stored_at < ?",
+                                 (self._clock() - self.ttl,))
+            self._db.commit()
+        except sqlite3.Error as exc:
+            # A broken cache file must never take the assistant down.
+            logger.warning("Persistent cache '%s' unavailable (%s) — memory only.", path, exc)
+            self._db = None
+
+    def _db_get(self, skey: str):
+        try:
+            row = self._db.execute(
+                "SELECT value, stored_at FROM cache WHERE key = ?", (skey,)
+            ).fetchone()
+            if row is None:
+                return _MISSING, 0.0
+            value, stored_at = row
+            if self._expired(stored_at):
+                self._db.execute("DELETE FROM cache WHERE key = ?", (skey,))
+                self._db.commit()
+                return _MISSING, 0.0
+            self._db.execute("UPDATE cache SET used_at = ? WHERE key = ?", (self._clock(), skey))
+            self._db.commit()
+            return json.loads(value), stored_at
+        except (sqlite3.Error, ValueError) as exc:
+            logger.warning("Persistent cache read failed: %s", exc)
+            return _MISSING, 0.0
+
+    def _db_put(self, skey: str, value, stored_at: float) -> None:
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (skey, json.dumps(value, ensure_ascii=False), stored_at, stored_at),
+            )
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache"
+                " ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.disk_maxsize,)
+            )
+            self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            logger.warning("Persistent cache write failed: %s", exc)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and self._clock() - stored_at > self.ttl
+
+    @staticmethod
+    def _serialise_key(key) -> str:
+        return json.dumps(key, ensure_ascii=False, separators=(',', ':'))
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._discard(key)
+
+            if self._db is not None:
+                value, stored_at = self._db_get(self._serialise_key(key))
+                if value is not _MISSING:
+                    self._store(key, value, stored_at)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            stored_at = self._clock()
+            self._store(key, value, stored_at)
+            if self._db is not None:
+                self._db_put(self._serialise_key(key), value, stored_at)
+
+    def _store(self, key, value, stored_at: float) -> None:
+        size = self._sizeof(key, value) if self.max_bytes is not None else 0
+        self._discard(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would flush everything else and still not fit
+        self._data[key] = (stored_at, value, size)
+        self._bytes += size
+        while self._data and (len(self._data) > self.maxsize or
+                              (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, _, evicted) = self._data.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def _discard(self, key) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM cache")
+                    self._db.commit()
+                except sqlite3.Error as exc:
+                    logger.warning("Persistent cache clear failed: %s", exc)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
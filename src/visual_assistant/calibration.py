@@ -0,0 +1,136 @@
+"""
+Ambient-noise calibration for visual-impaired-assistant.
+
+The recognizer's energy threshold is calibrated in full once (two seconds of
+adjust_for_ambient_noise), persisted to disk, and from then on re-estimated
+from a short probe of the silence before each phrase. A full recalibration
+only happens again when the measured noise floor drifts past drift_ratio.
+"""
+import json
+import logging
+import math
+import os
+import time
+from array import array
+from typing import Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_TYPECODES = {1: 'b', 2: 'h', 4: 'i'}
+
+
+def rms(frames: bytes, sample_width: int) -> float:
+    """Root-mean-square energy of little-endian signed PCM frames."""
+    typecode = _SAMPLE_TYPECODES.get(sample_width)
+    if typecode is None or not frames:
+        return 0.0
+    usable = len(frames) - len(frames) % sample_width
+    samples = array(typecode, frames[:usable])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class NoiseCalibrator:
+    """
+    Keeps recognizer.energy_threshold tracking the room's noise floor.
+
+    path          — JSON file the calibration is persisted to (None: don't persist)
+    full_duration — seconds of adjust_for_ambient_noise for a full calibration
+    probe_duration— seconds of silence sampled before each phrase
+    drift_ratio   — noise-floor change (either direction) that forces a full pass
+    smoothing     — weight of each new probe in the running noise-floor estimate
+    """
+
+    def __init__(self, recognizer, path: Optional[str] = None, full_duration: float = 2.0,
+                 probe_duration: float = 0.25, drift_ratio: float = 2.0, smoothing: float = 0.3):
+        self.recognizer = recognizer
+        self.path = path
+        self.full_duration = full_duration
+        self.probe_duration = probe_duration
+        self.drift_ratio = drift_ratio
+        self.smoothing = smoothing
+        self.noise_floor: Optional[float] = None
+        self.full_calibrations = 0
+        self.load()
+
+    @property
+    def ratio(self) -> float:
+        ratio = getattr(self.recognizer, 'dynamic_energy_ratio', 1.5)
+        return ratio if isinstance(ratio, (int, float)) and ratio > 0 else 1.5
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def load(self) -> bool:
+        if not self.path or not os.path.isfile(self.path):
+            return False
+        try:
+            with open(self.path, encoding='utf-8') as fh:
+                saved = json.load(fh)
+            self.noise_floor = float(saved['noise_floor'])
+            self.recognizer.energy_threshold = float(saved['energy_threshold'])
+            logger.info("Loaded noise calibration (threshold %.0f).", self.recognizer.energy_threshold)
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable calibration file '%s': %s", self.path, exc)
+            return False
+
+    def save(self) -> None:
+        if not self.path or self.noise_floor is None:
+            return
+        try:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump({
+                    'noise_floor': self.noise_floor,
+                    'energy_threshold': self.recognizer.energy_threshold,
+                    'saved_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                }, fh)
+            os.replace(tmp, self.path)
+        except (OSError, TypeError) as exc:
+            logger.warning("Could not save noise calibration: %s", exc)
+
+    # ── Calibration ──────────────────────────────────────────────────────────
+
+    @property
+    def needs_full(self) -> bool:
+        return self.noise_floor is None
+
+    def full(self, source) -> None:
+        """The classic two-second adjust_for_ambient_noise pass."""
+        with METRICS.timer('ambient_calibration'):
+            self.recognizer.adjust_for_ambient_noise(source, duration=self.full_duration)
+        self.noise_floor = self.recognizer.energy_threshold / self.ratio
+        self.full_calibrations += 1
+        self.save()
+
+    def probe(self, source) -> float:
+        """Measure the noise floor from probe_duration seconds of the open stream."""
+        chunk = getattr(source, 'CHUNK', 1024)
+        rate = getattr(source, 'SAMPLE_RATE', 16000)
+        width = getattr(source, 'SAMPLE_WIDTH', 2)
+        reads = max(1, int(math.ceil(self.probe_duration * rate / chunk)))
+        frames = b''.join(source.stream.read(chunk) for _ in range(reads))
+        return rms(frames, width)
+
+    def update(self, source) -> str:
+        """
+        Call before each listen(). Returns 'full' or 'incremental' for what ran.
+        A full pass happens on first use or when the probe shows drift.
+        """
+        if self.needs_full:
+            self.full(source)
+            return 'full'
+        with METRICS.timer('ambient_probe'):
+            measured = self.probe(source)
+        floor = max(self.noise_floor, 1.0)
+        drift = max(measured, 1.0) / floor
+        if drift > self.drift_ratio or drift < 1 / self.drift_ratio:
+            logger.info("Noise floor drifted %.1fx — recalibrating.", drift)
+            self.full(source)
+            return 'full'
+        self.noise_floor += self.smoothing * (measured - self.noise_floor)
+        self.recognizer.energy_threshold = self.noise_floor * self.ratio
+        return 'incremental'
@@ -0,0 +1,223 @@
+"""
+Gazetteer entity matching for visual-impaired-assistant.
+
+nltk's maxent NE chunker extracts features for every token and is the
+slowest stage of sentence analysis. It also doesn't know our domain
+vocabulary: medicine names, local places. A Gazetteer compiles
+user-supplied phrase lists into a token-level Aho-Corasick automaton.
+Matching is then one pass over the tokens, linear in their number
+(plus the matches found), whatever the number of phrases.
+
+The pipeline's entity engine is chosen per deployment:
+
+    maxent      ne_chunk only (the default)
+    gazetteer   the gazetteer only; the maxent chunker is never loaded
+    combined    both; where they overlap the gazetteer's phrase wins
+
+VA_NER selects the mode and VA_GAZETTEER lists the gazetteer files
+(separated by os.pathsep). Giving files without a mode means 'combined'.
+A file is JSON ({"LABEL": [phrases]}), or lines of `phrase<TAB>LABEL`.
+A line without a tab takes its label from the file name, so
+MEDICINE.txt can simply list one medicine per line.
+"""
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+NER_MODES = ('maxent', 'gazetteer', 'combined')
+
+_TOKEN = re.compile(r"\w+(?:[-']\w+)*|[^\w\s]")
+
+
+def _default_tokenize():
+    """nltk's word tokenizer without the punkt model, so phrases split like sentences do."""
+    try:
+        from nltk.tokenize import NLTKWordTokenizer
+        return NLTKWordTokenizer().tokenize
+    except ImportError:  # pragma: no cover - nltk is a hard dependency
+        return _TOKEN.findall
+
+
+class Gazetteer:
+    """
+    Labelled phrases compiled into an Aho-Corasick automaton over tokens.
+
+    entries        — {label: [phrase, ...]}, or an iterable of (phrase, label)
+    case_sensitive — compare tokens exactly; by default they are casefolded
+    tokenize       — splits a phrase into tokens as the pipeline splits text
+    """
+
+    def __init__(self, entries, case_sensitive: bool = False, tokenize=None):
+        self.case_sensitive = case_sensitive
+        tokenize = tokenize or _default_tokenize()
+        if isinstance(entries, dict):
+            entries = [(phrase, label) for label, phrases in entries.items() for phrase in phrases]
+        # Per state: token -> next state, failure link, the phrase ending
+        # here as (length, label), and the next state on the failure chain
+        # where a phrase ends.
+        self._goto = [{}]
+        self._fail = [0]
+        self._match = [None]
+        self._next_match = [0]
+        digest = hashlib.sha1()
+        phrases = 0
+        for phrase, label in entries:
+            tokens = [self._key(t) for t in tokenize(phrase)]
+            if tokens:
+                self._add(tokens, label)
+                digest.update(f"{label}\t{' '.join(tokens)}\n".encode('utf-8'))
+                phrases += 1
+        self._link()
+        self.phrases = phrases
+        self.labels = sorted({m[1] for m in self._match if m})
+        self.digest = digest.hexdigest()[:16]
+
+    @classmethod
+    def from_files(cls, paths, **options) -> 'Gazetteer':
+        """Load and merge gazetteer files (see the module docstring)."""
+        entries = []
+        for path in paths:
+            with open(path, encoding='utf-8') as fh:
+                data = fh.read()
+            if data.lstrip().startswith('{'):
+                entries += [(phrase, label) for label, phrases in json.loads(data).items()
+                            for phrase in phrases]
+                continue
+            default = os.path.splitext(os.path.basename(path))[0].upper()
+            for line in data.splitlines():
+                if not line.strip() or line.startswith('#'):
+                    continue
+                phrase, sep, label = line.partition('\t')
+                entries.append((phrase.strip(), label.strip() if sep else default))
+        return cls(entries, **options)
+
+    def __len__(self) -> int:
+        return self.phrases
+
+    # ── Matching ─────────────────────────────────────────────────────────────
+
+    def find(self, tokens) -> list:
+        """
+        (start, end, label) spans of phrases in tokens: leftmost first, the
+        longest phrase at each start, no overlaps.
+        """
+        goto, fail, match, next_match = self._goto, self._fail, self._match, self._next_match
+        longest = {}    # start -> (length, label)
+        state = 0
+        for i, token in enumerate(tokens):
+            key = self._key(token)
+            while state and key not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(key, 0)
+            found = state if match[state] else next_match[state]
+            while found:
+                length, label = match[found]
+                start = i - length + 1
+                if length > longest.get(start, (0,))[0]:
+                    longest[start] = (length, label)
+                found = next_match[found]
+        spans, i, n = [], 0, len(tokens)
+        while i < n:
+            hit = longest.get(i)
+            if hit:
+                spans.append((i, i + hit[0], hit[1]))
+                i += hit[0]
+            else:
+                i += 1
+        return spans
+
+    def entities(self, tokens) -> list:
+        """(label, text) pairs, in the pipeline's entity format."""
+        return [(label, ' '.join(tokens[start:end])) for start, end, label in self.find(tokens)]
+
+    # ── Construction ─────────────────────────────────────────────────────────
+
+    def _key(self, token: str) -> str:
+        return token if self.case_sensitive else token.casefold()
+
+    def _add(self, tokens, label) -> None:
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._match.append(None)
+                self._next_match.append(0)
+            state = nxt
+        # A phrase listed twice keeps its last label.
+        self._match[state] = (len(tokens), label)
+
+    def _link(self) -> None:
+        """Breadth-first failure links (and links to the next matching state)."""
+        goto, fail, match, next_match = self._goto, self._fail, self._match, self._next_match
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in goto[state].items():
+                queue.append(child)
+                f = fail[state]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(token, 0)
+                next_match[child] = fail[child] if match[fail[child]] else next_match[fail[child]]
+
+
+def tree_spans(tree) -> list:
+    """(start, end, label, text) of each chunk in an ne_chunk tree."""
+    spans, i = [], 0
+    for node in tree:
+        if hasattr(node, 'label'):
+            spans.append((i, i + len(node), node.label(), ' '.join(leaf[0] for leaf in node)))
+            i += len(node)
+        else:
+            i += 1
+    return spans
+
+
+def merge_entities(tokens, maxent_spans, gazetteer_spans) -> list:
+    """(label, text) pairs in token order; gazetteer spans win where the two overlap."""
+    taken = bytearray(len(tokens))
+    spans = []
+    for start, end, label in gazetteer_spans:
+        taken[start:end] = b'\x01' * (end - start)
+        spans.append((start, label, ' '.join(tokens[start:end])))
+    for start, end, label, text in maxent_spans:
+        if not any(taken[start:end]):
+            spans.append((start, label, text))
+    spans.sort(key=lambda span: span[0])
+    return [(label, text) for _, label, text in spans]
+
+
+@functools.lru_cache(maxsize=None)
+def _load(paths: tuple) -> Gazetteer:
+    gazetteer = Gazetteer.from_files(paths)
+    logger.info("Gazetteer: %d phrases, labels %s.", len(gazetteer), ', '.join(gazetteer.labels))
+    return gazetteer
+
+
+def ner_from_env() -> dict:
+    """AnalysisPipeline keyword arguments from VA_NER and VA_GAZETTEER."""
+    paths = tuple(p for p in os.environ.get('VA_GAZETTEER', '').split(os.pathsep) if p)
+    mode = os.environ.get('VA_NER') or ('combined' if paths else 'maxent')
+    if mode not in NER_MODES:
+        logger.warning("Unknown VA_NER %r — using maxent.", mode)
+        mode = 'maxent'
+    if mode == 'maxent':
+        return {'ner': 'maxent', 'gazetteer': None}
+    if not paths:
+        logger.warning("VA_NER=%s needs VA_GAZETTEER files — using maxent.", mode)
+        return {'ner': 'maxent', 'gazetteer': None}
+    try:
+        return {'ner': mode, 'gazetteer': _load(paths)}
+    except (OSError, ValueError) as exc:
+        logger.error("Could not load gazetteer %s (%s) — using maxent.", os.pathsep.join(paths), exc)
+        return {'ner': 'maxent', 'gazetteer': None}
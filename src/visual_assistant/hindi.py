@@ -0,0 +1,168 @@
+"""
+Local Hindi analysis for visual-impaired-assistant.
+
+Hindi input used to be sent to googletrans and analysed as English, which
+cost a network round trip per turn and degraded silently when the service
+failed. HindiAnalyzer works on the Devanagari text directly: sentences are
+split on danda and sentence punctuation, words are tokenised, and each word
+is given a coarse category from closed-class word lists (pronouns,
+postpositions, auxiliaries, conjunctions, negation, question words,
+numbers). Everything else is reported as a content word.
+
+indic-nlp-library does the splitting, tokenising and normalisation when it
+is installed; otherwise a regex fallback does the same job. Translation to
+English happens only when the user asks for it (is_translation_request).
+"""
+import logging
+import re
+import string
+import unicodedata
+
+from .results import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+HINDI_MODES = ('native', 'translate')
+
+# Closed-class Hindi words, in both the chandrabindu and anusvara spellings
+# recognisers produce.
+HINDI_CATEGORIES = {
+    'Personal pronoun': (
+        'मैं', 'मुझे', 'मुझको', 'मेरा', 'मेरी', 'मेरे', 'हम', 'हमें', 'हमारा', 'हमारी', 'हमारे',
+        'तुम', 'तुम्हें', 'तुम्हारा', 'तुम्हारी', 'तुम्हारे', 'तू', 'आप', 'आपको', 'आपका', 'आपकी',
+        'आपके', 'वह', 'वो', 'वे', 'यह', 'ये', 'उसे', 'उसको', 'उसका', 'उसकी', 'उसके', 'उन्हें',
+        'उनका', 'उनकी', 'उनके', 'इसे', 'इसका', 'इसकी', 'इसके', 'इन्हें', 'अपना', 'अपनी', 'अपने',
+    ),
+    'Postposition': (
+        'का', 'की', 'के', 'में', 'पर', 'से', 'को', 'ने', 'तक', 'लिए', 'साथ', 'द्वारा', 'बिना',
+    ),
+    'Auxiliary verb': (
+        'है', 'हैं', 'था', 'थी', 'थे', 'हूँ', 'हूं', 'हो', 'होगा', 'होगी', 'होंगे', 'रहा', 'रही',
+        'रहे', 'गया', 'गई', 'गए', 'चाहिए',
+    ),
+    'Coordinating conjunction': ('और', 'या', 'लेकिन', 'परंतु', 'परन्तु', 'किंतु', 'किन्तु', 'तथा', 'एवं'),
+    'Subordinating conjunction': ('कि', 'अगर', 'यदि', 'तो', 'क्योंकि', 'जब', 'जबकि', 'ताकि'),
+    'Negation': ('नहीं', 'न', 'ना', 'मत'),
+    'Question word': (
+        'क्या', 'कौन', 'कहाँ', 'कहां', 'कब', 'क्यों', 'कैसे', 'कैसा', 'कैसी', 'कितना', 'कितनी', 'कितने',
+    ),
+    'Cardinal number': (
+        'एक', 'दो', 'तीन', 'चार', 'पाँच', 'पांच', 'छह', 'छः', 'सात', 'आठ', 'नौ', 'दस', 'बीस',
+        'पचास', 'सौ', 'हज़ार', 'हजार', 'लाख', 'करोड़',
+    ),
+}
+CONTENT_WORD = 'Content word'
+FOREIGN_WORD = 'Foreign word'
+
+_WORD_CATEGORY = {word: category for category, words in HINDI_CATEGORIES.items() for word in words}
+
+_DEVANAGARI = re.compile(r'[\u0900-\u0963\u0971-\u097f]')
+_NUMBER = re.compile(r'^[0-9\u0966-\u096f]+([.,][0-9\u0966-\u096f]+)*$')
+# Fallback tokeniser: runs of Devanagari letters and signs (nukta, matras,
+# virama, ZWJ/ZWNJ), numbers, Latin words, or single punctuation marks.
+_TOKEN = re.compile(r'[\u0900-\u0963\u0971-\u097f\u200c\u200d]+'
+                    r'|[0-9\u0966-\u096f]+(?:[.,][0-9\u0966-\u096f]+)*'
+                    r"|[A-Za-z]+(?:'[A-Za-z]+)?|[^\s]")
+_SENTENCE_END = re.compile(r'(?<=[\u0964\u0965?!.])\s+')
+
+TRANSLATION_REQUESTS = frozenset({
+    'translate', 'translate that', 'translate it', 'in english', 'say it in english',
+    'english please', 'अनुवाद', 'अनुवाद करो', 'अनुवाद करें', 'अंग्रेज़ी में', 'अंग्रेजी में',
+    'इंग्लिश में',
+})
+_PUNCTUATION = str.maketrans('', '', string.punctuation + '।॥')
+
+
+def is_translation_request(text: str) -> bool:
+    """True if the utterance asks for the previous Hindi turn in English."""
+    return ' '.join((text or '').translate(_PUNCTUATION).lower().split()) in TRANSLATION_REQUESTS
+
+
+def _load_indicnlp():
+    """(sentence_split, tokenize, normalize) from indic-nlp-library, or None."""
+    try:
+        from indicnlp.normalize.indic_normalize import IndicNormalizerFactory
+        from indicnlp.tokenize import indic_tokenize, sentence_tokenize
+    except ImportError:
+        return None
+    normalizer = IndicNormalizerFactory().get_normalizer('hi')
+    return (lambda text: sentence_tokenize.sentence_split(text, lang='hi'),
+            lambda text: indic_tokenize.trivial_tokenize(text, lang='hi'),
+            normalizer.normalize)
+
+
+class HindiAnalyzer:
+    """
+    Describe Hindi text without translating it.
+
+    use_indicnlp — True/False to force a backend; None uses indic-nlp when installed
+    """
+
+    def __init__(self, use_indicnlp=None):
+        self._indic = _load_indicnlp() if use_indicnlp in (None, True) else None
+        if use_indicnlp and self._indic is None:
+            raise ImportError("indic-nlp-library is not installed")
+        if self._indic is None:
+            logger.info("indic-nlp-library unavailable — using the regex Hindi tokeniser.")
+
+    @property
+    def backend(self) -> str:
+        return 'indicnlp' if self._indic else 'regex'
+
+    # ── Stages ───────────────────────────────────────────────────────────────
+
+    def normalize(self, text: str) -> str:
+        text = unicodedata.normalize('NFC', text)
+        return self._indic[2](text) if self._indic else text
+
+    def split_sentences(self, text: str) -> list:
+        if self._indic:
+            try:
+                return [s.strip() for s in self._indic[0](text) if s.strip()]
+            except Exception as exc:
+                logger.warning("indic-nlp sentence split failed (%s) — using regex.", exc)
+        return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+    def tokenize(self, sentence: str) -> list:
+        if self._indic:
+            try:
+                return self._indic[1](sentence)
+            except Exception as exc:
+                logger.warning("indic-nlp tokenise failed (%s) — using regex.", exc)
+        return _TOKEN.findall(sentence)
+
+    @staticmethod
+    def tag(tokens) -> list:
+        """(token, category) pairs; punctuation is dropped."""
+        tagged = []
+        for token in tokens:
+            category = _WORD_CATEGORY.get(token)
+            if category is None:
+                if _NUMBER.match(token):
+                    category = 'Cardinal number'
+                elif _DEVANAGARI.search(token):
+                    category = CONTENT_WORD
+                elif any(ch.isalpha() for ch in token):
+                    category = FOREIGN_WORD
+                else:
+                    continue
+            tagged.append((token, category))
+        return tagged
+
+    # ── Description ──────────────────────────────────────────────────────────
+
+    def describe(self, text: str) -> AnalysisResult:
+        """Description lines in the same shape as AnalysisPipeline.describe."""
+        sentences = self.split_sentences(self.normalize(text))
+        lines = [f"Number of sentences: {len(sentences)}"]
+        for i, sentence in enumerate(sentences, 1):
+            lines.append(f"\nAnalysing sentence {i}: {sentence}")
+            tagged = self.tag(self.tokenize(sentence))
+            word_types: dict = {}
+            for word, category in tagged:
+                word_types.setdefault(category, []).append(word)
+            for category, words in word_types.items():
+                lines.append(f"{category}: {', '.join(words)}")
+            words = [word for word, _ in tagged]
+            lines.append(f"Statistics: {len(words)} words, {len(set(words))} distinct")
+        return AnalysisResult(lines, sentence_count=len(sentences))
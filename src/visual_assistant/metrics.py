@@ -0,0 +1,222 @@
+"""
+Per-stage latency metrics for visual-impaired-assistant.
+
+Every stage of capture, analysis, speech and storage is wrapped in
+METRICS.timer(stage). While metrics are disabled (the default) the timer is
+a shared no-op context manager, so the instrumentation costs one method
+call. Once enabled, stages feed fixed-bucket histograms and counters that
+can be scraped as Prometheus text from a localhost HTTP endpoint and/or
+written as a periodic structured log line.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds — covers sub-millisecond tagging up to slow network calls.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count', 'max')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.total += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+
+class _Timer:
+    """Context manager that records one observation for a stage."""
+
+    __slots__ = ('_metrics', '_stage', '_start')
+
+    def __init__(self, metrics, stage: str):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.observe(self._stage, time.perf_counter() - self._start)
+        if exc_type is not None:
+            self._metrics.inc('stage_errors', stage=self._stage)
+        return False
+
+
+class Metrics:
+    """Registry of stage histograms, labelled counters and gauges; thread-safe."""
+
+    def __init__(self, enabled: bool = False, prefix: str = 'va'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._histograms: dict = {}
+        self._counters: dict = {}
+        self._gauges: dict = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._log_stop = None
+
+    # ── Recording ────────────────────────────────────────────────────────────
+
+    def timer(self, stage: str):
+        """`with METRICS.timer('tag'):` — a no-op unless metrics are enabled."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _labels(pairs) -> str:
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        p = self.prefix
+        out = []
+        with self._lock:
+            if self._histograms:
+                out.append(f"# HELP {p}_stage_seconds Time spent in each assistant stage.")
+                out.append(f"# TYPE {p}_stage_seconds histogram")
+            for stage, hist in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(hist.buckets + ('+Inf',), hist.counts):
+                    cumulative += count
+                    out.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                out.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {hist.total:.6f}')
+                out.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+
+            seen = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in seen:
+                    out.append(f"# TYPE {p}_{name}_total counter")
+                    seen.add(name)
+                out.append(f"{p}_{name}_total{self._labels(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                if name not in seen:
+                    out.append(f"# TYPE {p}_{name} gauge")
+                    seen.add(name)
+                out.append(f"{p}_{name}{self._labels(labels)} {value}")
+        return '\n'.join(out) + '\n'
+
+    def snapshot(self) -> dict:
+        """Compact per-stage summary for the periodic log line."""
+        with self._lock:
+            stages = {
+                stage: {
+                    'count': h.count,
+                    'mean_ms': round(h.total / h.count * 1000, 3) if h.count else 0.0,
+                    'max_ms': round(h.max * 1000, 3),
+                }
+                for stage, h in self._histograms.items()
+            }
+            counters = {
+                name + self._labels(labels): value
+                for (name, labels), value in self._counters.items()
+            }
+        return {'stages': stages, 'counters': counters}
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """Expose /metrics on host:port from a daemon thread. Returns the server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                logger.debug("metrics endpoint: " + fmt, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        logger.info("Metrics endpoint on http://%s:%d/metrics", host, self._server.server_address[1])
+        return self._server
+
+    def start_log_loop(self, interval: float) -> None:
+        """Log a structured snapshot every interval seconds."""
+        self._log_stop = threading.Event()
+        stop = self._log_stop
+
+        def loop():
+            while not stop.wait(interval):
+                logger.info("metrics %s", json.dumps(self.snapshot(), sort_keys=True))
+
+        threading.Thread(target=loop, name='metrics-log', daemon=True).start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._log_stop is not None:
+            self._log_stop.set()
+            self._log_stop = None
+
+
+# Process-wide registry used by the instrumented code paths.
+METRICS = Metrics()
@@ -0,0 +1,350 @@
+"""
+Persistent NLP pipeline for visual-impaired-assistant.
+
+nltk.pos_tag and nltk.ne_chunk look up and rebuild their models on every
+call. AnalysisPipeline holds the perceptron tagger, the maxent NE chunker
+and the VADER analyser once, and tags/chunks every sentence of an utterance
+(or of a whole batch of utterances) in a single tag_sents/parse_sents pass,
+and scores several sentences at once with BatchSentimentScorer.
+
+Each utterance comes back as an AnalysisResult: per-sentence records that
+render the description lines lazily (see results.py).
+
+With a cache, each analysed sentence is stored under its normalised text,
+so sentences the user has said before skip tokenising, tagging, chunking
+and scoring and render exactly as they did the first time.
+The description lines are identical to the per-sentence code it replaces.
+"""
+import functools
+import logging
+import threading
+
+from .gazetteer import NER_MODES, merge_entities, tree_spans
+from .metrics import METRICS
+from .results import (FAILED, NER_FAILED, OK, POS_DESCRIPTIONS, AnalysisResult,  # noqa: F401
+                      SentenceRecord, sentiment_line)
+from .sentiment import BatchSentimentScorer, numpy_available
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────
+# Shared model loaders — one instance per process
+# ─────────────────────────────────────────────
+@functools.lru_cache(maxsize=None)
+def load_tagger():
+    """The English averaged-perceptron tagger nltk.pos_tag would build."""
+    from nltk.tag.perceptron import PerceptronTagger
+    return PerceptronTagger()
+
+
+@functools.lru_cache(maxsize=None)
+def load_chunker():
+    """The multiclass maxent NE chunker nltk.ne_chunk would load."""
+    from nltk import chunk
+    if hasattr(chunk, 'ne_chunker'):  # nltk >= 3.9
+        return chunk.ne_chunker()
+    import nltk
+    return nltk.data.load(chunk._MULTICLASS_NE_CHUNKER)
+
+
+def load_sentiment_analyzer():
+    """A VADER analyser, or None if the lexicon is unavailable."""
+    try:
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+    except Exception as exc:
+        logger.warning("Sentiment analyser unavailable: %s", exc)
+        return None
+
+
+# Bump when what is stored per sentence changes, to invalidate persistent caches.
+_CACHE_VERSION = 2
+
+
+def normalize_sentence(text: str) -> str:
+    """Cache key text: surrounding and repeated whitespace collapsed."""
+    return ' '.join(text.split())
+
+
+class _Sentence:
+    """Working state for one sentence while a batch moves through the stages."""
+    __slots__ = ('text', 'tokens', 'tagged', 'entities', 'ner_failed', 'scores', 'failed')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = None
+        self.tagged = None
+        self.entities = None
+        self.ner_failed = False
+        self.scores = None
+        self.failed = False
+
+
+# ─────────────────────────────────────────────
+# Pipeline
+# ─────────────────────────────────────────────
+class AnalysisPipeline:
+    """
+    Tokenise, tag, chunk and score text with models held for its lifetime.
+
+    sentiment_analyzer — a VADER analyser, or None to skip sentiment
+    translate          — callable(text, src, dest) used for Hindi input
+    hindi              — HindiAnalyzer to describe Hindi natively; None translates it
+    tagger / chunker   — override the shared nltk models (mainly for tests)
+    cache              — LRUCache for per-sentence results, or None
+    ner                — entity engine: 'maxent', 'gazetteer' or 'combined' (see gazetteer.py)
+    gazetteer          — the Gazetteer the last two use
+    """
+
+    def __init__(self, sentiment_analyzer=None, translate=None, tagger=None, chunker=None,
+                 cache=None, hindi=None, ner: str = 'maxent', gazetteer=None):
+        if ner not in NER_MODES:
+            raise ValueError(f"ner must be one of {', '.join(NER_MODES)}, not {ner!r}")
+        if ner != 'maxent' and gazetteer is None:
+            raise ValueError(f"ner={ner!r} needs a gazetteer")
+        self.sentiment_analyzer = sentiment_analyzer
+        self.translate = translate
+        self.hindi = hindi
+        self.cache = cache
+        self.ner = ner
+        self.gazetteer = gazetteer
+        self._tagger = tagger
+        self._chunker = chunker
+        self._scorer = None      # (analyser, BatchSentimentScorer or None)
+        self._lock = threading.Lock()
+
+    @property
+    def tagger(self):
+        if self._tagger is None:
+            with self._lock:
+                if self._tagger is None:
+                    self._tagger = load_tagger()
+        return self._tagger
+
+    @property
+    def chunker(self):
+        if self._chunker is None:
+            with self._lock:
+                if self._chunker is None:
+                    self._chunker = load_chunker()
+        return self._chunker
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def describe(self, text: str, is_hindi: bool = False) -> AnalysisResult:
+        """Analyse one utterance; the result reads as its description lines."""
+        return self.describe_many([(text, is_hindi)])[0]
+
+    def describe_many(self, utterances) -> list:
+        """
+        Analyse (text, is_hindi) pairs; returns one AnalysisResult each.
+
+        All sentences of all utterances share one tagging and one chunking pass.
+        """
+        import nltk
+
+        heads, groups, native = [], [], {}
+        for index, (text, is_hindi) in enumerate(utterances):
+            head = []
+            if is_hindi and self.hindi is not None:
+                try:
+                    with METRICS.timer('hindi'):
+                        native[index] = self.hindi.describe(text)
+                    heads.append(head)
+                    groups.append(None)
+                    continue
+                except Exception as exc:
+                    logger.warning("Native Hindi analysis failed (%s) — translating.", exc)
+            try:
+                eng_text = self._to_english(text) if is_hindi else text
+                if is_hindi:
+                    head.append(f"Translation: {eng_text}")
+                with METRICS.timer('sentence_split'):
+                    sentences = [_Sentence(s) for s in self._split(eng_text, nltk.sent_tokenize)]
+                head.append(f"Number of sentences: {len(sentences)}")
+            except Exception as exc:
+                logger.error("process_text top-level error: %s", exc)
+                head.append("Note: Basic text analysis failed.")
+                head.append(f"Words found: {', '.join(text.split())}")
+                sentences = None
+            heads.append(head)
+            groups.append(sentences)
+
+        flat = self._from_cache([s for group in groups if group for s in group])
+        with METRICS.timer('tokenize'):
+            self._tokenize(flat, nltk.word_tokenize)
+        with METRICS.timer('tag'):
+            self._tag(flat)
+        with METRICS.timer('ne_chunk'):
+            self._chunk(flat)
+        with METRICS.timer('sentiment'):
+            self._score(flat)
+        self._to_cache(flat)
+
+        results = []
+        for index, (head, sentences) in enumerate(zip(heads, groups)):
+            if index in native:
+                results.append(native[index])
+                continue
+            results.append(AnalysisResult(
+                head, [self._record(i, sentence) for i, sentence in enumerate(sentences or (), 1)]))
+        return results
+
+    # ── Sentence cache ───────────────────────────────────────────────────────
+
+    def _cache_key(self, kind: str, text: str) -> tuple:
+        scored = 'vader' if self.sentiment_analyzer else 'none'
+        ner = self.ner if self.gazetteer is None else f"{self.ner}:{self.gazetteer.digest}"
+        return (_CACHE_VERSION, kind, scored, ner, text)
+
+    def _split(self, text: str, sent_tokenize) -> list:
+        if self.cache is None:
+            return sent_tokenize(text)
+        key = self._cache_key('split', text)
+        sentences = self.cache.get(key)
+        if sentences is None:
+            sentences = sent_tokenize(text)
+            self.cache.put(key, sentences)
+        return sentences
+
+    def _from_cache(self, sentences) -> list:
+        """Fill sentences seen before from the cache; returns the ones still to analyse."""
+        if self.cache is None:
+            return sentences
+        todo = []
+        for sentence in sentences:
+            hit = self.cache.get(self._cache_key('sentence', normalize_sentence(sentence.text)))
+            if hit is None:
+                METRICS.inc('analysis_cache', result='miss')
+                todo.append(sentence)
+                continue
+            METRICS.inc('analysis_cache', result='hit')
+            sentence.tagged = hit['tagged']
+            sentence.entities = [tuple(entity) for entity in hit['entities']]
+            sentence.scores = hit['scores']
+        return todo
+
+    def _to_cache(self, sentences) -> None:
+        if self.cache is None:
+            return
+        for sentence in sentences:
+            # Failures may be transient (missing model, network); don't remember them.
+            if sentence.failed or sentence.ner_failed or sentence.entities is None:
+                continue
+            if self.sentiment_analyzer and sentence.scores is None:
+                continue
+            self.cache.put(self._cache_key('sentence', normalize_sentence(sentence.text)), {
+                'tagged': [list(pair) for pair in sentence.tagged],
+                'entities': [list(entity) for entity in sentence.entities],
+                'scores': sentence.scores,
+            })
+
+    # ── Stages ───────────────────────────────────────────────────────────────
+
+    def _to_english(self, text: str) -> str:
+        return self.translate(text, src='hi', dest='en') if self.translate else text
+
+    @staticmethod
+    def _tokenize(sentences, word_tokenize) -> None:
+        for sentence in sentences:
+            try:
+                sentence.tokens = word_tokenize(sentence.text)
+            except Exception as exc:
+                sentence.failed = exc
+
+    def _tag(self, sentences) -> None:
+        live = [s for s in sentences if not s.failed]
+        if not live:
+            return
+        try:
+            for sentence, tagged in zip(live, self.tagger.tag_sents([s.tokens for s in live])):
+                sentence.tagged = tagged
+        except Exception:
+            # Retry one by one so a single bad sentence doesn't sink the batch.
+            for sentence in live:
+                try:
+                    sentence.tagged = self.tagger.tag(sentence.tokens)
+                except Exception as exc:
+                    sentence.failed = exc
+
+    def _chunk(self, sentences) -> None:
+        live = [s for s in sentences if not s.failed]
+        if not live:
+            return
+        if self.ner == 'gazetteer':
+            for sentence in live:
+                try:
+                    sentence.entities = self.gazetteer.entities([word for word, _ in sentence.tagged])
+                except Exception as exc:
+                    sentence.ner_failed = exc
+            return
+        try:
+            trees = list(self.chunker.parse_sents([s.tagged for s in live]))
+        except Exception:
+            trees = []
+            for sentence in live:
+                try:
+                    trees.append(self.chunker.parse(sentence.tagged))
+                except Exception as exc:
+                    trees.append(exc)
+        for sentence, tree in zip(live, trees):
+            if isinstance(tree, Exception):
+                sentence.ner_failed = tree
+                continue
+            if self.ner == 'combined':
+                try:
+                    words = [word for word, _ in sentence.tagged]
+                    sentence.entities = merge_entities(words, tree_spans(tree), self.gazetteer.find(words))
+                except Exception as exc:
+                    sentence.ner_failed = exc
+                continue
+            sentence.entities = [
+                (chunk.label(), ' '.join(c[0] for c in chunk))
+                for chunk in tree
+                if hasattr(chunk, 'label')
+            ]
+
+    def _batch_scorer(self):
+        """A BatchSentimentScorer over the analyser's lexicon, or None."""
+        analyzer = self.sentiment_analyzer
+        if self._scorer is None or self._scorer[0] is not analyzer:
+            scorer = None
+            if numpy_available() and hasattr(analyzer, 'lexicon') and hasattr(analyzer, 'constants'):
+                try:
+                    scorer = BatchSentimentScorer.from_analyzer(analyzer)
+                except Exception as exc:
+                    logger.warning("Batch sentiment scorer unavailable, scoring one by one: %s", exc)
+            self._scorer = (analyzer, scorer)
+        return self._scorer[1]
+
+    def _score(self, sentences) -> None:
+        analyzer = self.sentiment_analyzer
+        if not analyzer:
+            return
+        live = [s for s in sentences if not s.failed]
+        scorer = self._batch_scorer() if len(live) > 1 else None
+        if scorer is not None:
+            try:
+                for sentence, scores in zip(live, scorer.polarity_scores_many(s.text for s in live)):
+                    sentence.scores = scores
+                return
+            except Exception as exc:
+                logger.warning("Batch sentiment scoring failed, scoring one by one: %s", exc)
+        for sentence in live:
+            try:
+                sentence.scores = analyzer.polarity_scores(sentence.text)
+            except Exception as exc:
+                logger.warning("Sentiment analysis failed: %s", exc)
+
+    @staticmethod
+    def _record(i: int, sentence: _Sentence) -> SentenceRecord:
+        if sentence.failed:
+            logger.warning("Could not fully analyse sentence %d: %s", i, sentence.failed)
+            return SentenceRecord(sentence.text, status=FAILED)
+        status = OK
+        if sentence.ner_failed:
+            logger.warning("NER failed for sentence %d: %s", i, sentence.ner_failed)
+            status = NER_FAILED
+        return SentenceRecord.from_analysis(sentence.text, sentence.tagged, sentence.entities,
+                                            sentence.scores, status)
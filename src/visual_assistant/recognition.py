@@ -0,0 +1,165 @@
+"""
+Speech recognition backends for visual-impaired-assistant.
+
+The Hindi and English attempts run concurrently instead of one after the
+other. A Hindi result wins as soon as it passes the Devanagari rule; an
+English result wins once the Hindi attempt has failed or been rejected. The
+losing attempt is cancelled (or abandoned, if already on the wire) and the
+whole race is bounded by a per-request deadline.
+
+Backends implement recognize(audio, language) and raise
+sr.UnknownValueError / sr.RequestError like recognize_google does, so tests
+and benchmarks can swap in ScriptedRecognizer with configurable latency.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from ._lazy import sr
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Preference order: Hindi is tried first and wins ties.
+LANGUAGES = (('hi-IN', True), ('en-US', False))
+
+
+def contains_devanagari(text: str) -> bool:
+    """True if text contains at least one Devanagari character."""
+    return any('\u0900' <= ch <= '\u097F' for ch in text)
+
+
+# ─────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────
+class RecognizerBackend:
+    """Interface: turn audio into text for one language."""
+
+    def recognize(self, audio, language: str) -> str:
+        raise NotImplementedError
+
+
+class GoogleRecognizer(RecognizerBackend):
+    """The Google Web Speech API via speech_recognition.Recognizer."""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, language: str) -> str:
+        return self.recognizer.recognize_google(audio, language=language)
+
+
+class ScriptedRecognizer(RecognizerBackend):
+    """
+    Local fake for tests and benchmarks.
+
+    results — {language: text or exception instance}; missing languages raise
+              sr.UnknownValueError. A callable receives (audio, language).
+    latency — seconds per call, or {language: seconds}
+    """
+
+    def __init__(self, results=None, latency=0.0):
+        self.results = results or {}
+        self.latency = latency
+        self.calls = []
+
+    def recognize(self, audio, language: str) -> str:
+        self.calls.append(language)
+        delay = self.latency.get(language, 0.0) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+        result = self.results.get(language) if not callable(self.results) else self.results(audio, language)
+        if result is None:
+            raise sr.UnknownValueError()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+# ─────────────────────────────────────────────
+# Concurrent bilingual recognition
+# ─────────────────────────────────────────────
+def _attempt(backend, audio, language: str) -> str:
+    with METRICS.timer(f'recognize_{language[:2]}'):
+        return backend.recognize(audio, language)
+
+
+def recognize_bilingual(backend, audio, executor, deadline: float = 15.0, breaker=None):
+    """
+    Race the Hindi and English attempts on executor; return (text, is_hindi).
+
+    Raises sr.UnknownValueError if neither language produced an acceptable
+    result, or sr.RequestError if the service failed or the deadline passed
+    without one. With a resilience.CircuitBreaker, an open circuit raises
+    sr.RequestError at once, without touching the service.
+    """
+    if breaker is None:
+        return _race(backend, audio, executor, deadline)
+    if not breaker.allow():
+        raise sr.RequestError("still offline")
+    try:
+        result = _race(backend, audio, executor, deadline)
+    except sr.RequestError:
+        breaker.record_failure()
+        raise
+    except sr.UnknownValueError:
+        # The service answered — it just heard nothing it could transcribe.
+        breaker.record_success()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
+
+
+def _race(backend, audio, executor, deadline: float):
+    futures = {executor.submit(_attempt, backend, audio, lang): (lang, is_hindi)
+               for lang, is_hindi in LANGUAGES}
+    outcome = {}          # is_hindi -> text, or None once that attempt is ruled out
+    service_error = None
+    end = time.monotonic() + deadline
+    pending = set(futures)
+
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, end - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                language, is_hindi = futures[future]
+                try:
+                    text = future.result()
+                except sr.UnknownValueError:
+                    outcome[is_hindi] = None
+                    continue
+                except sr.RequestError as exc:
+                    logger.error("Speech recognition service error (%s): %s", language, exc)
+                    service_error = exc
+                    outcome[is_hindi] = None
+                    continue
+                if is_hindi and not contains_devanagari(text):
+                    # Verify it's actually Devanagari — not English mis-flagged as Hindi
+                    logger.info("Hindi recognition returned ASCII — using English result.")
+                    outcome[is_hindi] = None
+                    continue
+                outcome[is_hindi] = text
+
+            if outcome.get(True):
+                return outcome[True], True
+            if True in outcome and outcome.get(False):
+                return outcome[False], False
+    finally:
+        for future in pending:
+            if not future.cancel():
+                METRICS.inc('recognition_abandoned')
+
+    if outcome.get(False):
+        # Deadline hit while Hindi was still out — the English result stands.
+        return outcome[False], False
+    if pending:
+        raise sr.RequestError(f"no recognition result within {deadline:.0f}s")
+    if service_error is not None:
+        raise service_error
+    raise sr.UnknownValueError()
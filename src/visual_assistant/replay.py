@@ -0,0 +1,318 @@
+"""
+Audio-file replay for visual-impaired-assistant.
+
+Feeds recorded WAV/FLAC/AIFF files with known transcripts through the live
+assistant's recognise → process_text → store_in_firebase path, N files at a
+time, with no microphone. Each file gets per-stage timings and a word error
+rate; the summary gives latency percentiles and throughput, so nightly runs
+can be compared build to build:
+
+    visual-assistant replay recordings/ -j 4 --json nightly.json --max-wer 0.2
+
+Input is either a directory (each audio file next to a same-named .txt
+transcript) or a JSONL manifest of {"audio": ..., "transcript": ...,
+"language": "hi"|"en"} lines, audio paths relative to the manifest.
+
+Recognition defaults to TranscriptRecognizer, a local stub that answers with
+the expected transcript, so runs are deterministic and offline. Pass
+--recognizer google for the real service or module:factory for any other
+backend with recognize(audio, language).
+"""
+import contextlib
+import importlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from ._lazy import sr
+from .recognition import RecognizerBackend, contains_devanagari
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.aif', '.aiff')
+
+
+class ReplayItem(NamedTuple):
+    path: str
+    transcript: str
+    is_hindi: bool
+
+
+# ─────────────────────────────────────────────
+# Inputs
+# ─────────────────────────────────────────────
+def _item(path: str, transcript: str, language: Optional[str] = None) -> ReplayItem:
+    transcript = transcript.strip()
+    is_hindi = language.lower().startswith('hi') if language else contains_devanagari(transcript)
+    return ReplayItem(path, transcript, is_hindi)
+
+
+def load_items(location: str) -> list:
+    """Replay items from a directory of audio + .txt sidecars or a JSONL manifest."""
+    if os.path.isdir(location):
+        items = []
+        for name in sorted(os.listdir(location)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() not in AUDIO_EXTENSIONS:
+                continue
+            sidecar = os.path.join(location, stem + '.txt')
+            if not os.path.isfile(sidecar):
+                logger.warning("replay: no transcript for %s — skipped.", name)
+                continue
+            with open(sidecar, encoding='utf-8') as fh:
+                items.append(_item(os.path.join(location, name), fh.read()))
+        return items
+
+    base = os.path.dirname(os.path.abspath(location))
+    items = []
+    with open(location, encoding='utf-8') as fh:
+        for number, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                audio = os.path.join(base, entry['audio'])
+                items.append(_item(audio, entry['transcript'], entry.get('language')))
+            except (ValueError, KeyError) as exc:
+                logger.warning("replay: bad manifest line %d: %s", number, exc)
+    return items
+
+
+def load_audio(path: str):
+    """Read a whole audio file into an sr.AudioData."""
+    with sr.AudioFile(path) as source:
+        return sr.Recognizer().record(source)
+
+
+# ─────────────────────────────────────────────
+# Recognition and scoring
+# ─────────────────────────────────────────────
+class TranscriptRecognizer(RecognizerBackend):
+    """
+    Local stub: answers with the expected transcript of the file the audio
+    came from, in that file's language only. latency simulates the network.
+    Preprocessed audio is matched through the capture it was made from.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._expected: dict = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(audio) -> int:
+        return id(getattr(audio, 'original', audio))
+
+    def register(self, audio, item: ReplayItem) -> None:
+        with self._lock:
+            self._expected[self._key(audio)] = item
+
+    def forget(self, audio) -> None:
+        with self._lock:
+            self._expected.pop(self._key(audio), None)
+
+    def recognize(self, audio, language: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            item = self._expected.get(self._key(audio))
+        if item is None or item.is_hindi != language.startswith('hi') or not item.transcript:
+            raise sr.UnknownValueError()
+        return item.transcript
+
+
+def load_backend(spec: str, recognizer=None, latency: float = 0.0):
+    """'transcript' (default stub), 'google', or 'package.module:factory'."""
+    if spec == 'transcript':
+        return TranscriptRecognizer(latency)
+    if spec == 'google':
+        from .recognition import GoogleRecognizer
+        return GoogleRecognizer(recognizer or sr.Recognizer())
+    module_name, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"recognizer must be 'transcript', 'google' or module:factory, not {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance over the reference length (case and punctuation ignored)."""
+    ref = _WORD.findall(reference.lower())
+    hyp = _WORD.findall((hypothesis or '').lower())
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+# ─────────────────────────────────────────────
+# Replay
+# ─────────────────────────────────────────────
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def replay_one(assistant, item: ReplayItem, audio_loader=load_audio) -> dict:
+    """One turn: load → recognize_audio → process_text → store_in_firebase."""
+    result = {'file': item.path, 'expected': item.transcript, 'recognised': None,
+              'is_hindi': None, 'language_ok': False, 'wer': 1.0, 'error': None}
+    backend = assistant.recognizer_backend
+    audio = None
+    start = time.perf_counter()
+    try:
+        audio = audio_loader(item.path)
+        loaded = time.perf_counter()
+        if hasattr(backend, 'register'):
+            backend.register(audio, item)
+        text, is_hindi = assistant.recognize_audio(audio)
+        recognised = time.perf_counter()
+        processed = assistant.process_text(text, is_hindi) if text else []
+        analysed = time.perf_counter()
+        if processed:
+            assistant.store_in_firebase({'raw_text': text, 'processed': processed})
+        stored = time.perf_counter()
+        assistant.end_turn()
+    except Exception as exc:
+        logger.error("replay: %s failed: %s", item.path, exc)
+        result['error'] = f"{type(exc).__name__}: {exc}"
+        result['total_ms'] = _ms(time.perf_counter() - start)
+        return result
+    finally:
+        if audio is not None and hasattr(backend, 'forget'):
+            backend.forget(audio)
+
+    result.update(
+        recognised=text,
+        is_hindi=is_hindi,
+        language_ok=bool(text) and is_hindi == item.is_hindi,
+        wer=round(word_error_rate(item.transcript, text or ''), 4),
+        lines=len(processed or []),
+        load_ms=_ms(loaded - start),
+        recognize_ms=_ms(recognised - loaded),
+        process_ms=_ms(analysed - recognised),
+        store_ms=_ms(stored - analysed),
+        total_ms=_ms(stored - start),
+    )
+    return result
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(results: list, wall_seconds: float) -> dict:
+    totals = sorted(r['total_ms'] for r in results if r['error'] is None)
+    scored = [r['wer'] for r in results]
+    return {
+        'files': len(results),
+        'errors': sum(1 for r in results if r['error'] is not None),
+        'mean_wer': round(sum(scored) / len(scored), 4) if scored else 0.0,
+        'language_accuracy': round(sum(r['language_ok'] for r in results) / len(results), 4)
+        if results else 0.0,
+        'p50_ms': round(_percentile(totals, 50), 3),
+        'p95_ms': round(_percentile(totals, 95), 3),
+        'p99_ms': round(_percentile(totals, 99), 3),
+        'wall_s': round(wall_seconds, 3),
+        'files_per_s': round(len(results) / wall_seconds, 3) if wall_seconds else 0.0,
+    }
+
+
+def replay(assistant, items: list, workers: int = 1, audio_loader=load_audio) -> dict:
+    """Replay items workers at a time; returns {'results': [...], 'summary': {...}}."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='replay') as pool:
+        results = list(pool.map(lambda item: replay_one(assistant, item, audio_loader), items))
+    assistant.speech.flush()
+    if assistant._firebase_writer is not None:
+        assistant._firebase_writer.flush()
+    return {'results': results, 'summary': summarize(results, time.perf_counter() - start)}
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'file':<32} {'total ms':>10} {'recog ms':>10} {'proc ms':>10} {'wer':>6}  status"]
+    for r in report['results']:
+        status = r['error'] or ('ok' if r['language_ok'] else 'wrong language')
+        lines.append(f"{os.path.basename(r['file'])[:32]:<32} {r.get('total_ms', 0):>10.1f} "
+                     f"{r.get('recognize_ms', 0):>10.1f} {r.get('process_ms', 0):>10.1f} "
+                     f"{r['wer']:>6.2f}  {status}")
+    s = report['summary']
+    lines.append(f"\n{s['files']} files, {s['errors']} errors, mean WER {s['mean_wer']:.3f}, "
+                 f"language accuracy {s['language_accuracy']:.1%}")
+    lines.append(f"turn latency p50 {s['p50_ms']:.1f} ms, p95 {s['p95_ms']:.1f} ms, "
+                 f"p99 {s['p99_ms']:.1f} ms; {s['files_per_s']:.2f} files/s over {s['wall_s']:.1f} s")
+    return '\n'.join(lines)
+
+
+def replay_main(argv=None) -> int:
+    """`visual-assistant replay` — deterministic end-to-end runs from audio files."""
+    import argparse
+    from . import visually
+
+    parser = argparse.ArgumentParser(
+        prog='visual-assistant replay',
+        description="Replay recorded audio through recognition, analysis and storage.",
+    )
+    parser.add_argument('input', help="Directory of audio files with .txt transcripts, or a JSONL manifest.")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="Files replayed in parallel.")
+    parser.add_argument('--recognizer', default='transcript',
+                        help="'transcript' (local stub), 'google', or module:factory.")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Simulated recognition latency for the transcript stub, in seconds.")
+    parser.add_argument('--json', help="Write the full per-file report here.")
+    parser.add_argument('--max-wer', type=float, help="Exit 1 if the mean WER exceeds this.")
+    parser.add_argument('--mute', action='store_true', help="Don't play speech output.")
+    parser.add_argument('--verbose', action='store_true', help="Show assistant output while replaying.")
+    args = parser.parse_args(argv)
+
+    items = load_items(args.input)
+    if not items:
+        logger.error("replay: nothing to replay in %s", args.input)
+        return 1
+
+    visually.initialize_nltk()
+    visually._init_firebase()
+    assistant = visually.VisuallyImpairedAssistant(microphone=False)
+    try:
+        assistant.recognizer_backend = load_backend(args.recognizer, assistant.recognizer, args.latency)
+    except (ImportError, AttributeError, ValueError) as exc:
+        logger.error("replay: %s", exc)
+        return 1
+    if args.mute:
+        assistant.engine = None
+    # Each file races two languages at once.
+    assistant._recognition_pool = ThreadPoolExecutor(max_workers=max(4, 2 * args.workers),
+                                                 thread_name_prefix='recognize')
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        report = replay(assistant, items, args.workers)
+    assistant.speech.close()
+    if assistant._firebase_writer is not None:
+        assistant._firebase_writer.close()
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+    if args.max_wer is not None and report['summary']['mean_wer'] > args.max_wer:
+        print(f"Mean WER {report['summary']['mean_wer']:.3f} exceeds {args.max_wer:.3f}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,226 @@
+"""
+Circuit breakers and call deadlines for visual-impaired-assistant.
+
+googletrans and the Google speech endpoint fail slowly: each call waits out
+its own network timeout before the caller falls back. A CircuitBreaker
+tracks the failure rate of recent calls to one service. Once it trips, calls
+are refused immediately (the callers' fallbacks run in microseconds) until
+a cool-down has passed. Then a single trial call decides whether the
+service is back.
+
+call_with_deadline bounds a blocking call from the caller's side, so a hung
+request costs at most its deadline even when the library has no timeout.
+Breaker state is exported through METRICS as `circuit_state{service=...}`
+(0 closed, 1 half-open, 2 open).
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call did not finish within its deadline (it may still be running)."""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one service; thread-safe.
+
+    window        — most recent calls the failure rate is computed over
+    failure_rate  — trip when at least this fraction of them failed ...
+    min_calls     — ... and at least this many calls were seen
+    reset_timeout — seconds open before a half-open trial call is let through
+    clock         — monotonic time source, for tests
+    """
+
+    def __init__(self, name: str, window: int = 20, failure_rate: float = 0.5,
+                 min_calls: int = 4, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._results: deque = deque(maxlen=window)   # True = failure
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self._export()
+
+    @classmethod
+    def from_env(cls, name: str, **options) -> 'CircuitBreaker':
+        """VA_CIRCUIT_FAILURE_RATE, VA_CIRCUIT_MIN_CALLS and VA_CIRCUIT_RESET (seconds)."""
+        env = {'failure_rate': ('VA_CIRCUIT_FAILURE_RATE', float),
+               'min_calls': ('VA_CIRCUIT_MIN_CALLS', int),
+               'reset_timeout': ('VA_CIRCUIT_RESET', float)}
+        for option, (var, kind) in env.items():
+            if os.environ.get(var) and option not in options:
+                options[option] = kind(os.environ[var])
+        return cls(name, **options)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    # ── Gate ─────────────────────────────────────────────────────────────────
+
+    def allow(self) -> bool:
+        """True if a call may go ahead; in half-open state only one trial at a time."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            self.rejected += 1
+        METRICS.inc('circuit_rejected', service=self.name)
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._trial = False
+            if self._state != CLOSED:
+                self._results.clear()
+                self._transition(CLOSED)
+            self._results.append(False)
+            self._export_rate()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._trial = False
+            self._results.append(True)
+            self._export_rate()
+            if self._state == HALF_OPEN or (
+                    self._state == CLOSED and len(self._results) >= self.min_calls
+                    and self._rate() >= self.failure_rate):
+                self._opened_at = self._clock()
+                self._transition(OPEN)
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) through the breaker; raises CircuitOpenError when refused."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._trial = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'state': self._current_state(), 'failure_rate': self._rate(),
+                    'calls': len(self._results), 'rejected': self.rejected}
+
+    # ── Internals (lock held) ────────────────────────────────────────────────
+
+    def _rate(self) -> float:
+        return sum(self._results) / len(self._results) if self._results else 0.0
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        level = logging.WARNING if state == OPEN else logging.INFO
+        logger.log(level, "Circuit %s: %s -> %s.", self.name, self._state, state)
+        self._state = state
+        METRICS.inc('circuit_transitions', service=self.name, to=state)
+        self._export()
+
+    def _export(self) -> None:
+        METRICS.set_gauge('circuit_state', _STATE_VALUE[self._state], service=self.name)
+
+    def _export_rate(self) -> None:
+        METRICS.set_gauge('circuit_failure_rate', self._rate(), service=self.name)
+
+
+# ─────────────────────────────────────────────
+# Shared breakers — one per external service
+# ─────────────────────────────────────────────
+_breakers: dict = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(name: str, **options) -> CircuitBreaker:
+    """The process-wide breaker for a service, created on first use (see from_env)."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker.from_env(name, **options)
+        return _breakers[name]
+
+
+def reset_breakers() -> None:
+    """Close every shared breaker, e.g. after the network is known to be back."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for b in breakers:
+        b.reset()
+
+
+def breaker_stats() -> dict:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: b.stats() for name, b in breakers.items()}
+
+
+# ─────────────────────────────────────────────
+# Deadlines
+# ─────────────────────────────────────────────
+_deadline_pool = None
+_deadline_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _deadline_pool
+    with _deadline_lock:
+        if _deadline_pool is None:
+            _deadline_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='deadline')
+        return _deadline_pool
+
+
+def call_with_deadline(fn, deadline: Optional[float], *args, **kwargs):
+    """
+    fn(*args, **kwargs), raising DeadlineExceeded after deadline seconds.
+    deadline=None calls fn directly. An abandoned call keeps its worker
+    thread until it returns; the breaker stops new calls piling up behind it.
+    """
+    if deadline is None:
+        return fn(*args, **kwargs)
+    future = _pool().submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=deadline)
+    except FutureTimeout:
+        future.cancel()
+        METRICS.inc('deadline_exceeded', call=getattr(fn, '__name__', 'call'))
+        raise DeadlineExceeded(f"no result within {deadline:g}s") from None
@@ -0,0 +1,347 @@
+"""
+Structured analysis results for visual-impaired-assistant.
+
+AnalysisPipeline used to hand back a list of pre-formatted strings, so
+storage had to re-parse them to count sentences and bulk jobs held every
+rendered line in memory. An AnalysisResult keeps one slotted SentenceRecord
+per sentence — tokens, POS tag ids, entities and sentiment scores — and
+renders the familiar description lines only when they are first read. It
+still behaves as a read-only sequence of those lines, so speaking,
+summarising and comparing against lists work unchanged.
+
+dump()/load() write and read results in a compact columnar binary format
+(string columns as length arrays plus one UTF-8 blob, numbers as typed
+arrays) for bulk jobs; each dump() call appends one self-describing block.
+"""
+import json
+import logging
+import math
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────
+# POS tags and rendering
+# ─────────────────────────────────────────────
+POS_DESCRIPTIONS = {
+    'CC': 'Coordinating conjunction', 'CD': 'Cardinal number',
+    'DT': 'Determiner', 'EX': 'Existential there', 'FW': 'Foreign word',
+    'IN': 'Preposition/subordinating conjunction', 'JJ': 'Adjective',
+    'JJR': 'Adjective, comparative', 'JJS': 'Adjective, superlative',
+    'LS': 'List item marker', 'MD': 'Modal', 'NN': 'Noun, singular',
+    'NNS': 'Noun, plural', 'NNP': 'Proper noun, singular',
+    'NNPS': 'Proper noun, plural', 'PDT': 'Predeterminer',
+    'POS': 'Possessive ending', 'PRP': 'Personal pronoun',
+    'PRP$': 'Possessive pronoun', 'RB': 'Adverb',
+    'RBR': 'Adverb, comparative', 'RBS': 'Adverb, superlative',
+    'RP': 'Particle', 'TO': 'to', 'UH': 'Interjection',
+    'VB': 'Verb, base form', 'VBD': 'Verb, past tense',
+    'VBG': 'Verb, gerund/present participle', 'VBN': 'Verb, past participle',
+    'VBP': 'Verb, non-3rd person singular present',
+    'VBZ': 'Verb, 3rd person singular present', 'WDT': 'Wh-determiner',
+    'WP': 'Wh-pronoun', 'WP$': 'Possessive wh-pronoun', 'WRB': 'Wh-adverb',
+}
+
+# Tag ids are indexes into TAGSET; append only, ids are stored in dumps.
+# Tags outside the Penn Treebank set are kept as id 0 and never rendered.
+TAGSET = ('',) + tuple(POS_DESCRIPTIONS) + (
+    '.', ',', ':', '``', "''", '$', '#', '(', ')', '-LRB-', '-RRB-', '-NONE-', 'SYM',
+)
+TAG_IDS = {tag: i for i, tag in enumerate(TAGSET)}
+_DESCRIPTION_BY_ID = tuple(POS_DESCRIPTIONS.get(tag) for tag in TAGSET)
+
+SCORE_KEYS = ('neg', 'neu', 'pos', 'compound')
+
+# SentenceRecord.status
+OK, FAILED, NER_FAILED = 0, 1, 2
+
+
+def sentiment_line(scores: dict) -> str:
+    c = scores['compound']
+    label = "positive" if c >= 0.05 else ("negative" if c <= -0.05 else "neutral")
+    return (
+        f"Sentiment: {label} (compound={c:.2f}, "
+        f"pos={scores['pos']:.2f}, neg={scores['neg']:.2f}, "
+        f"neu={scores['neu']:.2f})"
+    )
+
+
+# ─────────────────────────────────────────────
+# Records
+# ─────────────────────────────────────────────
+class SentenceRecord:
+    """
+    One analysed sentence.
+
+    tokens   — tuple of words as tagged
+    tag_ids  — bytes, one TAGSET index per token
+    entities — tuple of (label, text) pairs
+    scores   — (neg, neu, pos, compound), or None when sentiment was skipped
+    status   — OK, FAILED (nothing past the text is valid) or NER_FAILED
+    """
+    __slots__ = ('text', 'tokens', 'tag_ids', 'entities', 'scores', 'status')
+
+    def __init__(self, text: str, tokens=(), tag_ids=b'', entities=(), scores=None, status=OK):
+        self.text = text
+        self.tokens = tokens
+        self.tag_ids = tag_ids
+        self.entities = entities
+        self.scores = scores
+        self.status = status
+
+    @classmethod
+    def from_analysis(cls, text: str, tagged=None, entities=None, scores=None, status=OK):
+        """Build from (word, tag) pairs and a polarity_scores dict."""
+        tagged = tagged or ()
+        return cls(
+            text,
+            tuple(word for word, _ in tagged),
+            bytes(TAG_IDS.get(tag, 0) for _, tag in tagged),
+            tuple(tuple(entity) for entity in entities or ()),
+            None if scores is None else tuple(float(scores[key]) for key in SCORE_KEYS),
+            status,
+        )
+
+    @property
+    def tags(self) -> tuple:
+        return tuple(TAGSET[i] for i in self.tag_ids)
+
+    @property
+    def sentiment(self):
+        """The scores as a polarity_scores dict, or None."""
+        return None if self.scores is None else dict(zip(SCORE_KEYS, self.scores))
+
+    def render(self, i: int) -> list:
+        lines = [f"\nAnalysing sentence {i}: {self.text}"]
+        if self.status == FAILED:
+            lines.append(f"Note: Could not fully analyse sentence {i}.")
+            return lines
+
+        word_types: dict = {}
+        for word, tag_id in zip(self.tokens, self.tag_ids):
+            category = _DESCRIPTION_BY_ID[tag_id]
+            if category:
+                word_types.setdefault(category, []).append(word)
+        for category, words in word_types.items():
+            lines.append(f"{category}: {', '.join(words)}")
+
+        if self.status == NER_FAILED:
+            lines.append("Note: Named entity recognition unavailable.")
+        elif self.entities:
+            lines.append(f"Named entities: {', '.join(f'{label}: {text}' for label, text in self.entities)}")
+
+        if self.scores is not None:
+            lines.append(sentiment_line(self.sentiment))
+        return lines
+
+    def __eq__(self, other):
+        if not isinstance(other, SentenceRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SentenceRecord({self.text!r}, status={self.status})"
+
+
+class AnalysisResult(Sequence):
+    """
+    The analysis of one utterance: header lines plus one record per sentence.
+
+    Reads as a sequence of description lines, rendered on first access.
+    Results that only exist as text (native Hindi) pass every line as head
+    and give sentence_count explicitly.
+    """
+    __slots__ = ('head', 'sentences', 'sentence_count', '_lines')
+
+    def __init__(self, head=(), sentences=(), sentence_count=None):
+        self.head = tuple(head)
+        self.sentences = tuple(sentences)
+        self.sentence_count = len(self.sentences) if sentence_count is None else sentence_count
+        self._lines = None
+
+    @property
+    def lines(self) -> list:
+        if self._lines is None:
+            lines = list(self.head)
+            for i, sentence in enumerate(self.sentences, 1):
+                lines.extend(sentence.render(i))
+            self._lines = lines
+        return self._lines
+
+    @property
+    def rendered(self) -> bool:
+        return self._lines is not None
+
+    def __getitem__(self, index):
+        return self.lines[index]
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __eq__(self, other):
+        if isinstance(other, AnalysisResult):
+            return self.lines == other.lines
+        if isinstance(other, (list, tuple)):
+            return self.lines == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"AnalysisResult({self.lines!r})"
+
+    def __getstate__(self):
+        # Lines are derived; don't ship them between processes.
+        return None, {'head': self.head, 'sentences': self.sentences,
+                      'sentence_count': self.sentence_count, '_lines': None}
+
+
+# ─────────────────────────────────────────────
+# Columnar binary export
+# ─────────────────────────────────────────────
+_MAGIC = b'VARC\x01'
+_LENGTH = struct.Struct('<I')
+
+
+def _strings(values) -> tuple:
+    """(lengths array, UTF-8 blob) for a string column."""
+    encoded = [value.encode('utf-8') for value in values]
+    return array('I', map(len, encoded)), b''.join(encoded)
+
+
+def _unstrings(lengths, blob: bytes) -> list:
+    out, offset = [], 0
+    for length in lengths:
+        out.append(blob[offset:offset + length].decode('utf-8'))
+        offset += length
+    return out
+
+
+def to_columns(results) -> dict:
+    """Flatten results into typed columns (arrays, bytes and string lists)."""
+    columns = {
+        'n_head': array('I'), 'n_sentences': array('I'), 'sentence_count': array('I'),
+        'head': [], 'text': [], 'status': array('B'), 'n_tokens': array('I'),
+        'n_entities': array('I'), 'scores': array('d'), 'tokens': [], 'tag_ids': bytearray(),
+        'entity_label': [], 'entity_text': [],
+    }
+    for result in results:
+        columns['n_head'].append(len(result.head))
+        columns['n_sentences'].append(len(result.sentences))
+        columns['sentence_count'].append(result.sentence_count)
+        columns['head'].extend(result.head)
+        for sentence in result.sentences:
+            columns['text'].append(sentence.text)
+            columns['status'].append(sentence.status)
+            columns['n_tokens'].append(len(sentence.tokens))
+            columns['n_entities'].append(len(sentence.entities))
+            columns['scores'].extend(sentence.scores or (math.nan,) * len(SCORE_KEYS))
+            columns['tokens'].extend(sentence.tokens)
+            columns['tag_ids'] += sentence.tag_ids
+            for label, text in sentence.entities:
+                columns['entity_label'].append(label)
+                columns['entity_text'].append(text)
+    return columns
+
+
+def from_columns(columns: dict) -> list:
+    """Rebuild AnalysisResults from to_columns output."""
+    head, texts = iter(columns['head']), iter(columns['text'])
+    tokens, labels, entity_texts = iter(columns['tokens']), iter(columns['entity_label']), iter(columns['entity_text'])
+    status, n_tokens, n_entities = iter(columns['status']), iter(columns['n_tokens']), iter(columns['n_entities'])
+    scores, tag_ids = columns['scores'], bytes(columns['tag_ids'])
+    results, sentence, tag_offset = [], 0, 0
+    for n_head, n_sentences, count in zip(columns['n_head'], columns['n_sentences'],
+                                          columns['sentence_count']):
+        records = []
+        for _ in range(n_sentences):
+            n = next(n_tokens)
+            values = tuple(scores[sentence * 4:sentence * 4 + 4])
+            records.append(SentenceRecord(
+                next(texts),
+                tuple(next(tokens) for _ in range(n)),
+                tag_ids[tag_offset:tag_offset + n],
+                tuple((next(labels), next(entity_texts)) for _ in range(next(n_entities))),
+                None if math.isnan(values[0]) else values,
+                next(status),
+            ))
+            sentence += 1
+            tag_offset += n
+        results.append(AnalysisResult([next(head) for _ in range(n_head)], records, count))
+    return results
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def dump(results, fh) -> int:
+    """Append results to binary file object fh as one block; returns bytes written."""
+    parts, layout = [], []
+    for name, column in to_columns(results).items():
+        if isinstance(column, list):
+            lengths, blob = _strings(column)
+            parts += [_little_endian(lengths), blob]
+            layout.append([name, 's', len(column), len(blob)])
+        elif isinstance(column, array):
+            parts.append(_little_endian(column))
+            layout.append([name, column.typecode, len(column), 0])
+        else:
+            parts.append(bytes(column))
+            layout.append([name, 'y', len(column), 0])
+    header = json.dumps(layout, separators=(',', ':')).encode('utf-8')
+    block = b''.join([_MAGIC, _LENGTH.pack(len(header)), header] + parts)
+    fh.write(block)
+    return len(block)
+
+
+def _read(fh, size: int) -> bytes:
+    data = fh.read(size)
+    if len(data) != size:
+        raise ValueError("truncated analysis results block")
+    return data
+
+
+def _column(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+def iter_load(fh):
+    """Yield AnalysisResults from every block in binary file object fh."""
+    while True:
+        magic = fh.read(len(_MAGIC))
+        if not magic:
+            return
+        if magic != _MAGIC:
+            raise ValueError("not an analysis results file")
+        header = json.loads(_read(fh, _LENGTH.unpack(_read(fh, _LENGTH.size))[0]))
+        columns = {}
+        for name, typecode, count, blob_size in header:
+            if typecode == 's':
+                lengths = _column('I', _read(fh, count * array('I').itemsize))
+                columns[name] = _unstrings(lengths, _read(fh, blob_size))
+            elif typecode == 'y':
+                columns[name] = _read(fh, count)
+            else:
+                columns[name] = _column(typecode, _read(fh, count * array(typecode).itemsize))
+        yield from from_columns(columns)
+
+
+def load(fh) -> list:
+    return list(iter_load(fh))
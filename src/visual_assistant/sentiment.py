@@ -0,0 +1,266 @@
+"""
+Batch VADER scoring for visual-impaired-assistant.
+
+SentimentIntensityAnalyzer.polarity_scores walks each sentence token by
+token in Python. BatchSentimentScorer compiles the VADER lexicon, booster
+and negation lists into per-token arrays once per batch vocabulary, then
+applies every VADER rule (caps emphasis, boosters, negation, "never so",
+idioms, "least", "but" and punctuation emphasis) as NumPy operations over
+all tokens of all sentences at once. Scores match polarity_scores within
+rounding.
+
+NumPy is optional and imported on first use: without it, numpy_available()
+is False and callers keep using the analyser one sentence at a time.
+"""
+import logging
+import math
+import string
+
+from ._lazy import installed, np
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = frozenset(string.punctuation)
+
+
+def numpy_available() -> bool:
+    return installed('numpy')
+
+
+def vader_words(text: str, punc_list) -> list:
+    """VADER's words_and_emoticons: split, drop singletons, strip one punctuation run."""
+    words = []
+    for token in text.split():
+        if len(token) <= 1:
+            continue
+        for punc in punc_list:
+            if token.endswith(punc):
+                word = token[:-len(punc)]
+            elif token.startswith(punc):
+                word = token[len(punc):]
+            else:
+                continue
+            if len(word) > 1 and not _PUNCTUATION.intersection(word):
+                token = word
+                break
+        words.append(token)
+    return words
+
+
+class BatchSentimentScorer:
+    """
+    Vectorised polarity_scores over many sentences.
+
+    lexicon   — {word: valence} (SentimentIntensityAnalyzer.lexicon)
+    constants — nltk's VaderConstants (boosters, negations, idioms, scalars)
+    """
+
+    def __init__(self, lexicon: dict, constants):
+        if not numpy_available():
+            raise ImportError("BatchSentimentScorer needs numpy")
+        self.lexicon = lexicon
+        self.c = constants
+        # Boosters and idioms made of several words are matched as token runs.
+        self._multi_boosters = [k.split() for k in constants.BOOSTER_DICT if ' ' in k]
+        self._idioms = [(k.split(), v) for k, v in constants.SPECIAL_CASE_IDIOMS.items()]
+
+    @classmethod
+    def from_analyzer(cls, analyzer) -> 'BatchSentimentScorer':
+        return cls(analyzer.lexicon, analyzer.constants)
+
+    # ── Vocabulary ───────────────────────────────────────────────────────────
+
+    def _features(self, vocab: list) -> dict:
+        """Per-word arrays for the distinct words of a batch."""
+        c, lexicon = self.c, self.lexicon
+        lowered = [w.lower() for w in vocab]
+        n = len(vocab)
+        valence = np.fromiter((lexicon.get(w, np.nan) for w in lowered), float, n)
+        return {
+            'lower': lowered,
+            'valence': valence,
+            'in_lex': ~np.isnan(valence),
+            'booster': np.fromiter((c.BOOSTER_DICT.get(w, 0.0) for w in lowered), float, n),
+            'is_booster': np.fromiter((w in c.BOOSTER_DICT for w in lowered), bool, n),
+            'upper': np.fromiter((w.isupper() for w in vocab), bool, n),
+            'negated': np.fromiter((w in c.NEGATE or "n't" in w for w in lowered), bool, n),
+        }
+
+    # ── Scoring ──────────────────────────────────────────────────────────────
+
+    def polarity_scores(self, text: str) -> dict:
+        return self.polarity_scores_many([text])[0]
+
+    def polarity_scores_many(self, texts) -> list:
+        """polarity_scores for every text, computed in one vectorised pass."""
+        texts = list(texts)
+        if not texts:
+            return []
+        c = self.c
+        tokenised = [vader_words(t, c.PUNC_LIST) for t in texts]
+        lengths = np.fromiter((len(w) for w in tokenised), int, len(texts))
+        flat = [w for words in tokenised for w in words]
+        if not flat:
+            return [self._result(0.0, 0.0, 0.0, 0.0) for _ in texts]
+
+        vocab, exact = np.unique(np.array(flat, dtype=object), return_inverse=True)
+        vocab, exact = vocab.tolist(), exact.ravel()
+        f = self._features(vocab)
+        lower_vocab, lower_ids = np.unique(np.array(f['lower'], dtype=object), return_inverse=True)
+        lower_ids = lower_ids.ravel()
+        lower_index = {w: i for i, w in enumerate(lower_vocab.tolist())}
+        exact_index = {w: i for i, w in enumerate(vocab)}
+        low = lower_ids[exact]
+
+        n = len(flat)
+        sent = np.repeat(np.arange(len(texts)), lengths)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        pos = np.arange(n) - starts[sent]
+        length = lengths[sent]
+
+        def shifted(values, k, fill):
+            """values[i - k] (k > 0 looks back, k < 0 ahead), fill outside the sentence."""
+            if k == 0:
+                return values
+            out = np.full(n, fill, dtype=values.dtype)
+            if k > 0:
+                out[k:] = values[:-k]
+                out[pos < k] = fill
+            else:
+                out[:k] = values[-k:]
+                out[pos - k >= length] = fill
+            return out
+
+        def is_lower(k, word):
+            idx = lower_index.get(word, -1)
+            return shifted(low, k, -2) == idx if idx >= 0 else np.zeros(n, bool)
+
+        def is_exact(k, word):
+            idx = exact_index.get(word, -1)
+            return shifted(exact, k, -2) == idx if idx >= 0 else np.zeros(n, bool)
+
+        def run_matches(offsets, words, match):
+            mask = np.ones(n, bool)
+            for k, word in zip(offsets, words):
+                mask &= match(k, word)
+            return mask
+
+        in_lex = f['in_lex'][exact]
+        upper = f['upper'][exact]
+        caps_total = np.bincount(sent, weights=upper, minlength=len(texts))
+        cap_diff = ((lengths - caps_total) > 0) & ((lengths - caps_total) < lengths)
+        cap_diff = cap_diff[sent]
+
+        v = np.where(in_lex, f['valence'][exact], 0.0)
+        caps = upper & cap_diff
+        v = np.where(caps & in_lex, np.where(v > 0, v + c.C_INCR, v - c.C_INCR), v)
+
+        so_or_this = {k: is_exact(k, 'so') | is_exact(k, 'this') for k in (1, 2)}
+        for start_i, damp in ((0, 1.0), (1, 0.95), (2, 0.9)):
+            k = start_i + 1
+            prev = shifted(exact, k, 0)
+            apply = in_lex & (pos >= k) & ~f['in_lex'][prev]
+            s = np.where(f['is_booster'][prev], f['booster'][prev], 0.0)
+            s = np.where(v < 0, -s, s)
+            boosted_caps = f['is_booster'][prev] & f['upper'][prev] & cap_diff
+            s = np.where(boosted_caps, np.where(v > 0, s + c.C_INCR, s - c.C_INCR), s)
+            v = np.where(apply, v + s * damp, v)
+
+            negated = f['negated'][prev]
+            if start_i == 0:
+                factor = np.where(negated, c.N_SCALAR, 1.0)
+            elif start_i == 1:
+                never_so = is_exact(2, 'never') & so_or_this[1]
+                factor = np.where(never_so, 1.5, np.where(negated, c.N_SCALAR, 1.0))
+            else:
+                never_so = (is_exact(3, 'never') & so_or_this[2]) | so_or_this[1]
+                factor = np.where(never_so, 1.25, np.where(negated, c.N_SCALAR, 1.0))
+            v = np.where(apply, v * factor, v)
+            if start_i == 2:
+                v = np.where(apply, self._idioms_check(v, n, is_exact, run_matches), v)
+
+        # "least" negates the next word unless it is "at least" / "very least".
+        prev_least = is_lower(1, 'least') & ~f['in_lex'][shifted(exact, 1, 0)]
+        exempt = (pos > 1) & (is_lower(2, 'at') | is_lower(2, 'very'))
+        v = np.where(in_lex & prev_least & ~exempt, v * c.N_SCALAR, v)
+
+        # Boosters (and "kind" in "kind of") carry no valence of their own.
+        skip = f['is_booster'][exact] | (is_lower(0, 'kind') & is_lower(-1, 'of'))
+        v = np.where(skip, 0.0, v)
+
+        # polarity_scores scores a repeated word in the context of its first
+        # occurrence (words.index(item)); reproduce that.
+        key = sent * (len(vocab) + 1) + exact
+        keys, first = np.unique(key, return_index=True)
+        first_of = first[np.searchsorted(keys, key)]
+        v = v[first_of]
+
+        # "but": halve what comes before the first one, boost what follows.
+        big = np.iinfo(np.int64).max
+        but_at = np.full(len(texts), big, dtype=np.int64)
+        is_but = is_lower(0, 'but')
+        np.minimum.at(but_at, sent[is_but], pos[is_but])
+        but_pos = but_at[sent]
+        has_but = but_pos != big
+        v = np.where(has_but & (pos < but_pos), v * 0.5, np.where(has_but & (pos > but_pos), v * 1.5, v))
+
+        count = len(texts)
+        sum_s = np.bincount(sent, weights=v, minlength=count)
+        pos_sum = np.bincount(sent, weights=np.where(v > 0, v + 1, 0.0), minlength=count)
+        neg_sum = np.bincount(sent, weights=np.where(v < 0, v - 1, 0.0), minlength=count)
+        neu = np.bincount(sent, weights=(v == 0), minlength=count)
+
+        results = []
+        for i, text in enumerate(texts):
+            if not lengths[i]:
+                results.append(self._result(0.0, 0.0, 0.0, 0.0))
+                continue
+            results.append(self._finish(float(sum_s[i]), float(pos_sum[i]),
+                                        float(neg_sum[i]), float(neu[i]), text))
+        return results
+
+    def _idioms_check(self, v, n, is_exact, run_matches):
+        """Idiom overrides and the "kind of" dampener for tokens three or more in."""
+        c = self.c
+        out = v.copy()
+        # First matching sequence wins, so apply them in reverse preference.
+        sequences = ((1, 0), (2, 1, 0), (2, 1), (3, 2, 1), (3, 2))
+        for offsets in reversed(sequences):
+            for words, value in self._idioms:
+                if len(words) == len(offsets):
+                    out = np.where(run_matches(offsets, words, is_exact), value, out)
+        for offsets in ((0, -1), (0, -1, -2)):
+            for words, value in self._idioms:
+                if len(words) == len(offsets):
+                    out = np.where(run_matches(offsets, words, is_exact), value, out)
+        dampened = np.zeros(n, bool)
+        for words in self._multi_boosters:
+            if len(words) == 2:
+                dampened |= run_matches((3, 2), words, is_exact) | run_matches((2, 1), words, is_exact)
+        return np.where(dampened, out + c.B_DECR, out)
+
+    def _finish(self, sum_s, pos_sum, neg_sum, neu_count, text) -> dict:
+        """score_valence from the per-sentence sums."""
+        ep = min(text.count('!'), 4) * 0.292
+        qm_count = text.count('?')
+        qm = 0.0
+        if qm_count > 1:
+            qm = qm_count * 0.18 if qm_count <= 3 else 0.96
+        amplifier = ep + qm
+        if sum_s > 0:
+            sum_s += amplifier
+        elif sum_s < 0:
+            sum_s -= amplifier
+        compound = sum_s / math.sqrt(sum_s * sum_s + 15)
+        if pos_sum > math.fabs(neg_sum):
+            pos_sum += amplifier
+        elif pos_sum < math.fabs(neg_sum):
+            neg_sum -= amplifier
+        total = pos_sum + math.fabs(neg_sum) + neu_count
+        return self._result(compound, math.fabs(pos_sum / total),
+                            math.fabs(neg_sum / total), math.fabs(neu_count / total))
+
+    @staticmethod
+    def _result(compound, pos, neg, neu) -> dict:
+        return {'neg': round(neg, 3), 'neu': round(neu, 3), 'pos': round(pos, 3),
+                'compound': round(compound, 4)}
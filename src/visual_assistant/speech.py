@@ -0,0 +1,174 @@
+"""
+Asynchronous speech output for visual-impaired-assistant.
+
+A single worker thread owns the TTS engine and drains a bounded priority
+queue, so analysis never waits on playback. Lines that are queued
+back-to-back are coalesced into one engine run, and cancel() drops stale
+output so a new utterance can interrupt the previous one.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0     # prompts and errors — spoken before anything else queued
+PRIORITY_NORMAL = 1   # analysis output
+PRIORITY_LOW = 2      # filler that may be dropped first
+
+_STOP = object()
+
+
+class SpeechQueue:
+    """
+    Bounded, prioritised TTS queue served by one background thread.
+
+    speak_batch(texts) is called on the worker thread with one or more lines
+    and must block until they have been spoken. on_cancel(), if given, is
+    called from cancel() to interrupt the batch currently playing. on_idle(),
+    if given, runs on the worker thread whenever the queue is empty and should
+    do one short unit of background work, returning True if more remains.
+    """
+
+    def __init__(self, speak_batch, on_cancel=None, maxsize: int = 256, max_batch: int = 8,
+                 on_idle=None, idle_interval: float = 0.5):
+        self._speak_batch = speak_batch
+        self._on_cancel = on_cancel
+        self._on_idle = on_idle
+        self._idle_interval = idle_interval
+        self._max_batch = max_batch
+        self._queue: queue.PriorityQueue = queue.PriorityQueue(maxsize)
+        self._seq = itertools.count()
+        self._generation = 0
+        self._pending = 0
+        self._speaking = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, name='speech-queue', daemon=True)
+        self._thread.start()
+
+    # ── Producer API ─────────────────────────────────────────────────────────
+
+    def say(self, text: str, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> bool:
+        """Queue text for playback. Returns False if the queue stayed full."""
+        if not text:
+            return True
+        with self._cond:
+            generation = self._generation
+            self._pending += 1
+        try:
+            self._queue.put((priority, next(self._seq), generation, text, time.perf_counter()),
+                            timeout=timeout)
+        except queue.Full:
+            self._done(1)
+            logger.warning("Speech queue full — dropping: %.40s", text)
+            return False
+        return True
+
+    def cancel(self) -> int:
+        """Drop everything queued and interrupt the current batch. Returns lines dropped."""
+        with self._cond:
+            self._generation += 1
+            speaking = self._speaking
+        dropped = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[3] is _STOP:
+                # Keep the shutdown request — it must still reach the worker.
+                self._queue.put(item)
+                break
+            dropped += 1
+        self._done(dropped)
+        if speaking and self._on_cancel is not None:
+            try:
+                self._on_cancel()
+            except Exception as exc:
+                logger.warning("TTS cancel failed: %s", exc)
+        if dropped:
+            logger.info("Speech queue cancelled — %d stale line(s) dropped.", dropped)
+        return dropped
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far has been spoken."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._pending > 0
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Finish queued speech, then stop the worker."""
+        self.flush(timeout)
+        self._queue.put((PRIORITY_LOW + 1, next(self._seq), None, _STOP, 0.0))
+        self._thread.join(timeout)
+
+    # ── Worker ───────────────────────────────────────────────────────────────
+
+    def _done(self, count: int) -> None:
+        if not count:
+            return
+        with self._cond:
+            self._pending -= count
+            self._cond.notify_all()
+
+    def _take_batch(self, first):
+        """Coalesce whatever is already queued behind first into one batch."""
+        batch, stop = [first], False
+        while len(batch) < self._max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[3] is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _next_item(self):
+        """Block for the next queued item, running on_idle() while there is none."""
+        if self._on_idle is None:
+            return self._queue.get()
+        more = True
+        while True:
+            try:
+                return self._queue.get_nowait() if more else self._queue.get(timeout=self._idle_interval)
+            except queue.Empty:
+                pass
+            try:
+                more = bool(self._on_idle())
+            except Exception as exc:
+                logger.warning("Speech idle task failed: %s", exc)
+                more = False
+
+    def _worker(self) -> None:
+        while True:
+            first = self._next_item()
+            if first[3] is _STOP:
+                return
+            batch, stop = self._take_batch(first)
+
+            with self._cond:
+                live = [item[3] for item in batch if item[2] == self._generation]
+                self._speaking = bool(live)
+            METRICS.observe('speech_queue_wait', time.perf_counter() - first[4])
+            try:
+                if live:
+                    self._speak_batch(live)
+            except Exception as exc:
+                logger.error("Speech worker error: %s", exc)
+            finally:
+                with self._cond:
+                    self._speaking = False
+                self._done(len(batch))
+            if stop:
+                return
@@ -0,0 +1,139 @@
+"""
+Start-up helpers for visual-impaired-assistant.
+
+ModelWarmup loads the NLTK models (punkt, perceptron tagger, maxent
+chunker, VADER) on background threads while the microphone and TTS engine
+are being opened. StartupProfiler records a per-phase timing breakdown for
+`visual-assistant --startup-profile`.
+"""
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+
+from .pipeline import load_chunker, load_sentiment_analyzer, load_tagger
+
+logger = logging.getLogger(__name__)
+
+# Reference point for all phase offsets — as close to process start as we get.
+_T0 = time.perf_counter()
+
+
+class StartupProfiler:
+    """Collects (phase, start, duration, thread) records; thread-safe."""
+
+    def __init__(self, enabled: bool = False, stream=None):
+        self.enabled = enabled
+        self._stream = stream
+        self._records = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float) -> None:
+        with self._lock:
+            self._records.append((name, start - _T0, end - start, threading.current_thread().name))
+
+    def mark(self, name: str) -> None:
+        """Record an instant, e.g. the moment the first prompt is queued."""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def records(self) -> list:
+        with self._lock:
+            return sorted(self._records, key=lambda r: r[1])
+
+    def report(self) -> str:
+        lines = [f"{'phase':<24} {'start ms':>10} {'took ms':>10}  thread"]
+        for name, offset, duration, thread in self.records():
+            lines.append(f"{name:<24} {offset * 1000:>10.1f} {duration * 1000:>10.1f}  {thread}")
+        return '\n'.join(lines)
+
+    def print_report(self, *_args) -> None:
+        if self.enabled:
+            print("\nStartup profile\n" + self.report(), file=self._stream or sys.stderr, flush=True)
+
+
+# ── Model loaders — tagger, chunker and VADER come from the shared pipeline ──
+
+def _warm_punkt():
+    import nltk
+    nltk.word_tokenize(nltk.sent_tokenize("Warm up the tokenizer.")[0])
+
+
+class ModelWarmup:
+    """
+    Starts model loads on background threads as soon as it is created.
+
+    prepare (e.g. initialize_nltk) runs first; the model loaders then run in
+    parallel. Failures are logged, never raised — the assistant degrades the
+    same way it would if the load had failed inline.
+    """
+
+    LOADERS = {
+        'punkt': _warm_punkt,
+        'tagger': load_tagger,
+        'chunker': load_chunker,
+        'vader': load_sentiment_analyzer,
+    }
+
+    def __init__(self, prepare=None, profiler: Optional[StartupProfiler] = None):
+        self.profiler = profiler or StartupProfiler()
+        self._pool = ThreadPoolExecutor(max_workers=len(self.LOADERS) + 2,  # + prepare, Firebase
+                                        thread_name_prefix='warmup')
+        self._prepared = self._pool.submit(self._run, 'nltk_resources', prepare or (lambda: None))
+        self._futures = {
+            name: self._pool.submit(self._load, name, loader)
+            for name, loader in self.LOADERS.items()
+        }
+
+    def _run(self, name, fn):
+        with self.profiler.phase(name):
+            return fn()
+
+    def _load(self, name, loader):
+        try:
+            self._prepared.result()
+        except Exception as exc:
+            logger.warning("NLTK resource check failed: %s", exc)
+        return self._run(f"load_{name}", loader)
+
+    def submit(self, name: str, fn):
+        """Run another start-up task (e.g. Firebase init) alongside the models."""
+        return self._pool.submit(self._run, name, fn)
+
+    def result(self, name: str, timeout: Optional[float] = None):
+        """Block until the named model is loaded; None if it failed."""
+        try:
+            return self._futures[name].result(timeout)
+        except Exception as exc:
+            logger.warning("Model '%s' unavailable: %s", name, exc)
+            return None
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        for name in self._futures:
+            self.result(name, timeout)
+
+    def add_done_callback(self, fn) -> None:
+        """Call fn() once every model load has finished (successfully or not)."""
+        remaining = [len(self._futures)]
+        lock = threading.Lock()
+
+        def one_done(_future):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                fn()
+
+        for future in self._futures.values():
+            future.add_done_callback(one_done)
@@ -0,0 +1,206 @@
+"""
+Non-blocking Firebase storage for visual-impaired-assistant.
+
+FirebaseWriter takes entries off the main loop: a background thread batches
+them into one multi-path update() per round trip, under collision-free keys.
+While the backend is unreachable, entries are appended to a local JSONL
+spool file and drained back to Firebase once writes succeed again.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def new_entry_key() -> str:
+    """Time-ordered, collision-free key: millisecond timestamp plus random suffix."""
+    return f"entry_{int(time.time() * 1000):013d}_{uuid.uuid4().hex[:12]}"
+
+
+class FirebaseWriter:
+    """
+    Background writer in front of a firebase_admin.db.Reference.
+
+    ref            — reference the entries are written under (needs update())
+    spool_path     — append-only JSONL file used while the backend is down
+    batch_size     — most entries sent in one update()
+    retry_interval — seconds to wait after a failure before trying again
+    """
+
+    def __init__(self, ref, spool_path: Optional[str] = None, maxsize: int = 1000,
+                 batch_size: int = 50, retry_interval: float = 30.0):
+        self.ref = ref
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._spool_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._retry_at = 0.0
+        self.written = 0
+        self.spooled = 0
+        self.drained = 0
+        self._thread = threading.Thread(target=self._worker, name='firebase-writer', daemon=True)
+        self._thread.start()
+
+    # ── Producer API ─────────────────────────────────────────────────────────
+
+    def submit(self, value: dict) -> str:
+        """Queue one entry; never blocks. Returns its key."""
+        key = new_entry_key()
+        with self._cond:
+            self._pending += 1
+        try:
+            self._queue.put_nowait((key, value))
+        except queue.Full:
+            logger.warning("Firebase queue full — spooling %s locally.", key)
+            self._spool([(key, value)])
+            self._done(1)
+        return key
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted entry is written or spooled."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        self.flush(timeout)
+        self._queue.put((None, _STOP))
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'spooled': self.spooled,
+            'drained': self.drained,
+        }
+
+    # ── Worker ───────────────────────────────────────────────────────────────
+
+    def _done(self, count: int) -> None:
+        with self._cond:
+            self._pending -= count
+            self._cond.notify_all()
+
+    def _worker(self) -> None:
+        self._drain_spool()  # leftovers from a previous run
+        while True:
+            try:
+                first = self._queue.get(timeout=self.retry_interval)
+            except queue.Empty:
+                self._drain_spool()
+                continue
+            if first[1] is _STOP:
+                return
+            batch, stop = [first], False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[1] is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if time.monotonic() < self._retry_at or not self._write(batch):
+                self._spool(batch)
+            else:
+                self.written += len(batch)
+                METRICS.inc('firebase_entries', len(batch), outcome='written')
+                self._drain_spool()
+            self._done(len(batch))
+            if stop:
+                return
+
+    def _write(self, batch) -> bool:
+        """One multi-path update for the whole batch. False on failure."""
+        try:
+            with METRICS.timer('firebase_write'):
+                self.ref.update({key: value for key, value in batch})
+            self._retry_at = 0.0
+            return True
+        except Exception as exc:
+            logger.error("Firebase write failed (%s) — spooling %d entries.", exc, len(batch))
+            self._retry_at = time.monotonic() + self.retry_interval
+            return False
+
+    # ── Local spool ──────────────────────────────────────────────────────────
+
+    def _spool(self, batch) -> None:
+        if not self.spool_path:
+            logger.error("No spool configured — dropping %d Firebase entries.", len(batch))
+            METRICS.inc('firebase_entries', len(batch), outcome='dropped')
+            return
+        with self._spool_lock:
+            try:
+                with open(self.spool_path, 'a', encoding='utf-8') as fh:
+                    for key, value in batch:
+                        fh.write(json.dumps({'key': key, 'value': value}) + '\n')
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                self.spooled += len(batch)
+                METRICS.inc('firebase_entries', len(batch), outcome='spooled')
+            except OSError as exc:
+                logger.error("Could not spool Firebase entries: %s", exc)
+
+    def _drain_spool(self) -> None:
+        """Re-send spooled entries. The spool is renamed first, so new failures
+        keep appending to a fresh file while this one drains."""
+        if not self.spool_path or time.monotonic() < self._retry_at:
+            return
+        draining = self.spool_path + '.draining'
+        with self._spool_lock:
+            if not os.path.exists(draining):
+                if not os.path.exists(self.spool_path):
+                    return
+                try:
+                    os.replace(self.spool_path, draining)
+                except OSError as exc:
+                    # The entries stay in the spool until the next attempt.
+                    logger.error("Could not rotate Firebase spool: %s", exc)
+                    return
+        try:
+            with open(draining, encoding='utf-8') as fh:
+                entries = []
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                        entries.append((record['key'], record['value']))
+                    except (ValueError, KeyError):
+                        logger.warning("Skipping corrupt spool line.")
+        except OSError as exc:
+            logger.error("Could not read Firebase spool: %s", exc)
+            return
+
+        for start in range(0, len(entries), self.batch_size):
+            if not self._write(entries[start:start + self.batch_size]):
+                # Keep what is left for the next attempt. If the rewrite fails the
+                # whole file stays; re-sending an entry overwrites the same key.
+                try:
+                    with open(draining, 'w', encoding='utf-8') as fh:
+                        for key, value in entries[start:]:
+                            fh.write(json.dumps({'key': key, 'value': value}) + '\n')
+                except OSError as exc:
+                    logger.error("Could not rewrite Firebase spool: %s", exc)
+                return
+            sent = len(entries[start:start + self.batch_size])
+            self.drained += sent
+            METRICS.inc('firebase_entries', sent, outcome='drained')
+        try:
+            os.remove(draining)
+        except OSError as exc:
+            logger.error("Could not remove drained Firebase spool: %s", exc)
+        logger.info("Drained %d spooled Firebase entries.", len(entries))
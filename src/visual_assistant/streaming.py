@@ -0,0 +1,346 @@
+"""
+Streaming capture for visual-impaired-assistant.
+
+The classic run() loop is serial — listen, recognise, analyse, speak, then
+listen again — so anything said while the assistant is busy is lost. In
+streaming mode a listener thread reads the audio source continuously into a
+ring buffer, an energy VAD cuts phrases out of it, and each phrase moves
+through recognition → analysis → output stages joined by bounded queues.
+
+Any object shaped like a speech_recognition AudioSource works as input
+(stream.read(CHUNK), SAMPLE_RATE, SAMPLE_WIDTH): sr.Microphone for live use,
+sr.AudioFile for WAV input in tests, benchmarks and replays.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from ._lazy import sr
+from .calibration import rms
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+# ─────────────────────────────────────────────
+# Ring buffer
+# ─────────────────────────────────────────────
+class RingBuffer:
+    """
+    Fixed-capacity byte FIFO between the listener and the segmenter.
+
+    A full buffer overwrites its oldest audio (live input must never block
+    the sound card); with lossless=True the writer waits instead, which is
+    what file input wants.
+    """
+
+    def __init__(self, capacity: int, lossless: bool = False):
+        self.capacity = capacity
+        self.lossless = lossless
+        self.dropped = 0
+        self._buf = bytearray(capacity)
+        self._start = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._size
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        if self.lossless and len(data) > self.capacity:
+            # More than the whole buffer could ever hold: hand it over in
+            # capacity-sized pieces, each waiting for the reader.
+            for start in range(0, len(data), self.capacity):
+                self.write(data[start:start + self.capacity])
+            return
+        with self._cond:
+            if self.lossless:
+                self._cond.wait_for(lambda: self._closed or
+                                    self._size + len(data) <= self.capacity)
+                if self._closed:
+                    return
+            if len(data) > self.capacity:
+                self.dropped += len(data) - self.capacity
+                data = data[-self.capacity:]
+            overflow = self._size + len(data) - self.capacity
+            if overflow > 0:
+                self._start = (self._start + overflow) % self.capacity
+                self._size -= overflow
+                self.dropped += overflow
+            end = (self._start + self._size) % self.capacity
+            first = min(len(data), self.capacity - end)
+            self._buf[end:end + first] = data[:first]
+            self._buf[:len(data) - first] = data[first:]
+            self._size += len(data)
+            self._cond.notify_all()
+
+    def read(self, size: int, timeout: Optional[float] = None) -> bytes:
+        """
+        Wait for size bytes and return them. Returns fewer once the buffer is
+        closed (b'' means drained) or the timeout passes.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._size >= size or self._closed, timeout)
+            size = min(size, self._size)
+            first = min(size, self.capacity - self._start)
+            out = bytes(self._buf[self._start:self._start + first]) + bytes(self._buf[:size - first])
+            self._start = (self._start + size) % self.capacity
+            self._size -= size
+            self._cond.notify_all()
+            return out
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+# ─────────────────────────────────────────────
+# Voice-activity segmentation
+# ─────────────────────────────────────────────
+class PhraseSegmenter:
+    """
+    Energy VAD over fixed-size frames.
+
+    A frame louder than threshold opens a phrase (with pre_roll seconds of
+    the audio before it); pause seconds of quiet close it. Phrases with less
+    than min_phrase seconds of voiced audio are discarded as clicks, and
+    phrases are cut at max_phrase seconds.
+    """
+
+    def __init__(self, sample_rate: int, sample_width: int, frame_bytes: int,
+                 threshold: float = 300.0, pause: float = 0.8, pre_roll: float = 0.3,
+                 min_phrase: float = 0.25, max_phrase: float = 10.0):
+        self.sample_width = sample_width
+        self.threshold = threshold
+        frame_seconds = frame_bytes / float(sample_rate * sample_width)
+        self._pause_frames = max(1, round(pause / frame_seconds))
+        self._min_frames = max(1, round(min_phrase / frame_seconds))
+        self._max_frames = max(1, round(max_phrase / frame_seconds))
+        self._pre_roll = deque(maxlen=max(0, round(pre_roll / frame_seconds)))
+        self._phrase: list = []
+        self._voiced = 0
+        self._silent = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self._phrase)
+
+    def feed(self, frame: bytes) -> Optional[bytes]:
+        """Add one frame; return the phrase's PCM once it is complete."""
+        loud = rms(frame, self.sample_width) > self.threshold
+        if not self._phrase:
+            if not loud:
+                self._pre_roll.append(frame)
+                return None
+            self._phrase = list(self._pre_roll)
+            self._pre_roll.clear()
+            self._voiced = self._silent = 0
+
+        self._phrase.append(frame)
+        if loud:
+            self._voiced += 1
+            self._silent = 0
+        else:
+            self._silent += 1
+        if self._silent >= self._pause_frames or len(self._phrase) >= self._max_frames:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[bytes]:
+        """Close the open phrase (end of input); None if it was too short."""
+        phrase, voiced = self._phrase, self._voiced
+        self._phrase, self._voiced, self._silent = [], 0, 0
+        if not phrase:
+            return None
+        if voiced < self._min_frames:
+            METRICS.inc('stream_phrases', outcome='discarded')
+            return None
+        return b''.join(phrase)
+
+
+def _audio_data(frames: bytes, sample_rate: int, sample_width: int):
+    return sr.AudioData(frames, sample_rate, sample_width)
+
+
+# ─────────────────────────────────────────────
+# Staged pipeline
+# ─────────────────────────────────────────────
+class StreamingPipeline:
+    """
+    Continuous listen → segment → recognise → analyse → output.
+
+    recognize(audio)             -> (text, is_hindi); raise to drop the phrase
+    analyse(text, is_hindi)      -> description lines; falsy drops the phrase
+    output(text, is_hindi, lines)-> anything (speaking, storage)
+
+    Each stage runs on its own thread, so a phrase can be recognised while
+    the previous one is still being analysed or spoken. gate() returning
+    True drops incoming audio (e.g. while the assistant itself is talking).
+    on_error(stage, exc) sees every stage failure.
+    """
+
+    def __init__(self, source, recognize, analyse, output, threshold: float = 300.0,
+                 audio_factory=None, gate=None, on_error=None, lossless: bool = False,
+                 buffer_seconds: float = 30.0, queue_size: int = 8, **segmenter_options):
+        self.source = source
+        self.recognize = recognize
+        self.analyse = analyse
+        self.output = output
+        self.audio_factory = audio_factory or _audio_data
+        self.gate = gate
+        self.on_error = on_error
+
+        self.sample_rate = getattr(source, 'SAMPLE_RATE', 16000)
+        self.sample_width = getattr(source, 'SAMPLE_WIDTH', 2)
+        self.chunk = getattr(source, 'CHUNK', 1024)
+        frame_bytes = self.chunk * self.sample_width
+        self.frame_bytes = frame_bytes
+        capacity = max(frame_bytes, int(buffer_seconds * self.sample_rate) * self.sample_width)
+        self.buffer = RingBuffer(capacity, lossless=lossless)
+        self.segmenter = PhraseSegmenter(self.sample_rate, self.sample_width, frame_bytes,
+                                         threshold=threshold, **segmenter_options)
+
+        self._phrases: queue.Queue = queue.Queue(queue_size)
+        self._texts: queue.Queue = queue.Queue(queue_size)
+        self._results: queue.Queue = queue.Queue(queue_size)
+        self._stopping = threading.Event()
+        self._threads: list = []
+        self.stats = {'phrases': 0, 'recognised': 0, 'completed': 0, 'errors': 0, 'gated_chunks': 0}
+
+    # ── Control ──────────────────────────────────────────────────────────────
+
+    def start(self) -> 'StreamingPipeline':
+        stages = (
+            ('listen', self._listen),
+            ('segment', self._segment),
+            ('recognize', lambda: self._stage('recognize', self._phrases, self._texts, self._recognize)),
+            ('analyse', lambda: self._stage('analyse', self._texts, self._results, self._analyse)),
+            ('output', lambda: self._stage('output', self._results, None, self._output)),
+        )
+        for name, target in stages:
+            thread = threading.Thread(target=target, name=f'stream-{name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Stop listening; phrases already captured still run to completion."""
+        self._stopping.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the input to end and every stage to drain. False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if end is None else max(0.0, end - time.monotonic()))
+            if thread.is_alive():
+                return False
+        return True
+
+    def run(self) -> dict:
+        """Process the whole source (until it ends or stop()); return stats."""
+        self.start()
+        self.join()
+        return dict(self.stats, dropped_bytes=self.buffer.dropped)
+
+    # ── Capture threads ──────────────────────────────────────────────────────
+
+    def _listen(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                try:
+                    data = self.source.stream.read(self.chunk)
+                except OSError as exc:
+                    logger.error("Streaming capture: audio read failed: %s", exc)
+                    self._failed('listen', exc)
+                    break
+                if not data:
+                    break  # end of file input
+                if self.gate is not None and self.gate():
+                    self.stats['gated_chunks'] += 1
+                    continue
+                self.buffer.write(data)
+        finally:
+            self.buffer.close()
+
+    def _segment(self) -> None:
+        try:
+            while True:
+                frame = self.buffer.read(self.frame_bytes, timeout=0.5)
+                if not frame:
+                    if self.buffer.closed:
+                        break
+                    continue
+                phrase = self.segmenter.feed(frame)
+                if phrase is not None:
+                    self._emit(phrase)
+            phrase = self.segmenter.flush()
+            if phrase is not None:
+                self._emit(phrase)
+        finally:
+            self._phrases.put(_STOP)
+
+    def _emit(self, frames: bytes) -> None:
+        self.stats['phrases'] += 1
+        METRICS.inc('stream_phrases', outcome='captured')
+        audio = self.audio_factory(frames, self.sample_rate, self.sample_width)
+        self._phrases.put((time.perf_counter(), (audio,)))
+
+    # ── Processing stages ────────────────────────────────────────────────────
+
+    def _stage(self, name: str, inbox, outbox, fn) -> None:
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                if outbox is not None:
+                    outbox.put(_STOP)
+                return
+            started, args = item
+            try:
+                with METRICS.timer(f'stream_{name}'):
+                    result = fn(*args)
+            except Exception as exc:
+                self._failed(name, exc)
+                continue
+            if result is not None and outbox is not None:
+                outbox.put((started, result))
+            elif result is not None:
+                METRICS.observe('stream_phrase_latency', time.perf_counter() - started)
+
+    def _recognize(self, audio):
+        text, is_hindi = self.recognize(audio)
+        self.stats['recognised'] += 1
+        return text, is_hindi
+
+    def _analyse(self, text, is_hindi):
+        lines = self.analyse(text, is_hindi)
+        return (text, is_hindi, lines) if lines else None
+
+    def _output(self, text, is_hindi, lines):
+        self.output(text, is_hindi, lines)
+        self.stats['completed'] += 1
+        return True
+
+    def _failed(self, stage: str, exc: Exception) -> None:
+        self.stats['errors'] += 1
+        METRICS.inc('stream_errors', stage=stage)
+        if self.on_error is not None:
+            try:
+                self.on_error(stage, exc)
+            except Exception as handler_exc:
+                logger.error("Streaming on_error handler failed: %s", handler_exc)
+        else:
+            logger.info("Streaming %s stage dropped a phrase: %s", stage, exc)
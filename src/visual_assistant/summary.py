@@ -0,0 +1,151 @@
+"""
+Budgeted spoken summaries for visual-impaired-assistant.
+
+The full description has one line per POS category per sentence, plus
+entities and four VADER numbers, so reading it back grows with every token.
+summarize() ranks those lines by how much they tell the listener — names
+and nouns first, function words last — and keeps what fits in a time or
+character budget. The full description is unchanged and can still be read
+out on request ("more details").
+"""
+import re
+import string
+from typing import Optional
+
+from .hindi import CONTENT_WORD, HINDI_CATEGORIES
+from .pipeline import POS_DESCRIPTIONS
+
+VERBOSITY_LEVELS = ('summary', 'full')
+
+# Lower speaks first. Categories not listed rank with the function words.
+CATEGORY_PRIORITY = {
+    'Named entities': 0,
+    'Proper noun, singular': 1, 'Proper noun, plural': 1,
+    'Noun, singular': 2, 'Noun, plural': 2, CONTENT_WORD: 2,
+    'Sentiment': 3, 'Negation': 3, 'Question word': 4,
+    'Verb, base form': 4, 'Verb, past tense': 4, 'Verb, gerund/present participle': 4,
+    'Verb, past participle': 4, 'Verb, non-3rd person singular present': 4,
+    'Verb, 3rd person singular present': 4,
+    'Adjective': 5, 'Adjective, comparative': 5, 'Adjective, superlative': 5,
+    'Cardinal number': 5,
+    'Adverb': 6, 'Adverb, comparative': 6, 'Adverb, superlative': 6,
+    'Foreign word': 6, 'Modal': 7,
+}
+_DEFAULT_PRIORITY = 8
+_NOTE_PRIORITY = 0          # analysis failures are always worth hearing
+_TRANSLATION_PRIORITY = 1
+_DROP = None                # headers and counts the listener already knows
+_COUNT_PREFIXES = ('Number of sentences:', 'Words found:', 'Statistics:')
+
+MORE_DETAILS_HINT = "Say 'more details' for the full analysis."
+
+_SENTENCE_HEADER = re.compile(r"^\s*Analysing sentence (\d+):")
+_SENTIMENT = re.compile(r"^Sentiment: (\w+)")
+
+DETAIL_REQUESTS = frozenset({
+    'more details', 'more detail', 'full details', 'full detail', 'details',
+    'full analysis', 'tell me more', 'पूरा विवरण', 'और बताओ', 'विस्तार से',
+})
+
+_KNOWN_CATEGORIES = (frozenset(POS_DESCRIPTIONS.values()) | frozenset(HINDI_CATEGORIES) |
+                     {CONTENT_WORD, 'Named entities'})
+# Recognisers add punctuation; \W would also strip Devanagari vowel signs.
+_PUNCTUATION = str.maketrans('', '', string.punctuation + '।॥')
+
+
+def is_detail_request(text: str) -> bool:
+    """True if the utterance asks for the full analysis of the previous turn."""
+    return ' '.join((text or '').translate(_PUNCTUATION).lower().split()) in DETAIL_REQUESTS
+
+
+def _rank(line: str):
+    """
+    (priority, spoken text, is_category) for one description line; priority
+    None drops it. Only category lines describe a sentence's words.
+    """
+    if line.startswith('Note:'):
+        return _NOTE_PRIORITY, line, False
+    if line.startswith('Translation:'):
+        return _TRANSLATION_PRIORITY, line, False
+    if line.startswith(_COUNT_PREFIXES) or _SENTENCE_HEADER.match(line):
+        return _DROP, line, False
+    sentiment = _SENTIMENT.match(line)
+    if sentiment:
+        # The label carries the meaning; the four scores stay in the full view.
+        return CATEGORY_PRIORITY['Sentiment'], f"Sentiment: {sentiment.group(1)}", True
+    category, sep, _ = line.partition(': ')
+    if sep and category in _KNOWN_CATEGORIES:
+        return CATEGORY_PRIORITY.get(category, _DEFAULT_PRIORITY), line, True
+    return _DEFAULT_PRIORITY, line, False
+
+
+def speaking_seconds(text: str, words_per_minute: float = 150) -> float:
+    """Rough TTS duration of text at the engine's rate."""
+    return len(text.split()) * 60.0 / words_per_minute
+
+
+def _truncate(line: str, fits) -> Optional[str]:
+    """Shorten a 'Label: a, b, c' line to as many words as fit, or None."""
+    label, sep, rest = line.partition(': ')
+    words = rest.split(', ') if sep else []
+    for keep in range(len(words) - 1, 0, -1):
+        candidate = f"{label}: {', '.join(words[:keep])} and {len(words) - keep} more"
+        if fits(candidate):
+            return candidate
+    return None
+
+
+def summarize(lines: list, max_seconds: Optional[float] = 20.0, max_chars: Optional[int] = None,
+              words_per_minute: float = 150) -> list:
+    """
+    The most informative description lines that fit the budget, in their
+    original order. Either budget may be None; with both None nothing is cut
+    except headers and raw scores.
+    """
+    items = []   # (priority, sentence, position, text); sentence is 0 for other lines
+    sentence = 0
+    sentences = set()
+    for position, line in enumerate(lines):
+        header = _SENTENCE_HEADER.match(line)
+        if header:
+            sentence = int(header.group(1))
+        priority, text, is_category = _rank(line)
+        if priority is _DROP:
+            continue
+        items.append((priority, sentence if is_category else 0, position, text))
+        if sentence:
+            sentences.add(sentence)
+
+    def cost(text):
+        return (speaking_seconds(text, words_per_minute), len(text))
+
+    spent = [0.0, 0]
+
+    def fits(text):
+        seconds, chars = cost(text)
+        return ((max_seconds is None or spent[0] + seconds <= max_seconds) and
+                (max_chars is None or spent[1] + chars <= max_chars))
+
+    def take(text):
+        seconds, chars = cost(text)
+        spent[0] += seconds
+        spent[1] += chars
+
+    # Leave room for the hint that more is available.
+    take(MORE_DETAILS_HINT)
+    chosen, omitted = {}, 0
+    for priority, sentence, position, text in sorted(items):
+        if len(sentences) > 1 and sentence:
+            text = f"Sentence {sentence}, {text[0].lower()}{text[1:]}"
+        if not fits(text):
+            text = _truncate(text, fits)
+            omitted += 1
+            if text is None:
+                continue
+        take(text)
+        chosen[position] = text
+
+    spoken = [chosen[p] for p in sorted(chosen)]
+    if omitted:
+        spoken.append(MORE_DETAILS_HINT)
+    return spoken
@@ -0,0 +1,205 @@
+"""
+Translation backends for visual-impaired-assistant.
+
+Every backend translates a list of texts in one call, so the lines of an
+utterance cost one round trip instead of one each:
+
+    google              googletrans (the default); lines are joined with
+                        newlines into one request and split back
+    dictionary:PATH     offline word/phrase dictionary (TSV or JSON)
+    http(s)://HOST/...  a LibreTranslate-compatible server, e.g. a local one
+
+Select one with VA_TRANSLATOR. Backends raise on failure; the caller
+(visually._safe_translate_many) falls back to the original text.
+"""
+import json
+import logging
+import re
+import urllib.request
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_EDGE_SPACE = re.compile(r'^(\s*)(.*?)(\s*)$', re.DOTALL)
+
+
+class TranslationBackend:
+    """Interface: translate_many(texts, src, dest) -> one string (or None) per text."""
+
+    name = 'base'
+    remote = False      # calls go over the network (and get a caller-side deadline)
+
+    def translate_many(self, texts, src: str = 'hi', dest: str = 'en') -> list:
+        raise NotImplementedError
+
+    def translate(self, text: str, src: str = 'hi', dest: str = 'en') -> Optional[str]:
+        return self.translate_many([text], src, dest)[0]
+
+    def reset(self) -> None:
+        """Drop any client state after a failure."""
+
+
+# ─────────────────────────────────────────────
+# googletrans
+# ─────────────────────────────────────────────
+class GoogleTranslateBackend(TranslationBackend):
+    """
+    googletrans behind the batch API.
+
+    client — callable returning the shared googletrans Translator
+    reset  — callable that drops it after a failure
+
+    googletrans translates a list one request per item, so lines are sent
+    as one newline-joined text instead. Surrounding whitespace is kept
+    aside and restored; if the reply doesn't split back into the same
+    number of lines, they are sent one by one.
+    """
+
+    name = 'google'
+    remote = True
+
+    def __init__(self, client, reset=None):
+        self._client = client
+        self._reset = reset
+
+    def translate_many(self, texts, src: str = 'hi', dest: str = 'en') -> list:
+        texts = list(texts)
+        client = self._client()
+        if len(texts) == 1 or any('\n' in text.strip() for text in texts):
+            return [self._one(client, text, src, dest) for text in texts]
+        edges = [_EDGE_SPACE.match(text).groups() for text in texts]
+        todo = [i for i, (_, core, _) in enumerate(edges) if core]
+        out = list(texts)
+        if not todo:
+            return out
+        result = client.translate('\n'.join(edges[i][1] for i in todo), src=src, dest=dest)
+        lines = result.text.split('\n') if result and result.text else []
+        if len(lines) != len(todo):
+            logger.warning("Batched translation returned %d lines for %d — translating one by one.",
+                           len(lines), len(todo))
+            return [self._one(client, text, src, dest) for text in texts]
+        for i, line in zip(todo, lines):
+            lead, _, trail = edges[i]
+            out[i] = f"{lead}{line.strip()}{trail}"
+        return out
+
+    @staticmethod
+    def _one(client, text: str, src: str, dest: str) -> Optional[str]:
+        result = client.translate(text, src=src, dest=dest)
+        return result.text if result and result.text else None
+
+    def reset(self) -> None:
+        if self._reset is not None:
+            self._reset()
+
+
+# ─────────────────────────────────────────────
+# Offline dictionary
+# ─────────────────────────────────────────────
+class DictionaryBackend(TranslationBackend):
+    """
+    Word and phrase substitution from a local dictionary — no network.
+
+    entries — {source phrase: translation}; the longest phrase wins, unknown
+              words (including text already in the target language) pass through
+    """
+
+    name = 'dictionary'
+    _PUNCTUATION = {'।': '.', '॥': '.'}
+    _WORD = re.compile(r'\s+|[^\s।॥?!,.;:]+|.')
+
+    def __init__(self, entries: dict):
+        self.entries = {' '.join(k.split()): v for k, v in entries.items()}
+        self.max_words = max((len(k.split()) for k in self.entries), default=1)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'DictionaryBackend':
+        """A JSON object, or TSV lines of `source<TAB>translation`."""
+        with open(path, encoding='utf-8') as fh:
+            data = fh.read()
+        if data.lstrip().startswith('{'):
+            return cls(json.loads(data))
+        entries = {}
+        for line in data.splitlines():
+            source, sep, target = line.partition('\t')
+            if sep and source.strip() and not source.startswith('#'):
+                entries[source.strip()] = target.strip()
+        return cls(entries)
+
+    def translate_many(self, texts, src: str = 'hi', dest: str = 'en') -> list:
+        return [self._translate(text) for text in texts]
+
+    def _translate(self, text: str) -> str:
+        pieces = self._WORD.findall(text)
+        out, i = [], 0
+        while i < len(pieces):
+            piece = pieces[i]
+            if piece.isspace() or not piece:
+                out.append(piece)
+                i += 1
+                continue
+            match = None
+            # Longest run of words (with their separating spaces) in the dictionary.
+            words, j = [], i
+            while j < len(pieces) and len(words) < self.max_words:
+                if pieces[j].isspace():
+                    j += 1
+                    continue
+                words.append(pieces[j])
+                j += 1
+                target = self.entries.get(' '.join(words))
+                if target is not None:
+                    match = (target, j)
+            if match:
+                out.append(match[0])
+                i = match[1]
+            else:
+                out.append(self._PUNCTUATION.get(piece, piece))
+                i += 1
+        return ''.join(out)
+
+
+# ─────────────────────────────────────────────
+# HTTP (LibreTranslate API)
+# ─────────────────────────────────────────────
+class HTTPTranslateBackend(TranslationBackend):
+    """
+    POST {"q": [...], "source", "target"} to a LibreTranslate-compatible URL
+    and read {"translatedText": [...]} back — one request per batch.
+    """
+
+    name = 'http'
+    remote = True
+
+    def __init__(self, url: str, api_key: Optional[str] = None, timeout: float = 5.0):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def translate_many(self, texts, src: str = 'hi', dest: str = 'en') -> list:
+        texts = list(texts)
+        payload = {'q': texts, 'source': src, 'target': dest, 'format': 'text'}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        request = urllib.request.Request(
+            self.url, data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            translated = json.loads(response.read().decode('utf-8'))['translatedText']
+        if isinstance(translated, str):
+            translated = [translated]
+        if len(translated) != len(texts):
+            raise ValueError(f"translation server returned {len(translated)} texts for {len(texts)}")
+        return translated
+
+
+def load_backend(spec: str, google_client=None, google_reset=None, api_key=None) -> TranslationBackend:
+    """Build a backend from a VA_TRANSLATOR value (see the module docstring)."""
+    spec = (spec or 'google').strip()
+    if spec == 'google':
+        return GoogleTranslateBackend(google_client, google_reset)
+    if spec.startswith('dictionary:'):
+        return DictionaryBackend.from_file(spec[len('dictionary:'):])
+    if spec.startswith(('http://', 'https://')):
+        return HTTPTranslateBackend(spec, api_key=api_key)
+    raise ValueError(f"unknown translator {spec!r} (expected google, dictionary:PATH or a URL)")
@@ -0,0 +1,208 @@
+"""
+Pre-rendered speech for visual-impaired-assistant.
+
+Fixed prompts ("Listening... Speak now in English or Hindi.") and the POS
+category labels are spoken on every turn. Instead of synthesising them from
+scratch each time, TTSCache renders them once through the engine's
+save_to_file path and plays the saved clip directly. Clips are keyed by
+text, rate, volume and voice, and kept in a size-bounded on-disk LRU.
+Anything not cached is still spoken live with say().
+"""
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Shorter than any real clip: a WAV header with no samples means rendering failed.
+_MIN_CLIP_BYTES = 64
+
+
+class ClipPlayer:
+    """Blocking playback of a WAV file: winsound on Windows, else afplay/aplay/paplay."""
+
+    _COMMANDS = (('afplay',), ('aplay', '-q'), ('paplay',))
+
+    def __init__(self, command: Optional[tuple] = None):
+        self._winsound = None
+        self._proc = None
+        self._lock = threading.Lock()
+        self.command = command
+        if command is None:
+            if sys.platform == 'win32':
+                try:
+                    import winsound
+                    self._winsound = winsound
+                except ImportError:
+                    pass
+            else:
+                self.command = next((c for c in self._COMMANDS if shutil.which(c[0])), None)
+
+    @property
+    def available(self) -> bool:
+        return self._winsound is not None or self.command is not None
+
+    def play(self, path: str) -> bool:
+        """Play path to the end (or until stop()). False if playback failed."""
+        if self._winsound is not None:
+            self._winsound.PlaySound(path, self._winsound.SND_FILENAME | self._winsound.SND_NODEFAULT)
+            return True
+        if self.command is None:
+            return False
+        try:
+            with self._lock:
+                self._proc = subprocess.Popen(self.command + (path,), stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL)
+            return self._proc.wait() == 0
+        except OSError as exc:
+            logger.warning("Clip playback failed: %s", exc)
+            return False
+        finally:
+            with self._lock:
+                self._proc = None
+
+    def stop(self) -> None:
+        if self._winsound is not None:
+            self._winsound.PlaySound(None, 0)
+            return
+        with self._lock:
+            if self._proc is not None:
+                self._proc.terminate()
+
+
+class TTSCache:
+    """
+    Size-bounded directory of rendered clips.
+
+    directory — where clips are stored (created on first render)
+    max_bytes — total clip size kept; least recently played clips go first
+    player    — object with play(path) -> bool and stop(); default ClipPlayer()
+
+    Rendering and playback both use the TTS engine's thread, so they must be
+    called from the speech worker (SpeechQueue's speak_batch / on_idle).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024, player=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.player = player or ClipPlayer()
+        self._lock = threading.Lock()
+        self._index: dict = {}   # key -> [size, last_used]
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.evictions = 0
+        if os.path.isdir(directory):
+            clips = []
+            for name in os.listdir(directory):
+                if name.endswith('.wav'):
+                    path = os.path.join(directory, name)
+                    try:
+                        clips.append((os.path.getmtime(path), name[:-4], os.path.getsize(path)))
+                    except OSError:
+                        continue
+            for _, key, size in sorted(clips):
+                self._clock += 1
+                self._index[key] = [size, self._clock]
+
+    @staticmethod
+    def key(text: str, settings: tuple) -> str:
+        """Clip key for text spoken with settings = (rate, volume, voice)."""
+        rate, volume, voice = settings
+        raw = f"{text}\x00{rate}\x00{round(float(volume), 3)}\x00{voice}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.wav')
+
+    def __contains__(self, item) -> bool:
+        text, settings = item
+        with self._lock:
+            return self.key(text, settings) in self._index
+
+    def lookup(self, text: str, settings: tuple) -> Optional[str]:
+        """Path of the clip for text, or None if it hasn't been rendered."""
+        key = self.key(text, settings)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._clock += 1
+            entry[1] = self._clock
+            self.hits += 1
+        return self._path(key)
+
+    def render(self, engine, text: str, settings: tuple) -> Optional[str]:
+        """Synthesise text to a clip via engine.save_to_file; returns its path."""
+        key = self.key(text, settings)
+        path = self._path(key)
+        tmp = path + '.tmp.wav'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with METRICS.timer('tts_render'):
+                engine.save_to_file(text, tmp)
+                engine.runAndWait()
+            size = os.path.getsize(tmp)
+            if size < _MIN_CLIP_BYTES:
+                raise OSError(f"engine wrote an empty clip ({size} bytes)")
+            os.replace(tmp, path)
+        except (OSError, RuntimeError) as exc:
+            logger.warning("Could not pre-render speech for %.40r: %s", text, exc)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            self._clock += 1
+            self._index[key] = [size, self._clock]
+            self.renders += 1
+        self._evict()
+        return path
+
+    def play(self, path: str) -> bool:
+        with METRICS.timer('tts_clip'):
+            return self.player.play(path)
+
+    def stop(self) -> None:
+        self.player.stop()
+
+    def _evict(self) -> None:
+        with self._lock:
+            total = sum(size for size, _ in self._index.values())
+            victims = []
+            for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+            for key in victims:
+                del self._index[key]
+                self.evictions += 1
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'clips': len(self._index),
+                'bytes': sum(size for size, _ in self._index.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'renders': self.renders,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
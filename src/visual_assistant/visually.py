@@ -1,16 +1,31 @@
+import gc
 import os
 import sys
 import time
 import logging
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.tag import pos_tag
-from nltk.chunk import ne_chunk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from nltk.corpus import stopwords
-import speech_recognition as sr
-import pyttsx3
-from colorama import init, Fore, Style
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# nltk alone costs about a second at start-up; these import on first use.
+from ._lazy import colorama, nltk, pyttsx3, sr
+from .audio import AudioPreprocessor
+from .cache import LRUCache
+from .calibration import NoiseCalibrator
+from .gazetteer import ner_from_env
+from .hindi import CONTENT_WORD, HINDI_CATEGORIES, HINDI_MODES, HindiAnalyzer, is_translation_request
+from .metrics import METRICS
+from .recognition import GoogleRecognizer, recognize_bilingual
+from .resilience import breaker, call_with_deadline
+from .pipeline import (AnalysisPipeline, POS_DESCRIPTIONS, load_chunker,  # noqa: F401
+                       load_sentiment_analyzer, load_tagger)
+from .storage import FirebaseWriter
+from .streaming import StreamingPipeline
+from .summary import VERBOSITY_LEVELS, is_detail_request, summarize
+from .speech import SpeechQueue, PRIORITY_HIGH, PRIORITY_NORMAL
+from .translation import load_backend as load_translation_backend
+from .tts_cache import TTSCache
+from .watchdog import Watchdog
 
 # ─────────────────────────────────────────────
 # Structured logging — replaces bare print/TTS errors
@@ -80,20 +95,118 @@ def _init_firebase():
 # ─────────────────────────────────────────────
 # Optional translation — alpha library, fail-safe
 # ─────────────────────────────────────────────
+_translator = None
+_translator_lock = threading.Lock()
+# Keyed by (text, src, dest). Set VA_TRANSLATION_CACHE to a file path to keep
+# translations across restarts; VA_TRANSLATION_CACHE_TTL is in seconds.
+_translation_cache = LRUCache(
+    maxsize=int(os.environ.get('VA_TRANSLATION_CACHE_SIZE', '2048')),
+    ttl=float(os.environ.get('VA_TRANSLATION_CACHE_TTL', str(7 * 24 * 3600))),
+    path=os.environ.get('VA_TRANSLATION_CACHE') or None,
+)
+
+
+def _get_translator():
+    """Return the shared googletrans client, creating it on first use."""
+    global _translator
+    with _translator_lock:
+        if _translator is None:
+            from googletrans import Translator
+            _translator = Translator()
+        return _translator
+
+
+def _reset_translator() -> None:
+    global _translator
+    _translator = None
+
+
+_translation_backend = None
+# Caller-side bound on one remote translation round trip.
+_translate_deadline = float(os.environ.get('VA_TRANSLATE_DEADLINE', '5'))
+
+
+def _get_translation_backend():
+    """The backend named by VA_TRANSLATOR (default googletrans), built on first use."""
+    global _translation_backend
+    with _translator_lock:
+        if _translation_backend is None:
+            _translation_backend = load_translation_backend(
+                os.environ.get('VA_TRANSLATOR', 'google'),
+                google_client=_get_translator, google_reset=_reset_translator,
+                api_key=os.environ.get('VA_TRANSLATOR_API_KEY'),
+            )
+        return _translation_backend
+
+
 def _safe_translate(text: str, src: str = 'hi', dest: str = 'en') -> str:
-    """Translate text with explicit fallback if googletrans fails."""
-    try:
-        from googletrans import Translator
-        translator = Translator()
-        result = translator.translate(text, src=src, dest=dest)
-        if result and result.text:
-            return result.text
-        logger.warning("Empty translation result — using original text.")
-        return text
-    except Exception as exc:
-        # [FIX A4] googletrans alpha failures are silently swallowed with a log.
-        logger.warning("Translation failed (%s) — using original text.", exc)
-        return text
+    """Translate text with explicit fallback if the translator fails."""
+    return _safe_translate_many([text], src, dest)[0]
+
+
+def _safe_translate_many(texts, src: str = 'hi', dest: str = 'en') -> list:
+    """
+    Translate several texts in one backend round trip. Cached texts are not
+    sent; any text that can't be translated comes back unchanged — at once
+    while the 'translate' circuit breaker is open.
+    """
+    texts = list(texts)
+    out, misses = [], {}
+    for text in texts:
+        cached = _translation_cache.get((text, src, dest))
+        if cached is not None:
+            METRICS.inc('translation_cache', result='hit')
+        else:
+            METRICS.inc('translation_cache', result='miss')
+            misses.setdefault(text, None)
+        out.append(cached)
+    circuit = breaker('translate')
+    if misses and circuit.allow():
+        todo = list(misses)
+        backend = None
+        try:
+            backend = _get_translation_backend()
+            deadline = _translate_deadline if backend.remote else None
+            with METRICS.timer('translate'):
+                translated = call_with_deadline(backend.translate_many, deadline,
+                                                todo, src=src, dest=dest)
+            circuit.record_success()
+            for text, result in zip(todo, translated):
+                if result:
+                    # Only real translations are cached — fallbacks are retried next time.
+                    _translation_cache.put((text, src, dest), result)
+                    misses[text] = result
+                else:
+                    logger.warning("Empty translation result — using original text.")
+        except Exception as exc:
+            # [FIX A4] Translation failures are swallowed with a log.
+            logger.warning("Translation failed (%s) — using original text.", exc)
+            circuit.record_failure()
+            # Drop the client in case its session is what broke.
+            if backend is not None:
+                backend.reset()
+    return [cached if cached is not None else (misses[text] or text)
+            for text, cached in zip(texts, out)]
+
+
+def translation_cache_stats() -> dict:
+    """Hit/miss counters for the translation cache."""
+    return _translation_cache.stats()
+
+
+# Per-sentence analysis results, keyed by normalised sentence text and bounded
+# by VA_ANALYSIS_CACHE_MB. Set VA_ANALYSIS_CACHE to a file path to keep them
+# across restarts.
+_analysis_cache = LRUCache(
+    maxsize=100_000,
+    max_bytes=int(float(os.environ.get('VA_ANALYSIS_CACHE_MB', '16')) * 1024 * 1024),
+    path=os.environ.get('VA_ANALYSIS_CACHE') or None,
+)
+
+
+def analysis_cache_stats() -> dict:
+    """Hit/miss counters and size of the sentence analysis cache."""
+    return _analysis_cache.stats()
 
 
 # ─────────────────────────────────────────────
@@ -124,26 +237,38 @@ def initialize_nltk():
 
 
 # ─────────────────────────────────────────────
-# POS tag descriptions
+# Pre-rendered speech
 # ─────────────────────────────────────────────
-POS_DESCRIPTIONS = {
-    'CC': 'Coordinating conjunction', 'CD': 'Cardinal number',
-    'DT': 'Determiner', 'EX': 'Existential there', 'FW': 'Foreign word',
-    'IN': 'Preposition/subordinating conjunction', 'JJ': 'Adjective',
-    'JJR': 'Adjective, comparative', 'JJS': 'Adjective, superlative',
-    'LS': 'List item marker', 'MD': 'Modal', 'NN': 'Noun, singular',
-    'NNS': 'Noun, plural', 'NNP': 'Proper noun, singular',
-    'NNPS': 'Proper noun, plural', 'PDT': 'Predeterminer',
-    'POS': 'Possessive ending', 'PRP': 'Personal pronoun',
-    'PRP$': 'Possessive pronoun', 'RB': 'Adverb',
-    'RBR': 'Adverb, comparative', 'RBS': 'Adverb, superlative',
-    'RP': 'Particle', 'TO': 'to', 'UH': 'Interjection',
-    'VB': 'Verb, base form', 'VBD': 'Verb, past tense',
-    'VBG': 'Verb, gerund/present participle', 'VBN': 'Verb, past participle',
-    'VBP': 'Verb, non-3rd person singular present',
-    'VBZ': 'Verb, 3rd person singular present', 'WDT': 'Wh-determiner',
-    'WP': 'Wh-pronoun', 'WP$': 'Possessive wh-pronoun', 'WRB': 'Wh-adverb',
-}
+TTS_RATE = 150
+TTS_VOLUME = 0.9
+
+# Spoken on most turns; rendered to clips once and played from disk.
+FIXED_PROMPTS = (
+    "Adjusting for ambient noise... Please wait.",
+    "Listening... Speak now in English or Hindi.",
+    "Ready for next input.",
+    "Sorry, I couldn't understand the audio.",
+    "No speech detected within the timeout. Please try again.",
+    "Failed to process the text.",
+)
+# "Label: words" lines play the label from a clip and say the rest live.
+SPOKEN_LABELS = tuple(dict.fromkeys(tuple(POS_DESCRIPTIONS.values()) + tuple(HINDI_CATEGORIES))) + (
+    CONTENT_WORD, "Named entities", "Sentiment", "You said",
+)
+# Any other line is rendered once it has been spoken this many times.
+RENDER_AFTER_USES = 3
+
+
+def _init_tts_cache():
+    """Clip cache from VA_TTS_CACHE (a directory; empty disables), or None."""
+    directory = os.environ.get('VA_TTS_CACHE', 'visual_assistant_tts')
+    if not directory:
+        return None
+    cache = TTSCache(directory, max_bytes=int(float(os.environ.get('VA_TTS_CACHE_MB', '64')) * 1024 * 1024))
+    if not cache.player.available:
+        logger.info("No audio player for pre-rendered speech — speaking everything live.")
+        return None
+    return cache
 
 
 # ─────────────────────────────────────────────
@@ -151,31 +276,50 @@ POS_DESCRIPTIONS = {
 # ─────────────────────────────────────────────
 class VisuallyImpairedAssistant:
 
-    def __init__(self):
-        init()  # colorama
+    def __init__(self, warmup=None, recognizer_backend=None, microphone: bool = True):
+        colorama.init()
 
-        # Sentiment analyser — optional
-        self.sentiment_analyzer: SentimentIntensityAnalyzer | None = None
-        try:
-            self.sentiment_analyzer = SentimentIntensityAnalyzer()
-        except Exception as exc:
-            logger.warning("Sentiment analyser unavailable: %s", exc)
+        # NLP models are held by one pipeline for the whole session. With a
+        # ModelWarmup the sentiment analyser is still loading in the background
+        # and is only waited for on first use.
+        self._warmup = warmup
+        self.pipeline = AnalysisPipeline(translate=_safe_translate, cache=_analysis_cache, **ner_from_env())
+        if warmup is None:
+            self.pipeline.sentiment_analyzer = load_sentiment_analyzer()
 
         # Text-to-speech
+        self._engine_stale = False
         try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 150)
-            self.engine.setProperty('volume', 0.9)
+            self.engine = self._new_engine()
         except Exception as exc:
             logger.error("TTS engine init failed: %s", exc)
             # [FIX A3] Don't sys.exit — degrade to text-only mode.
             self.engine = None
 
-        # Speech recognition
+        # All speech after start-up goes through one worker thread, so the
+        # analysis of a turn never waits on playback.
+        # Clips are rendered by the same worker, between utterances.
+        self.tts_cache = _init_tts_cache() if self.engine is not None else None
+        self._voice = self._voice_settings()
+        self._render_queue: deque = deque()
+        self._text_uses: dict = {}
+        self.speech = SpeechQueue(self._speak_batch, on_cancel=self._stop_engine,
+                                  on_idle=self._render_next)
+        # When True the next utterance may be captured while output is still
+        # playing, and stale output is cancelled once it is recognised.
+        # Leave off when speakers and microphone share a room (echo).
+        self.barge_in = os.environ.get('VA_BARGE_IN', '0') not in ('', '0')
+
+        self._firebase_writer = None
+
+        # Speech recognition. microphone=False is for file input (replay,
+        # --stream-file) on machines without audio hardware.
+        self.recognizer = sr.Recognizer()
+        self._source = None
         try:
-            import pyaudio  # noqa: F401 — just verify it is installed
-            self.recognizer = sr.Recognizer()
-            with sr.Microphone() as source:
+            if microphone:
+                import pyaudio  # noqa: F401 — just verify it is installed
+                self._open_microphone()
                 logger.info("Microphone detected.")
                 self._speak_raw("Microphone initialised successfully.")
         except OSError as exc:
@@ -193,53 +337,278 @@ class VisuallyImpairedAssistant:
         self.listen_timeout   = 5
         self.phrase_timeout   = 10
 
+        # Full 2 s calibration once (and again only on drift); otherwise a
+        # short probe of the silence before each phrase keeps it current.
+        self.calibrator = NoiseCalibrator(
+            self.recognizer,
+            path=os.environ.get('VA_CALIBRATION_FILE', 'visual_assistant_calibration.json'),
+            full_duration=self.ambient_duration,
+        )
+
+        # Both recognition languages run at once; any backend with
+        # recognize(audio, language) can replace Google (e.g. in tests).
+        self.recognizer_backend = recognizer_backend or GoogleRecognizer(self.recognizer)
+        self._recognition_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='recognize')
+        self.recognition_deadline = 15.0
+        # Captured audio is trimmed, made mono and resampled to 16 kHz before upload.
+        self.preprocessor = AudioPreprocessor.from_env()
+        # Shared with any other assistant or server in the process.
+        self.recognition_breaker = breaker('recognize')
+
+        # 'summary' speaks the most informative lines within speech_budget
+        # seconds; 'full' reads every line. "More details" reads the rest.
+        self.verbosity = os.environ.get('VA_VERBOSITY', 'full')
+        self.speech_budget = float(os.environ.get('VA_SPEECH_BUDGET', '20'))
+        self.last_description: list = []
+        self._last_is_hindi = False
+
+        # 'native' analyses Hindi locally and translates only when asked
+        # ("translate" / "अनुवाद"); 'translate' analyses the English translation.
+        self.hindi_mode = os.environ.get('VA_HINDI_MODE', 'native')
+        self._last_hindi_text = None
+
+        # Weeks-long sessions: the TTS engine, recogniser and NLP models are
+        # rebuilt between turns once VA_MAX_RSS_MB or VA_RECYCLE_TURNS is crossed.
+        self.watchdog = Watchdog.from_env()
+        self.watchdog.register('tts', self.recycle_tts)
+        self.watchdog.register('recognizer', self.recycle_recognizer)
+        self.watchdog.register('nlp', self.recycle_nlp)
+
+        self.prewarm_speech()
+
+    @property
+    def hindi_mode(self) -> str:
+        return 'translate' if self.pipeline.hindi is None else 'native'
+
+    @hindi_mode.setter
+    def hindi_mode(self, mode: str) -> None:
+        if mode not in HINDI_MODES:
+            raise ValueError(f"hindi_mode must be one of {HINDI_MODES}, not {mode!r}")
+        if mode == 'translate':
+            self.pipeline.hindi = None
+        elif self.pipeline.hindi is None:
+            self.pipeline.hindi = HindiAnalyzer()
+
+    def _translate_speech(self, is_hindi: bool) -> bool:
+        """Whether Hindi output is translated before it is spoken."""
+        return is_hindi and self.pipeline.hindi is None
+
+    @property
+    def sentiment_analyzer(self):
+        if self._warmup is not None:
+            self.pipeline.sentiment_analyzer = self._warmup.result('vader')
+            self._warmup = None
+        return self.pipeline.sentiment_analyzer
+
+    @sentiment_analyzer.setter
+    def sentiment_analyzer(self, analyzer) -> None:
+        self._warmup = None
+        self.pipeline.sentiment_analyzer = analyzer
+
     # ── TTS helpers ──────────────────────────────────────────────────────────
 
     def _speak_raw(self, text: str) -> None:
-        """Low-level TTS call — does not translate."""
+        """Low-level, blocking TTS call — does not translate."""
+        self._speak_batch([text])
+
+    @staticmethod
+    def _new_engine():
+        engine = pyttsx3.init()
+        engine.setProperty('rate', TTS_RATE)
+        engine.setProperty('volume', TTS_VOLUME)
+        return engine
+
+    def _replace_engine(self) -> None:
+        """Drop the engine and build a new one; runs on the speech worker."""
+        old, self.engine = self.engine, None
+        if old is not None:
+            try:
+                old.stop()
+            except Exception as exc:
+                logger.warning("Stopping the old TTS engine failed: %s", exc)
+        # pyttsx3.init() hands back the live engine while anything references it.
+        del old
+        gc.collect()
+        try:
+            self.engine = self._new_engine()
+        except Exception:
+            self._engine_stale = True   # try again before the next batch
+            raise
+
+    def _speak_batch(self, texts: list) -> None:
+        """Speak several lines: cached clips are played, the rest in one say() run."""
+        if self._engine_stale:
+            self._engine_stale = False
+            try:
+                self._replace_engine()
+            except Exception as exc:
+                logger.error("TTS engine recycle failed: %s", exc)
         if self.engine is None:
             return
+        if self.tts_cache is None:
+            self._say(texts)
+            return
+        live = []
+        for text in texts:
+            for clip, part in self._clip_segments(text):
+                if clip is None:
+                    live.append(part)
+                    continue
+                if live:
+                    self._say(live)
+                    live = []
+                if not self.tts_cache.play(clip):
+                    live.append(part)
+        if live:
+            self._say(live)
+
+    def _say(self, texts: list) -> None:
+        """Synthesise lines live with a single runAndWait."""
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
+            with METRICS.timer('tts'):
+                for text in texts:
+                    self.engine.say(text)
+                self.engine.runAndWait()
         except RuntimeError:
             # [FIX A3] Re-init instead of crashing
             logger.warning("TTS engine stalled — reinitialising.")
+            METRICS.inc('tts_reinit')
             try:
-                self.engine = pyttsx3.init()
-                self.engine.setProperty('rate', 150)
-                self.engine.setProperty('volume', 0.9)
-                self.engine.say(text)
+                self._replace_engine()
+                for text in texts:
+                    self.engine.say(text)
                 self.engine.runAndWait()
             except Exception as exc:
                 logger.error("TTS reinit failed: %s", exc)
 
-    def speak(self, text: str, is_hindi: bool = False) -> None:
-        """Print formatted output and speak it."""
-        print(f"{Fore.GREEN}╔{'═' * 78}╗{Style.RESET_ALL}")
+    def _stop_engine(self) -> None:
+        """Interrupt the utterance currently playing (called by SpeechQueue.cancel)."""
+        if self.engine is not None:
+            self.engine.stop()
+        if self.tts_cache is not None:
+            self.tts_cache.stop()
+
+    # ── Pre-rendered speech ──────────────────────────────────────────────────
+
+    def _voice_settings(self) -> tuple:
+        """(rate, volume, voice) — part of every clip's cache key."""
+        try:
+            voice = self.engine.getProperty('voice') if self.engine is not None else None
+        except Exception:
+            voice = None
+        return TTS_RATE, TTS_VOLUME, voice
+
+    def _clip_segments(self, text: str) -> list:
+        """[(clip path or None, text)] — a whole-line clip, a label clip, or live."""
+        path = self.tts_cache.lookup(text, self._voice)
+        if path is not None:
+            return [(path, text)]
+        uses = self._text_uses.get(text, 0) + 1
+        if uses == RENDER_AFTER_USES:
+            self._render_queue.append(text)
+        if len(self._text_uses) >= 4096:
+            self._text_uses.clear()
+        self._text_uses[text] = uses
+
+        label, sep, rest = text.partition(': ')
+        if sep and rest:
+            path = self.tts_cache.lookup(label, self._voice)
+            if path is not None:
+                return [(path, label), (None, rest)]
+        return [(None, text)]
+
+    def _render_next(self) -> bool:
+        """Speech-worker idle task: render one queued clip. True if more remain."""
+        if self.tts_cache is None or self.engine is None:
+            return False
+        try:
+            text = self._render_queue.popleft()
+        except IndexError:
+            return False
+        if (text, self._voice) not in self.tts_cache:
+            self.tts_cache.render(self.engine, text, self._voice)
+        return bool(self._render_queue)
+
+    def prewarm_speech(self, texts=None) -> int:
+        """Queue prompts and POS labels that have no clip yet; returns how many."""
+        if self.tts_cache is None:
+            return 0
+        texts = FIXED_PROMPTS + SPOKEN_LABELS if texts is None else texts
+        missing = [text for text in texts if (text, self._voice) not in self.tts_cache]
+        self._render_queue.extend(missing)
+        return len(missing)
+
+    def speak(self, text: str, is_hindi: bool = False, priority: int = PRIORITY_NORMAL,
+              spoken: str = None) -> None:
+        """
+        Print formatted output and queue it for speech — does not block on playback.
+        spoken is text already translated for speech (see speak_lines).
+        """
+        green, reset = colorama.Fore.GREEN, colorama.Style.RESET_ALL
+        print(f"{green}╔{'═' * 78}╗{reset}")
         words, current_line = text.split(), ""
         for word in words:
             if len(current_line) + len(word) + 1 <= 76:
                 current_line += word + " "
             else:
-                print(f"{Fore.GREEN}║{Style.RESET_ALL} {current_line:<76} {Fore.GREEN}║{Style.RESET_ALL}")
+                print(f"{green}║{reset} {current_line:<76} {green}║{reset}")
                 current_line = word + " "
         if current_line:
-            print(f"{Fore.GREEN}║{Style.RESET_ALL} {current_line:<76} {Fore.GREEN}║{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}╚{'═' * 78}╝{Style.RESET_ALL}")
+            print(f"{green}║{reset} {current_line:<76} {green}║{reset}")
+        print(f"{green}╚{'═' * 78}╝{reset}")
 
-        speak_text = _safe_translate(text, src='hi', dest='en') if is_hindi else text
-        self._speak_raw(speak_text)
+        if spoken is None:
+            spoken = _safe_translate(text, src='hi', dest='en') if is_hindi else text
+        self.speech.say(spoken, priority)
+
+    def speak_lines(self, lines, is_hindi: bool = False) -> None:
+        """speak() each line; Hindi output is translated in one round trip first."""
+        if not is_hindi:
+            for line in lines:
+                self.speak(line, is_hindi)
+            return
+        lines = list(lines)
+        # Lines the batch couldn't translate are spoken as they are, not retried one by one.
+        for line, text in zip(lines, _safe_translate_many(lines, src='hi', dest='en')):
+            self.speak(line, is_hindi, spoken=text)
+
+    def _wait_for_silence(self) -> None:
+        """Let queued output finish so the microphone doesn't hear the assistant."""
+        if not self.barge_in:
+            self.speech.flush()
 
     # ── Speech capture ───────────────────────────────────────────────────────
 
+    def _open_microphone(self):
+        """Open the microphone stream once and keep it open across turns."""
+        if self._source is None:
+            self._microphone = sr.Microphone()
+            self._source = self._microphone.__enter__()
+        return self._source
+
+    def _close_microphone(self) -> None:
+        if self._source is not None:
+            try:
+                self._microphone.__exit__(None, None, None)
+            except Exception as exc:
+                logger.warning("Closing microphone failed: %s", exc)
+            self._source = None
+
     def capture_speech(self):
         """Capture speech with specific exception handling — no bare except."""
         try:
-            with sr.Microphone() as source:
+            source = self._open_microphone()
+            if self.calibrator.needs_full:
                 self.speak("Adjusting for ambient noise... Please wait.")
-                self.recognizer.adjust_for_ambient_noise(source, duration=self.ambient_duration)
-                self.speak("Listening... Speak now in English or Hindi.")
+                self._wait_for_silence()
+                self.calibrator.full(source)
+            else:
+                self._wait_for_silence()
+                if self.calibrator.update(source) == 'full':
+                    self.speak("Background noise changed. Recalibrated the microphone.")
+            self.speak("Listening... Speak now in English or Hindi.")
+            self._wait_for_silence()
+            with METRICS.timer('listen'):
                 audio = self.recognizer.listen(
                     source,
                     timeout=self.listen_timeout,
@@ -252,106 +621,92 @@ class VisuallyImpairedAssistant:
         except OSError as exc:
             # [FIX E2] Hardware error — specific catch
             logger.error("capture_speech: microphone hardware error: %s", exc)
+            self._close_microphone()  # reopened on the next turn
             self.speak("Microphone error. Please check your audio device.")
             return None, False
 
-        # Attempt Hindi first, then English
+        return self.recognize_audio(audio)
+
+    def recognize_audio(self, audio):
+        """Recognise captured audio; returns (text, is_hindi) or (None, False)."""
+        # Hindi and English are recognised concurrently.
         # [FIX E1] Language detection: Hindi is only accepted if recognition succeeds
         #          AND the text contains at least one non-ASCII character (Devanagari).
-        for language, is_hindi in [('hi-IN', True), ('en-US', False)]:
-            try:
-                text = self.recognizer.recognize_google(audio, language=language)
-                if is_hindi:
-                    # Verify it's actually Devanagari — not English mis-flagged as Hindi
-                    if not any('\u0900' <= ch <= '\u097F' for ch in text):
-                        logger.info("Hindi recognition returned ASCII — retrying as English.")
-                        continue
-                self.speak(f"You said: {text}", is_hindi)
-                return text, is_hindi
-            except sr.UnknownValueError:
-                continue
-            except sr.RequestError as exc:
-                logger.error("Speech recognition service error: %s", exc)
-                self.speak(f"Speech recognition service unavailable: {exc}")
-                return None, False
-
-        self.speak("Sorry, I couldn't understand the audio.")
-        return None, False
+        audio = self.preprocessor.process(audio)
+        try:
+            with METRICS.timer('recognize'):
+                text, is_hindi = recognize_bilingual(
+                    self.recognizer_backend, audio, self._recognition_pool,
+                    deadline=self.recognition_deadline, breaker=self.recognition_breaker,
+                )
+        except sr.UnknownValueError:
+            self.speak("Sorry, I couldn't understand the audio.")
+            return None, False
+        except sr.RequestError as exc:
+            logger.error("Speech recognition service error: %s", exc)
+            self.speak(f"Speech recognition service unavailable: {exc}")
+            return None, False
+
+        if self.barge_in:
+            # A new utterance makes whatever is still queued stale.
+            self.speech.cancel()
+        self.speak(f"You said: {text}", self._translate_speech(is_hindi))
+        return text, is_hindi
 
     # ── Text processing ──────────────────────────────────────────────────────
 
     def process_text(self, text: str, is_hindi: bool = False):
-        """Analyse text and return a list of description strings."""
-        description = []
-        try:
-            # Translate Hindi to English for NLP processing
-            eng_text = _safe_translate(text, src='hi', dest='en') if is_hindi else text
-            if is_hindi:
-                description.append(f"Translation: {eng_text}")
-
-            sentences = sent_tokenize(eng_text)
-            description.append(f"Number of sentences: {len(sentences)}")
+        """Analyse text, speak it (in full or summarised) and return the full list."""
+        self.sentiment_analyzer  # noqa: B018 — resolves a background VADER load
+        with METRICS.timer('process_text'):
+            description = self.pipeline.describe(text, is_hindi)
+        self.last_description, self._last_is_hindi = description, self._translate_speech(is_hindi)
+        if is_hindi:
+            self._last_hindi_text = text
 
-            for i, sentence in enumerate(sentences, 1):
-                description.append(f"\nAnalysing sentence {i}: {sentence}")
-                try:
-                    tokens = word_tokenize(sentence)
-                    tagged = pos_tag(tokens)
-
-                    word_types: dict[str, list[str]] = {}
-                    for word, tag in tagged:
-                        if tag in POS_DESCRIPTIONS:
-                            word_types.setdefault(POS_DESCRIPTIONS[tag], []).append(word)
-
-                    for category, words in word_types.items():
-                        if words:
-                            description.append(f"{category}: {', '.join(words)}")
-
-                    try:
-                        named_entities = ne_chunk(tagged)
-                        entities = [
-                            f"{chunk.label()}: {' '.join(c[0] for c in chunk)}"
-                            for chunk in named_entities
-                            if hasattr(chunk, 'label')
-                        ]
-                        if entities:
-                            description.append(f"Named entities: {', '.join(entities)}")
-                    except Exception as exc:
-                        logger.warning("NER failed for sentence %d: %s", i, exc)
-                        description.append("Note: Named entity recognition unavailable.")
-
-                    if self.sentiment_analyzer:
-                        try:
-                            scores = self.sentiment_analyzer.polarity_scores(sentence)
-                            c = scores['compound']
-                            label = "positive" if c >= 0.05 else ("negative" if c <= -0.05 else "neutral")
-                            description.append(
-                                f"Sentiment: {label} (compound={c:.2f}, "
-                                f"pos={scores['pos']:.2f}, neg={scores['neg']:.2f}, "
-                                f"neu={scores['neu']:.2f})"
-                            )
-                        except Exception as exc:
-                            logger.warning("Sentiment analysis failed: %s", exc)
-
-                except Exception as exc:
-                    logger.warning("Could not fully analyse sentence %d: %s", i, exc)
-                    description.append(f"Note: Could not fully analyse sentence {i}.")
+        spoken = description
+        if self.verbosity == 'summary':
+            spoken = summarize(description, max_seconds=self.speech_budget, words_per_minute=TTS_RATE)
+        self.speak_lines(spoken, self._last_is_hindi)
 
-        except Exception as exc:
-            logger.error("process_text top-level error: %s", exc)
-            description.append("Note: Basic text analysis failed.")
-            description.append(f"Words found: {', '.join(text.split())}")
+        return description
 
-        for desc in description:
-            self.speak(desc, is_hindi)
+    def speak_details(self) -> bool:
+        """Read out every line of the last analysed utterance."""
+        if not self.last_description:
+            self.speak("There is nothing to describe yet.")
+            return False
+        self.speak_lines(self.last_description, self._last_is_hindi)
+        return True
 
-        return description
+    def speak_translation(self) -> bool:
+        """Speak the English rendering of the last Hindi utterance."""
+        if not self._last_hindi_text:
+            self.speak("There is nothing to translate yet.")
+            return False
+        english = _safe_translate(self._last_hindi_text, src='hi', dest='en')
+        if english == self._last_hindi_text:
+            self.speak("Translation is unavailable right now.")
+            return False
+        self.speak(f"Translation: {english}")
+        return True
 
     # ── Firebase storage ─────────────────────────────────────────────────────
 
+    @property
+    def firebase_writer(self):
+        """Background writer, created on first use once Firebase is enabled."""
+        if self._firebase_writer is None:
+            self._firebase_writer = FirebaseWriter(
+                firebase_ref,
+                spool_path=os.environ.get('VA_FIREBASE_SPOOL', 'visual_assistant_spool.jsonl'),
+            )
+        return self._firebase_writer
+
     def store_in_firebase(self, data: dict) -> bool:
         """
-        Store processed data in Firebase Realtime DB.
+        Queue processed data for Firebase Realtime DB — returns without waiting
+        on the network; a background writer batches and retries the writes.
         [FIX A1/S3] Only runs if Firebase was successfully initialised.
         Raw speech text is NOT stored — only the processed analysis metadata.
         """
@@ -359,21 +714,58 @@ class VisuallyImpairedAssistant:
             logger.info("Firebase disabled — skipping remote storage.")
             return False
         try:
-            entry_id = int(time.time())
             # [FIX S3] Store analysis metadata only; raw_text intentionally omitted
             #          to avoid storing potentially sensitive spoken content.
-            firebase_ref.child(f'entry_{entry_id}').set({
+            processed = data.get('processed', [])
+            sentence_count = getattr(processed, 'sentence_count', None)
+            if sentence_count is None:
+                sentence_count = len([d for d in processed if d.startswith('\nAnalys')])
+            entry_id = self.firebase_writer.submit({
                 'word_count': len(data.get('raw_text', '').split()),
-                'sentence_count': len([d for d in data.get('processed', [])
-                                       if d.startswith('\nAnalys')]),
+                'sentence_count': sentence_count,
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             })
-            logger.info("Metadata stored in Firebase at entry_%d", entry_id)
+            logger.info("Metadata queued for Firebase at %s", entry_id)
             return True
         except Exception as exc:
             logger.error("Firebase write failed: %s", exc)
             return False
 
+    # ── Recycling ────────────────────────────────────────────────────────────
+
+    def end_turn(self):
+        """Count a finished turn; the watchdog may recycle components now."""
+        return self.watchdog.turn()
+
+    def recycle_tts(self) -> None:
+        """Rebuild the TTS engine before the next line is spoken."""
+        # The speech worker owns the engine, so it does the swap itself.
+        self._engine_stale = True
+        self._text_uses.clear()
+
+    def recycle_recognizer(self) -> None:
+        """Replace the speech_recognition Recognizer, keeping its calibration."""
+        old, recognizer = self.recognizer, sr.Recognizer()
+        for name in ('energy_threshold', 'dynamic_energy_threshold', 'dynamic_energy_ratio',
+                     'pause_threshold'):
+            if hasattr(old, name):
+                setattr(recognizer, name, getattr(old, name))
+        self.recognizer = self.calibrator.recognizer = recognizer
+        if isinstance(self.recognizer_backend, GoogleRecognizer):
+            self.recognizer_backend = GoogleRecognizer(recognizer)
+
+    def recycle_nlp(self) -> None:
+        """Reload the tagger, chunker and sentiment analyser into a fresh pipeline."""
+        load_tagger.cache_clear()
+        load_chunker.cache_clear()
+        old = self.pipeline
+        pipeline = AnalysisPipeline(translate=old.translate, cache=old.cache,
+                                    hindi=None if old.hindi is None else HindiAnalyzer(),
+                                    ner=old.ner, gazetteer=old.gazetteer)
+        if self._warmup is None:
+            pipeline.sentiment_analyzer = load_sentiment_analyzer()
+        self.pipeline = pipeline
+
     # ── Main loop ────────────────────────────────────────────────────────────
 
     def run(self):
@@ -386,9 +778,17 @@ class VisuallyImpairedAssistant:
         try:
             while True:
                 try:
-                    spoken_text, is_hindi = self.capture_speech()
+                    with METRICS.timer('capture_speech'):
+                        spoken_text, is_hindi = self.capture_speech()
+                    METRICS.inc('turns', outcome='speech' if spoken_text else 'none')
 
-                    if spoken_text:
+                    if spoken_text and is_detail_request(spoken_text):
+                        retry_count = 0
+                        self.speak_details()
+                    elif spoken_text and is_translation_request(spoken_text):
+                        retry_count = 0
+                        self.speak_translation()
+                    elif spoken_text:
                         retry_count = 0
                         processed_data = self.process_text(spoken_text, is_hindi)
                         if processed_data:
@@ -408,6 +808,7 @@ class VisuallyImpairedAssistant:
                             time.sleep(retry_delay)
                             retry_count = 0
 
+                    self.end_turn()
                     self.speak("Ready for next input.")
                     time.sleep(1)
 
@@ -421,19 +822,209 @@ class VisuallyImpairedAssistant:
                         retry_count = 0
 
         except KeyboardInterrupt:
-            self.speak("Exiting the application.")
+            self.speech.cancel()
+            self.speak("Exiting the application.", priority=PRIORITY_HIGH)
+            self.speech.close()
+            self.calibrator.save()
+            self._close_microphone()
+            if self._firebase_writer is not None:
+                self._firebase_writer.close()
             sys.exit(0)
 
+    # ── Streaming mode ───────────────────────────────────────────────────────
+
+    def _recognize_phrase(self, audio):
+        text, is_hindi = recognize_bilingual(
+            self.recognizer_backend, self.preprocessor.process(audio), self._recognition_pool,
+            deadline=self.recognition_deadline, breaker=self.recognition_breaker,
+        )
+        if self.barge_in:
+            self.speech.cancel()
+        self.speak(f"You said: {text}", self._translate_speech(is_hindi))
+        return text, is_hindi
+
+    def _analyse_phrase(self, text: str, is_hindi: bool):
+        try:
+            if is_detail_request(text):
+                self.speak_details()
+                return None
+            if is_translation_request(text):
+                self.speak_translation()
+                return None
+            return self.process_text(text, is_hindi)
+        finally:
+            self.end_turn()
+
+    def _store_phrase(self, text: str, is_hindi: bool, lines) -> None:
+        self.store_in_firebase({'raw_text': text, 'processed': lines})
+
+    def streaming_pipeline(self, source=None, **options) -> StreamingPipeline:
+        """
+        Build a StreamingPipeline over source (default: the open microphone).
+        Recognition, process_text and storage overlap with further listening.
+        """
+        live = source is None
+        if live:
+            source = self._open_microphone()
+            if self.calibrator.needs_full:
+                self.speak("Adjusting for ambient noise... Please wait.")
+                self._wait_for_silence()
+                self.calibrator.full(source)
+        options.setdefault('threshold', self.recognizer.energy_threshold)
+        if live and not self.barge_in:
+            # Don't transcribe the assistant's own voice.
+            options.setdefault('gate', lambda: self.speech.busy)
+        return StreamingPipeline(
+            source,
+            recognize=self._recognize_phrase,
+            analyse=self._analyse_phrase,
+            output=self._store_phrase,
+            lossless=not live,
+            **options,
+        )
+
+    def run_streaming(self, source=None) -> dict:
+        """Continuous listening until Ctrl+C (or the end of a file source)."""
+        stream = self.streaming_pipeline(source)
+        self.speak("Streaming mode. Speak whenever you like. Press Ctrl+C to exit.")
+        stream.start()
+        try:
+            while not stream.join(timeout=0.5):
+                pass
+        except KeyboardInterrupt:
+            stream.stop()
+            self.speech.cancel()
+            self.speak("Exiting the application.", priority=PRIORITY_HIGH)
+        stream.join(timeout=5.0)
+        self.speech.close()
+        self.calibrator.save()
+        self._close_microphone()
+        if self._firebase_writer is not None:
+            self._firebase_writer.close()
+        return dict(stream.stats, dropped_bytes=stream.buffer.dropped)
+
 
 # ─────────────────────────────────────────────
 # Entry point
 # ─────────────────────────────────────────────
-def main() -> int:
+def analyze_main(argv=None) -> int:
+    """`visual-assistant analyze` — offline JSONL analysis of files or stdin."""
+    import argparse
+    from .batch import log_to_stderr, run_analyze
+
+    parser = argparse.ArgumentParser(
+        prog='visual-assistant analyze',
+        description="Analyse one utterance per line from files (or stdin) and write JSONL.",
+    )
+    parser.add_argument('paths', nargs='*', help="Input files; '-' or none reads stdin.")
+    parser.add_argument('-o', '--output', help="Write JSONL here instead of stdout.")
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                        help="Worker processes (default: one per CPU core).")
+    parser.add_argument('--chunk-size', type=int, default=64,
+                        help="Utterances sent to a worker per task.")
+    parser.add_argument('--no-translate', action='store_true',
+                        help="Analyse Hindi lines as-is instead of translating them first.")
+    parser.add_argument('--format', choices=('jsonl', 'columns'), default='jsonl',
+                        help="'columns' writes compact binary result blocks (see results.load).")
+    args = parser.parse_args(argv)
+
+    if not args.output:
+        log_to_stderr()
     initialize_nltk()
-    _init_firebase()
     try:
-        assistant = VisuallyImpairedAssistant()
-        assistant.run()
+        run_analyze(args.paths, args.output, args.workers, args.chunk_size,
+                    translate=not args.no_translate, fmt=args.format)
+    except (OSError, UnicodeDecodeError) as exc:
+        logger.error("analyze: could not read input: %s", exc)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'analyze':
+        return analyze_main(argv[1:])
+    if argv and argv[0] == 'replay':
+        from .replay import replay_main
+        return replay_main(argv[1:])
+    if argv and argv[0] == 'serve':
+        from .server import serve_main
+        return serve_main(argv[1:])
+
+    import argparse
+    from .startup import ModelWarmup, StartupProfiler
+
+    parser = argparse.ArgumentParser(prog='visual-assistant')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="Print a per-phase start-up timing breakdown.")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Serve per-stage Prometheus metrics on localhost:PORT/metrics.")
+    parser.add_argument('--metrics-log-interval', type=float,
+                        help="Log a structured metrics summary every N seconds.")
+    parser.add_argument('--stream', action='store_true',
+                        help="Listen continuously; recognition and speech overlap with listening.")
+    parser.add_argument('--stream-file', metavar='WAV',
+                        help="Stream a WAV/AIFF/FLAC file through the pipeline instead of the microphone.")
+    parser.add_argument('--verbosity', choices=VERBOSITY_LEVELS,
+                        help="'summary' speaks only the most informative lines (default: full, or VA_VERBOSITY).")
+    parser.add_argument('--speech-budget', type=float, metavar='SECONDS',
+                        help="Spoken time per utterance in summary mode (default 20).")
+    parser.add_argument('--hindi-mode', choices=HINDI_MODES,
+                        help="'native' analyses Hindi locally; 'translate' analyses its English "
+                             "translation (default: native, or VA_HINDI_MODE).")
+    parser.add_argument('--max-rss-mb', type=float,
+                        help="Recycle TTS, recogniser and NLP models above this resident memory "
+                             "(default: VA_MAX_RSS_MB, or off).")
+    parser.add_argument('--recycle-turns', type=int,
+                        help="Recycle them every N turns (default: VA_RECYCLE_TURNS, or off).")
+    parser.add_argument('--barge-in', action='store_true',
+                        help="Listen while speaking so the user can interrupt; needs a headset "
+                             "or echo cancellation (or VA_BARGE_IN=1).")
+    parser.add_argument('--no-preprocess', action='store_true',
+                        help="Send captured audio as recorded, without trimming or resampling "
+                             "(or VA_AUDIO_PREPROCESS=0).")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port is not None or args.metrics_log_interval:
+        METRICS.enabled = True
+        if args.metrics_port is not None:
+            METRICS.serve(args.metrics_port)
+        if args.metrics_log_interval:
+            METRICS.start_log_loop(args.metrics_log_interval)
+
+    # Models load on background threads while the microphone and TTS engine
+    # are opened, so the first prompt doesn't wait on NLTK.
+    profiler = StartupProfiler(enabled=args.startup_profile)
+    warmup = ModelWarmup(prepare=initialize_nltk, profiler=profiler)
+    warmup.submit('firebase', _init_firebase)
+    warmup.add_done_callback(profiler.print_report)
+    try:
+        with profiler.phase('assistant_init'):
+            assistant = VisuallyImpairedAssistant(warmup=warmup, microphone=not args.stream_file)
+        if args.verbosity:
+            assistant.verbosity = args.verbosity
+        if args.speech_budget:
+            assistant.speech_budget = args.speech_budget
+        if args.hindi_mode:
+            assistant.hindi_mode = args.hindi_mode
+        if args.max_rss_mb:
+            assistant.watchdog.max_rss = int(args.max_rss_mb * 1024 * 1024)
+        if args.recycle_turns:
+            assistant.watchdog.max_turns = args.recycle_turns
+        if args.no_preprocess:
+            assistant.preprocessor.enabled = False
+        if args.barge_in:
+            assistant.barge_in = True
+        profiler.mark('first_prompt')
+        if args.stream_file:
+            with sr.AudioFile(args.stream_file) as source:
+                assistant.run_streaming(source)
+        elif args.stream:
+            assistant.run_streaming()
+        else:
+            assistant.run()
     except KeyboardInterrupt:
         print("\nExiting...")
     except Exception as exc:
@@ -0,0 +1,162 @@
+"""
+Long-running process hygiene for visual-impaired-assistant.
+
+The kiosk runs for weeks, and pyttsx3 drivers, the recogniser and the NLTK
+models are all known to grow. Watchdog is told about every turn, samples
+resident memory every few turns and, once a memory ceiling or a turn count
+is crossed, calls the registered recycle callbacks between turns. The
+session itself (microphone, calibration, the last description) is kept.
+"""
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unknown."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm', encoding='ascii') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current, but the best the platform offers.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def open_handles() -> Optional[int]:
+    """Open file descriptors of this process, or None if unknown."""
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+class Watchdog:
+    """
+    Recycle long-lived components once memory or turn limits are crossed.
+
+    max_rss_mb  — resident memory ceiling; None disables the check
+    max_turns   — recycle after this many turns since the last recycle; None disables
+    check_every — turns between RSS samples (reading RSS is not free)
+    cooldown    — turns after a recycle before memory may trigger another; freed
+                  memory is not always returned to the OS, so RSS can stay high
+    rss         — callable returning bytes, for tests
+    """
+
+    def __init__(self, max_rss_mb: Optional[float] = None, max_turns: Optional[int] = None,
+                 check_every: int = 10, cooldown: int = 100, rss=current_rss):
+        self.max_rss = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+        self.max_turns = max_turns or None
+        self.check_every = max(1, check_every)
+        self.cooldown = cooldown
+        self._rss = rss
+        self._components: dict = {}
+        self.turns = 0
+        self.turns_since_recycle = 0
+        self.recycles = 0
+        self.last_rss = None
+        self.last_reason = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'Watchdog':
+        """VA_MAX_RSS_MB, VA_RECYCLE_TURNS and VA_WATCHDOG_CHECK_EVERY; unset disables."""
+        max_rss = os.environ.get('VA_MAX_RSS_MB')
+        max_turns = os.environ.get('VA_RECYCLE_TURNS')
+        return cls(max_rss_mb=float(max_rss) if max_rss else None,
+                   max_turns=int(max_turns) if max_turns else None,
+                   check_every=int(os.environ.get('VA_WATCHDOG_CHECK_EVERY', '10')))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_rss or self.max_turns)
+
+    def register(self, name: str, recycle) -> None:
+        """recycle() rebuilds the component; it runs between turns."""
+        self._components[name] = recycle
+
+    # ── Turn accounting ──────────────────────────────────────────────────────
+
+    def turn(self) -> Optional[str]:
+        """Record a finished turn; recycles if a limit is crossed. Returns the reason."""
+        with self._lock:
+            self.turns += 1
+            self.turns_since_recycle += 1
+            reason = None
+            if self.max_turns and self.turns_since_recycle >= self.max_turns:
+                reason = 'turns'
+            elif self.turns % self.check_every == 0:
+                rss = self.sample()
+                if (self.max_rss and rss is not None and rss > self.max_rss
+                        and (not self.recycles or self.turns_since_recycle >= self.cooldown)):
+                    reason = 'memory'
+            if reason:
+                self._recycle(reason)
+            return reason
+
+    def sample(self) -> Optional[int]:
+        rss = self._rss()
+        if rss is not None:
+            self.last_rss = rss
+            METRICS.set_gauge('rss_bytes', rss)
+        return rss
+
+    def recycle(self, reason: str = 'manual') -> list:
+        """Rebuild every registered component; returns the names that failed."""
+        with self._lock:
+            return self._recycle(reason)
+
+    def _recycle(self, reason: str) -> list:
+        before = self.last_rss if reason == 'memory' else self._rss()
+        start = time.perf_counter()
+        failed = []
+        for name, rebuild in self._components.items():
+            try:
+                rebuild()
+            except Exception as exc:
+                logger.error("Recycling %s failed: %s", name, exc)
+                failed.append(name)
+        gc.collect()
+        after = self.sample()
+        self.recycles += 1
+        self.turns_since_recycle = 0
+        self.last_reason = reason
+        METRICS.inc('recycles', reason=reason)
+        logger.info("Recycled %s after %d turns (%s) in %.2fs; RSS %s -> %s MiB.",
+                    ', '.join(self._components) or 'nothing', self.turns, reason,
+                    time.perf_counter() - start, _mib(before), _mib(after))
+        return failed
+
+    def stats(self) -> dict:
+        return {
+            'turns': self.turns,
+            'recycles': self.recycles,
+            'last_reason': self.last_reason,
+            'rss_bytes': self.last_rss,
+            'max_rss_bytes': self.max_rss,
+            'max_turns': self.max_turns,
+        }
+
+
+def _mib(value) -> str:
+    return '?' if value is None else f"{value / (1024 * 1024):.1f}"
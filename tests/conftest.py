@@ -0,0 +1,40 @@
+"""
+Shared test setup: make the src/ layout importable and stub the hardware
+modules so visual_assistant can be imported on a headless runner.
+"""
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def _stub_module(name, **attrs):
+    if name in sys.modules:
+        return sys.modules[name]
+    mod = types.ModuleType(name)
+    for k, v in attrs.items():
+        setattr(mod, k, v)
+    sys.modules[name] = mod
+    return mod
+
+
+_stub_module('pyaudio', PyAudio=MagicMock, paInt16=8)
+_stub_module('pyttsx3', init=MagicMock(return_value=MagicMock()))
+_stub_module('speech_recognition',
+             Recognizer=MagicMock,
+             Microphone=MagicMock,
+             UnknownValueError=Exception,
+             RequestError=Exception,
+             WaitTimeoutError=Exception)
+
+
+@pytest.fixture(autouse=True)
+def _closed_circuits():
+    """Failures recorded by one test must not open a shared breaker for the next."""
+    from visual_assistant.resilience import reset_breakers
+    reset_breakers()
+    yield
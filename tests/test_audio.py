@@ -0,0 +1,144 @@
+"""Tests for audio preprocessing (VAD trim, downmix, resampling) on generated WAVs."""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from visual_assistant import audio as audio_module, visually
+from visual_assistant.audio import (AudioPreprocessor, decode_pcm, preprocess_pcm, read_wav,
+                                    resample, voiced_span, write_wav)
+
+if audio_module.numpy_available():
+    import numpy as np
+needs_numpy = unittest.skipUnless(audio_module.numpy_available(), "numpy missing")
+
+
+class FakeAudio:
+    """The parts of sr.AudioData the preprocessor uses."""
+
+    def __init__(self, frame_data, sample_rate, sample_width):
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+
+def utterance(rate, lead=0.5, speech=1.0, tail=0.7, freq=440.0, noise=0.001, seed=3):
+    """Quiet noise, a tone standing in for speech, quiet noise again."""
+    rng = np.random.default_rng(seed)
+    n = int((lead + speech + tail) * rate)
+    samples = rng.normal(0, noise, n)
+    start, end = int(lead * rate), int((lead + speech) * rate)
+    samples[start:end] += 0.4 * np.sin(2 * np.pi * freq * np.arange(end - start) / rate)
+    return samples
+
+
+def pcm16(samples) -> bytes:
+    return np.clip(np.round(samples * 32767), -32768, 32767).astype('<i2').tobytes()
+
+
+def peak_hz(samples, rate) -> float:
+    spectrum = np.abs(np.fft.rfft(samples))
+    return float(np.fft.rfftfreq(len(samples), 1 / rate)[spectrum.argmax()])
+
+
+@needs_numpy
+class TestWavFixtures(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def wav(self, name, frames, rate, width=2, channels=1):
+        path = os.path.join(self.dir, name)
+        write_wav(path, frames, rate, width, channels)
+        return path
+
+    def test_stereo_44k_is_trimmed_downmixed_and_resampled(self):
+        mono = utterance(44100)
+        stereo = np.stack([mono, mono], axis=1).ravel()
+        frames, rate, width, channels = read_wav(self.wav('stereo.wav', pcm16(stereo), 44100, channels=2))
+        self.assertEqual((rate, width, channels), (44100, 2, 2))
+
+        out, out_rate, trimmed = preprocess_pcm(frames, rate, width, channels)
+        self.assertEqual(out_rate, 16000)
+        seconds = len(out) / 2 / 16000
+        # 1 s of tone plus 0.2 s padding either side, to within a frame.
+        self.assertAlmostEqual(seconds, 1.4, delta=0.05)
+        self.assertAlmostEqual(trimmed, 2.2 - seconds, delta=0.01)
+        self.assertLess(len(out), len(frames) / 7)
+        self.assertAlmostEqual(peak_hz(decode_pcm(out, 2), 16000), 440.0, delta=2)
+
+    def test_8bit_and_24bit_wavs_decode(self):
+        tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(800) / 8000)
+        unsigned = np.round(tone * 127 + 128).astype(np.uint8).tobytes()
+        frames, _, width, _ = read_wav(self.wav('u8.wav', unsigned, 8000, width=1))
+        np.testing.assert_allclose(decode_pcm(frames, width), tone, atol=1 / 100)
+
+        ints = np.round(tone * (2 ** 23 - 1)).astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3]
+        frames, _, width, _ = read_wav(self.wav('s24.wav', ints.tobytes(), 8000, width=3))
+        np.testing.assert_allclose(decode_pcm(frames, width), tone, atol=1e-6)
+
+    def test_rates_below_target_are_not_upsampled(self):
+        frames = pcm16(utterance(8000))
+        out, rate, _ = preprocess_pcm(frames, 8000, 2)
+        self.assertEqual(rate, 8000)
+        self.assertLess(len(out), len(frames))
+
+
+@needs_numpy
+class TestSignal(unittest.TestCase):
+
+    def test_downsampling_filters_out_aliases(self):
+        rate = 48000
+        t = np.arange(rate) / rate
+        audible = resample(np.sin(2 * np.pi * 1000 * t).astype(np.float32), rate, 16000)
+        alias = resample(np.sin(2 * np.pi * 11000 * t).astype(np.float32), rate, 16000)
+        self.assertEqual(len(audible), 16000)
+        self.assertAlmostEqual(peak_hz(audible, 16000), 1000.0, delta=1)
+        self.assertLess(np.sqrt(np.mean(alias ** 2)), 0.1 * np.sqrt(np.mean(audible ** 2)))
+
+    def test_silence_is_kept_whole(self):
+        samples = np.random.default_rng(0).normal(0, 0.001, 16000).astype(np.float32)
+        self.assertEqual(voiced_span(samples, 16000), (0, 16000))
+
+
+@needs_numpy
+class TestAudioPreprocessor(unittest.TestCase):
+
+    def test_reports_bytes_saved(self):
+        pre = AudioPreprocessor()
+        audio = FakeAudio(pcm16(utterance(44100)), 44100, 2)
+        out = pre.process(audio)
+        self.assertIsInstance(out, FakeAudio)
+        self.assertEqual((out.sample_rate, out.sample_width), (16000, 2))
+        stats = pre.stats()
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual(stats['bytes_saved'], len(audio.frame_data) - len(out.frame_data))
+        self.assertGreater(stats['seconds'], 0.0)
+
+    def test_non_pcm_and_disabled_pass_through(self):
+        marker = object()
+        self.assertIs(AudioPreprocessor().process(marker), marker)
+        audio = FakeAudio(pcm16(utterance(44100)), 44100, 2)
+        self.assertIs(AudioPreprocessor(enabled=False).process(audio), audio)
+
+    def test_recognition_receives_the_smaller_audio(self):
+        assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(assistant.speech.close)
+        assistant.speak = MagicMock()
+        seen = []
+
+        def recognize(audio, language):
+            seen.append(audio.sample_rate)
+            return "नमस्ते" if language == 'hi-IN' else "hello"
+
+        assistant.recognizer_backend = MagicMock(recognize=recognize)
+        text, is_hindi = assistant.recognize_audio(FakeAudio(pcm16(utterance(48000)), 48000, 2))
+        self.assertEqual((text, is_hindi), ("नमस्ते", True))
+        self.assertEqual(set(seen), {16000})
+        self.assertEqual(assistant.preprocessor.stats()['calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
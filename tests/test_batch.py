@@ -0,0 +1,67 @@
+"""Tests for the offline `visual-assistant analyze` batch mode."""
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from visual_assistant import batch
+
+
+class FakePipeline:
+    """Stands in for AnalysisPipeline so these tests don't need NLTK data."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def describe_many(self, utterances):
+        return [[f"Words: {len(text.split())}", f"Hindi: {is_hindi}"]
+                for text, is_hindi in utterances]
+
+
+class TestAnalyzeCorpus(unittest.TestCase):
+
+    def test_results_stay_in_input_order(self):
+        records = [(i, 'mem', f"sentence number {i}") for i in range(50)]
+        with patch.object(batch, 'AnalysisPipeline', FakePipeline):
+            results = list(batch.analyze_corpus(iter(records), workers=1, chunk_size=7))
+        self.assertEqual([r['id'] for r in results], list(range(50)))
+        self.assertEqual(results[3]['description'], ["Words: 3", "Hindi: False"])
+
+    def test_pool_preserves_order(self):
+        records = [(i, 'mem', f"line {i}.") for i in range(40)]
+        results = list(batch.analyze_corpus(iter(records), workers=2, chunk_size=3))
+        self.assertEqual([r['text'] for r in results], [r[2] for r in records])
+        for result in results:
+            self.assertIsInstance(result['description'], list)
+
+    def test_hindi_detected_and_translation_optional(self):
+        records = [(0, 'mem', "नमस्ते दुनिया")]
+        with patch.object(batch, 'AnalysisPipeline', FakePipeline):
+            translated = next(batch.analyze_corpus(iter(records), workers=1))
+            raw = next(batch.analyze_corpus(iter(records), workers=1, translate=False))
+        self.assertTrue(translated['is_hindi'])
+        self.assertEqual(translated['description'][1], "Hindi: True")
+        self.assertEqual(raw['description'][1], "Hindi: False")
+
+
+class TestRunAnalyze(unittest.TestCase):
+
+    def test_writes_jsonl_and_skips_blank_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'in.txt')
+            out = os.path.join(tmp, 'out.jsonl')
+            with open(src, 'w', encoding='utf-8') as fh:
+                fh.write("hello world\n\n  \nsecond line here\n")
+            with patch.object(batch, 'AnalysisPipeline', FakePipeline):
+                count = batch.run_analyze([src], out, workers=1)
+            with open(out, encoding='utf-8') as fh:
+                rows = [json.loads(line) for line in fh]
+        self.assertEqual(count, 2)
+        self.assertEqual([r['id'] for r in rows], [0, 1])
+        self.assertEqual(rows[1]['text'], "second line here")
+        self.assertEqual(rows[1]['source'], src)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for LRUCache and the translation cache in front of _safe_translate."""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import visually
+from visual_assistant.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.put('k', 'v')
+        clock.now += 5
+        self.assertEqual(cache.get('k'), 'v')
+        clock.now += 6
+        self.assertIsNone(cache.get('k'))
+
+    def test_hit_miss_counters(self):
+        cache = LRUCache()
+        cache.get('x')
+        cache.put('x', 'y')
+        cache.get('x')
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.5)
+
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite')
+            first = LRUCache(path=path)
+            first.put(('नमस्ते', 'hi', 'en'), 'Hello')
+            first.close()
+            second = LRUCache(path=path)
+            self.assertEqual(second.get(('नमस्ते', 'hi', 'en')), 'Hello')
+            self.assertEqual(second.stats()['disk_hits'], 1)
+            second.close()
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=100, max_bytes=250, sizeof=lambda key, value: len(value))
+        cache.put('a', 'x' * 100)
+        cache.put('b', 'x' * 100)
+        cache.get('a')
+        cache.put('c', 'x' * 100)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache.get('a')), 100)
+        self.assertEqual(cache.stats()['bytes'], 200)
+        cache.put('a', 'x' * 10)         # replacing an entry frees its old size
+        self.assertEqual(cache.stats()['bytes'], 110)
+
+    def test_entry_larger_than_budget_is_not_kept(self):
+        cache = LRUCache(max_bytes=50)
+        cache.put('small', 'ok')
+        cache.put('big', 'x' * 500)
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(cache.stats()['evictions'], 0)
+        self.assertEqual(cache.get('small'), 'ok')
+
+    def test_disk_size_bound(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite')
+            cache = LRUCache(maxsize=1, path=path, disk_maxsize=3)
+            for i in range(10):
+                cache.put(f'k{i}', i)
+            count = cache._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            self.assertEqual(count, 3)
+            self.assertEqual(cache.get('k9'), 9)
+            self.assertIsNone(cache.get('k0'))
+            cache.close()
+
+
+class TestTranslationCache(unittest.TestCase):
+
+    def setUp(self):
+        visually._translation_cache.clear()
+
+    def test_repeated_text_hits_cache_and_reuses_client(self):
+        translator = MagicMock()
+        translator.translate.return_value = MagicMock(text='Number of sentences: 1')
+        with patch.object(visually, '_translator', translator):
+            for _ in range(5):
+                out = visually._safe_translate('Number of sentences: 1')
+        self.assertEqual(out, 'Number of sentences: 1')
+        self.assertEqual(translator.translate.call_count, 1)
+
+    def test_failures_are_not_cached(self):
+        translator = MagicMock()
+        translator.translate.side_effect = RuntimeError("network down")
+        with patch.object(visually, '_translator', translator):
+            self.assertEqual(visually._safe_translate('नमस्ते'), 'नमस्ते')
+        self.assertIsNone(visually._translation_cache.get(('नमस्ते', 'hi', 'en')))
+
+
+if __name__ == '__main__':
+    unittest.main()
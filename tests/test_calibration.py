@@ -0,0 +1,114 @@
+"""
+Tests for the adaptive ambient-noise calibrator.
+"""
+import os
+import struct
+import tempfile
+import unittest
+
+from visual_assistant.calibration import NoiseCalibrator, rms
+
+
+def pcm(amplitude: int, samples: int = 1024) -> bytes:
+    return struct.pack(f'<{samples}h', *([amplitude, -amplitude] * (samples // 2)))
+
+
+class FakeStream:
+    def __init__(self, amplitude: int):
+        self.amplitude = amplitude
+        self.reads = 0
+
+    def read(self, size):
+        self.reads += 1
+        return pcm(self.amplitude, size)
+
+
+class FakeSource:
+    CHUNK = 1024
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, amplitude: int):
+        self.stream = FakeStream(amplitude)
+
+
+class FakeRecognizer:
+    dynamic_energy_ratio = 1.5
+
+    def __init__(self, measured: float = 100.0):
+        self.energy_threshold = 300.0
+        self.measured = measured
+        self.full_passes = 0
+
+    def adjust_for_ambient_noise(self, source, duration=1):
+        self.full_passes += 1
+        self.energy_threshold = self.measured * self.dynamic_energy_ratio
+
+
+class TestRms(unittest.TestCase):
+
+    def test_constant_amplitude(self):
+        self.assertAlmostEqual(rms(pcm(500), 2), 500.0)
+
+    def test_empty_and_unsupported_width(self):
+        self.assertEqual(rms(b'', 2), 0.0)
+        self.assertEqual(rms(b'\x00\x01\x02', 3), 0.0)
+
+
+class TestNoiseCalibrator(unittest.TestCase):
+
+    def test_first_update_is_full_then_incremental(self):
+        recognizer = FakeRecognizer(measured=100.0)
+        calibrator = NoiseCalibrator(recognizer)
+        self.assertTrue(calibrator.needs_full)
+        self.assertEqual(calibrator.update(FakeSource(100)), 'full')
+        self.assertAlmostEqual(calibrator.noise_floor, 100.0)
+
+        source = FakeSource(120)
+        self.assertEqual(calibrator.update(source), 'incremental')
+        self.assertEqual(recognizer.full_passes, 1)
+        self.assertGreater(calibrator.noise_floor, 100.0)
+        self.assertAlmostEqual(recognizer.energy_threshold, calibrator.noise_floor * 1.5)
+        # 0.25 s at 16 kHz in 1024-frame chunks
+        self.assertEqual(source.stream.reads, 4)
+
+    def test_drift_triggers_full_recalibration(self):
+        recognizer = FakeRecognizer(measured=100.0)
+        calibrator = NoiseCalibrator(recognizer)
+        calibrator.update(FakeSource(100))
+        recognizer.measured = 800.0
+        self.assertEqual(calibrator.update(FakeSource(800)), 'full')
+        self.assertEqual(recognizer.full_passes, 2)
+        self.assertAlmostEqual(calibrator.noise_floor, 800.0)
+
+    def test_quieter_room_also_counts_as_drift(self):
+        recognizer = FakeRecognizer(measured=400.0)
+        calibrator = NoiseCalibrator(recognizer)
+        calibrator.update(FakeSource(400))
+        recognizer.measured = 50.0
+        self.assertEqual(calibrator.update(FakeSource(50)), 'full')
+
+    def test_calibration_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'calibration.json')
+            NoiseCalibrator(FakeRecognizer(measured=200.0), path=path).update(FakeSource(200))
+            self.assertTrue(os.path.exists(path))
+
+            recognizer = FakeRecognizer()
+            calibrator = NoiseCalibrator(recognizer, path=path)
+            self.assertFalse(calibrator.needs_full)
+            self.assertAlmostEqual(recognizer.energy_threshold, 300.0)
+            self.assertEqual(calibrator.update(FakeSource(200)), 'incremental')
+            self.assertEqual(recognizer.full_passes, 0)
+
+    def test_corrupt_file_falls_back_to_full(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'calibration.json')
+            with open(path, 'w') as fh:
+                fh.write('{not json')
+            calibrator = NoiseCalibrator(FakeRecognizer(), path=path)
+            self.assertTrue(calibrator.needs_full)
+
+
+if __name__ == '__main__':
+    unittest.main()
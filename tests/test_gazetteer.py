@@ -0,0 +1,146 @@
+"""Tests for the gazetteer entity matcher and the pipeline's entity modes."""
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import nltk
+
+from visual_assistant.cache import LRUCache
+from visual_assistant.gazetteer import Gazetteer, merge_entities, ner_from_env
+from visual_assistant.pipeline import AnalysisPipeline
+
+from test_pipeline import FakeChunker, FakeTagger, _split
+
+
+class TestGazetteer(unittest.TestCase):
+
+    def setUp(self):
+        self.gazetteer = Gazetteer({
+            'GPE': ['Delhi', 'New Delhi', 'Connaught Place'],
+            'FACILITY': ['New Delhi Railway Station', 'railway station'],
+            'MEDICINE': ['paracetamol', 'vitamin D3'],
+        })
+
+    def test_leftmost_longest_without_overlaps(self):
+        tokens = "Take paracetamol at New Delhi Railway Station".split()
+        self.assertEqual(self.gazetteer.find(tokens), [(1, 2, 'MEDICINE'), (3, 7, 'FACILITY')])
+
+    def test_failure_links_recover_shorter_phrases(self):
+        # "New Delhi Railway" starts the longest phrase but never completes it.
+        tokens = "new delhi railway station platform".split()
+        self.assertEqual(self.gazetteer.entities(tokens),
+                         [('FACILITY', 'new delhi railway station')])
+        tokens = "the new delhi railway lines reach Delhi".split()
+        self.assertEqual(self.gazetteer.entities(tokens), [('GPE', 'new delhi'), ('GPE', 'Delhi')])
+
+    def test_matches_keep_the_original_case(self):
+        self.assertEqual(self.gazetteer.entities(["VITAMIN", "d3", "daily"]),
+                         [('MEDICINE', 'VITAMIN d3')])
+        exact = Gazetteer({'MEDICINE': ['Crocin']}, case_sensitive=True)
+        self.assertEqual(exact.find(["crocin"]), [])
+
+    def test_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = os.path.join(tmp, 'medicine.txt')
+            with open(plain, 'w', encoding='utf-8') as fh:
+                fh.write("# one per line\nCrocin\nDolo 650\nLajpat Nagar\tGPE\n")
+            data = os.path.join(tmp, 'places.json')
+            with open(data, 'w', encoding='utf-8') as fh:
+                json.dump({'GPE': ['Chandni Chowk']}, fh)
+            gazetteer = Gazetteer.from_files([plain, data])
+        self.assertEqual((len(gazetteer), gazetteer.labels), (4, ['GPE', 'MEDICINE']))
+        self.assertEqual(gazetteer.entities("Dolo 650 from Chandni Chowk".split()),
+                         [('MEDICINE', 'Dolo 650'), ('GPE', 'Chandni Chowk')])
+
+    def test_gazetteer_wins_overlaps_when_merged(self):
+        tokens = "John took Dolo 650 in Delhi".split()
+        maxent = [(0, 1, 'PERSON', 'John'), (2, 3, 'ORGANIZATION', 'Dolo'), (5, 6, 'GPE', 'Delhi')]
+        self.assertEqual(merge_entities(tokens, maxent, [(2, 4, 'MEDICINE')]),
+                         [('PERSON', 'John'), ('MEDICINE', 'Dolo 650'), ('GPE', 'Delhi')])
+
+    def test_mode_from_environment(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'medicine.txt')
+            with open(path, 'w', encoding='utf-8') as fh:
+                fh.write("Crocin\n")
+            with patch.dict(os.environ, {}, clear=True):
+                self.assertEqual(ner_from_env(), {'ner': 'maxent', 'gazetteer': None})
+            with patch.dict(os.environ, {'VA_GAZETTEER': path}, clear=True):
+                options = ner_from_env()
+            self.assertEqual((options['ner'], len(options['gazetteer'])), ('combined', 1))
+            with patch.dict(os.environ, {'VA_NER': 'gazetteer'}, clear=True):
+                self.assertEqual(ner_from_env()['ner'], 'maxent')
+
+
+class BrokenChunker:
+    def parse_sents(self, sents):
+        raise AssertionError("maxent chunker used in gazetteer mode")
+
+    parse = parse_sents
+
+
+class TestPipelineModes(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(nltk, sent_tokenize=_split,
+                                 word_tokenize=lambda text: re.findall(r"\w+|[^\w\s]", text))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.gazetteer = Gazetteer({'MEDICINE': ['Dolo 650'], 'GPE': ['Lajpat Nagar']})
+
+    def test_gazetteer_mode_skips_the_chunker(self):
+        pipeline = AnalysisPipeline(tagger=FakeTagger(), chunker=BrokenChunker(),
+                                    ner='gazetteer', gazetteer=self.gazetteer)
+        lines = list(pipeline.describe("Ravi bought Dolo 650 in Lajpat Nagar."))
+        self.assertIn("Named entities: MEDICINE: Dolo 650, GPE: Lajpat Nagar", lines)
+
+    def test_combined_mode_adds_maxent_entities(self):
+        pipeline = AnalysisPipeline(tagger=FakeTagger(), chunker=FakeChunker(),
+                                    ner='combined', gazetteer=self.gazetteer)
+        lines = list(pipeline.describe("Ravi bought Dolo 650 in Lajpat Nagar."))
+        self.assertIn("Named entities: PERSON: Ravi, MEDICINE: Dolo 650, GPE: Lajpat Nagar", lines)
+        lines = list(pipeline.describe("Dolo 650 works."))
+        self.assertIn("Named entities: MEDICINE: Dolo 650", lines)
+
+    def test_modes_do_not_share_cached_entities(self):
+        cache = LRUCache(maxsize=100)
+        text = "Ravi bought Dolo 650."
+        maxent = AnalysisPipeline(tagger=FakeTagger(), chunker=FakeChunker(), cache=cache)
+        self.assertIn("Named entities: PERSON: Ravi", list(maxent.describe(text)))
+        gazetteer = AnalysisPipeline(tagger=FakeTagger(), chunker=BrokenChunker(), cache=cache,
+                                     ner='gazetteer', gazetteer=self.gazetteer)
+        self.assertIn("Named entities: MEDICINE: Dolo 650", list(gazetteer.describe(text)))
+
+    def test_a_failing_sentence_does_not_sink_the_batch(self):
+        gazetteer = self.gazetteer
+
+        class Flaky:
+            digest = gazetteer.digest
+
+            def find(self, tokens):
+                if 'Ravi' in tokens:
+                    raise RuntimeError("bad automaton")
+                return gazetteer.find(tokens)
+
+            def entities(self, tokens):
+                return [(label, ' '.join(tokens[a:b])) for a, b, label in self.find(tokens)]
+
+        for ner, chunker in (('gazetteer', BrokenChunker()), ('combined', FakeChunker())):
+            pipeline = AnalysisPipeline(tagger=FakeTagger(), chunker=chunker, ner=ner, gazetteer=Flaky())
+            first, second = pipeline.describe_many([("Ravi bought Dolo 650.", False),
+                                                    ("Dolo 650 works.", False)])
+            self.assertIn("Note: Named entity recognition unavailable.", list(first))
+            self.assertIn("Named entities: MEDICINE: Dolo 650", list(second))
+
+    def test_mode_needs_a_gazetteer(self):
+        with self.assertRaises(ValueError):
+            AnalysisPipeline(ner='gazetteer')
+        with self.assertRaises(ValueError):
+            AnalysisPipeline(ner='crf', gazetteer=self.gazetteer)
+
+
+if __name__ == '__main__':
+    unittest.main()
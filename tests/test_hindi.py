@@ -0,0 +1,144 @@
+"""
+Tests for local Hindi analysis and translation on request.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import visually
+from visual_assistant.hindi import HindiAnalyzer, is_translation_request
+from visual_assistant.pipeline import AnalysisPipeline
+from visual_assistant.recognition import ScriptedRecognizer
+
+TEXT = "डॉक्टर ने कहा माँ को दो बार दवा लेनी चाहिए। क्या आप 5 बजे फोन करेंगे? मैं ठीक नहीं हूँ, OK!"
+
+
+class TestHindiAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.hindi = HindiAnalyzer(use_indicnlp=False)
+
+    def test_sentences_split_on_danda_and_question_mark(self):
+        self.assertEqual(self.hindi.split_sentences(TEXT), [
+            "डॉक्टर ने कहा माँ को दो बार दवा लेनी चाहिए।",
+            "क्या आप 5 बजे फोन करेंगे?",
+            "मैं ठीक नहीं हूँ, OK!",
+        ])
+
+    def test_tokens_keep_matras_and_drop_punctuation_when_tagged(self):
+        tokens = self.hindi.tokenize("मैं ठीक नहीं हूँ, OK!")
+        self.assertEqual(tokens, ["मैं", "ठीक", "नहीं", "हूँ", ",", "OK", "!"])
+        self.assertEqual(self.hindi.tag(tokens), [
+            ("मैं", 'Personal pronoun'), ("ठीक", 'Content word'), ("नहीं", 'Negation'),
+            ("हूँ", 'Auxiliary verb'), ("OK", 'Foreign word'),
+        ])
+
+    def test_numbers_in_both_scripts(self):
+        self.assertEqual(self.hindi.tag(["५", "12", "दो"]), [
+            ("५", 'Cardinal number'), ("12", 'Cardinal number'), ("दो", 'Cardinal number'),
+        ])
+
+    def test_description_has_the_english_pipeline_shape(self):
+        lines = self.hindi.describe(TEXT)
+        self.assertEqual(lines[0], "Number of sentences: 3")
+        self.assertEqual(lines[1], "\nAnalysing sentence 1: डॉक्टर ने कहा माँ को दो बार दवा लेनी चाहिए।")
+        self.assertIn("Postposition: ने, को", lines)
+        self.assertIn("Question word: क्या", lines)
+        self.assertIn("Statistics: 5 words, 5 distinct", lines)
+
+    def test_forcing_missing_indicnlp_raises(self):
+        with patch('visual_assistant.hindi._load_indicnlp', return_value=None):
+            with self.assertRaises(ImportError):
+                HindiAnalyzer(use_indicnlp=True)
+            self.assertEqual(HindiAnalyzer().backend, 'regex')
+
+
+class TestTranslationRequest(unittest.TestCase):
+
+    def test_recognises_requests(self):
+        for text in ("Translate", "in English.", "अनुवाद करो", "अंग्रेजी में"):
+            self.assertTrue(is_translation_request(text), text)
+
+    def test_ordinary_speech_is_not_a_request(self):
+        for text in ("translate this letter for my mother", "", None):
+            self.assertFalse(is_translation_request(text))
+
+
+class TestNativePipeline(unittest.TestCase):
+
+    def test_hindi_is_not_translated(self):
+        translate = MagicMock(return_value="Hello.")
+        pipeline = AnalysisPipeline(translate=translate, hindi=HindiAnalyzer(use_indicnlp=False))
+        result = pipeline.describe("नमस्ते दुनिया।", is_hindi=True)
+        translate.assert_not_called()
+        self.assertEqual(result, ["Number of sentences: 1", "\nAnalysing sentence 1: नमस्ते दुनिया।",
+                                  "Content word: नमस्ते, दुनिया", "Statistics: 2 words, 2 distinct"])
+
+    def test_native_failure_falls_back_to_translation(self):
+        broken = MagicMock()
+        broken.describe.side_effect = RuntimeError("boom")
+        pipeline = AnalysisPipeline(translate=lambda text, src, dest: "Hello.", hindi=broken)
+        with patch('nltk.sent_tokenize', side_effect=LookupError("no punkt")):
+            result = pipeline.describe("नमस्ते", is_hindi=True)
+        self.assertEqual(result[0], "Translation: Hello.")
+
+
+class TestAssistantHindiModes(unittest.TestCase):
+
+    def setUp(self):
+        self.assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(self.assistant.speech.close)
+        self.spoken = []
+        patcher = patch.object(self.assistant, 'speak', side_effect=lambda text, is_hindi=False, **kw:
+                               self.spoken.append((text, is_hindi)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(visually, '_safe_translate', return_value="The doctor called.")
+        self.translate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_native_mode_speaks_without_translating(self):
+        self.assistant.hindi_mode = 'native'
+        self.assistant.process_text("डॉक्टर ने फोन किया।", is_hindi=True)
+        self.translate.assert_not_called()
+        self.assertTrue(self.spoken)
+        self.assertFalse(any(is_hindi for _, is_hindi in self.spoken))
+
+    def test_streamed_hindi_phrase_is_echoed_untranslated(self):
+        self.assistant.hindi_mode = 'native'
+        self.assistant.recognizer_backend = ScriptedRecognizer({'hi-IN': "नमस्ते", 'en-US': "namaste"})
+        with patch.object(visually, '_safe_translate_many') as translate_many:
+            self.assertEqual(self.assistant._recognize_phrase(object()), ("नमस्ते", True))
+        self.translate.assert_not_called()
+        translate_many.assert_not_called()
+        self.assertEqual(self.spoken, [("You said: नमस्ते", False)])
+
+    def test_translation_only_on_request(self):
+        self.assistant.hindi_mode = 'native'
+        self.assertFalse(self.assistant.speak_translation())
+        self.assistant.process_text("डॉक्टर ने फोन किया।", is_hindi=True)
+        self.spoken.clear()
+        self.assertTrue(self.assistant.speak_translation())
+        self.translate.assert_called_once_with("डॉक्टर ने फोन किया।", src='hi', dest='en')
+        self.assertEqual(self.spoken, [("Translation: The doctor called.", False)])
+
+    def test_failed_translation_is_announced(self):
+        self.assistant.process_text("नमस्ते।", is_hindi=True)
+        self.spoken.clear()
+        self.translate.return_value = "नमस्ते।"
+        self.assertFalse(self.assistant.speak_translation())
+        self.assertEqual(self.spoken, [("Translation is unavailable right now.", False)])
+
+    def test_translate_mode_keeps_the_old_path(self):
+        self.assistant.hindi_mode = 'translate'
+        self.assertIsNone(self.assistant.pipeline.hindi)
+        with patch.object(self.assistant.pipeline, 'describe', return_value=["Translation: x"]):
+            self.assistant.process_text("नमस्ते", is_hindi=True)
+        self.assertEqual(self.spoken, [("Translation: x", True)])
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.assistant.hindi_mode = 'hinglish'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for the per-stage metrics registry and its localhost endpoint."""
+import time
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+import nltk
+
+from visual_assistant.metrics import METRICS, Metrics
+from visual_assistant.pipeline import AnalysisPipeline
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_disabled_timer_records_nothing(self):
+        metrics = Metrics(enabled=False)
+        with metrics.timer('listen'):
+            pass
+        metrics.inc('turns')
+        self.assertEqual(metrics.snapshot(), {'stages': {}, 'counters': {}})
+
+    def test_histogram_and_error_counter(self):
+        metrics = Metrics(enabled=True)
+        with metrics.timer('tag'):
+            time.sleep(0.002)
+        with self.assertRaises(ValueError):
+            with metrics.timer('tag'):
+                raise ValueError
+        text = metrics.render_prometheus()
+        self.assertIn('va_stage_seconds_count{stage="tag"} 2', text)
+        self.assertIn('va_stage_seconds_bucket{stage="tag",le="+Inf"} 2', text)
+        self.assertIn('va_stage_errors_total{stage="tag"} 1', text)
+        self.assertEqual(metrics.snapshot()['stages']['tag']['count'], 2)
+
+    def test_labelled_counters_and_gauges(self):
+        metrics = Metrics(enabled=True)
+        metrics.inc('translation_cache', result='hit')
+        metrics.inc('translation_cache', result='hit')
+        metrics.set_gauge('breaker_state', 1, service='translate')
+        text = metrics.render_prometheus()
+        self.assertIn('va_translation_cache_total{result="hit"} 2', text)
+        self.assertIn('va_breaker_state{service="translate"} 1', text)
+
+    def test_http_endpoint_serves_prometheus_text(self):
+        metrics = Metrics(enabled=True)
+        metrics.observe('listen', 0.3)
+        server = metrics.serve(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as resp:
+                body = resp.read().decode()
+                self.assertIn('text/plain', resp.headers['Content-Type'])
+            self.assertIn('va_stage_seconds_sum{stage="listen"} 0.300000', body)
+        finally:
+            metrics.stop()
+
+
+class FakeTagger:
+    def tag_sents(self, sents):
+        return [[(t, 'NN') for t in s] for s in sents]
+
+
+class FakeChunker:
+    def parse_sents(self, sents):
+        return [[] for _ in sents]
+
+
+class TestPipelineInstrumentation(unittest.TestCase):
+
+    def test_pipeline_stages_are_timed(self):
+        METRICS.reset()
+        METRICS.enabled = True
+        try:
+            with patch.multiple(nltk, sent_tokenize=lambda t: [t], word_tokenize=str.split):
+                AnalysisPipeline(tagger=FakeTagger(), chunker=FakeChunker()).describe("a b c")
+            stages = METRICS.snapshot()['stages']
+        finally:
+            METRICS.enabled = False
+            METRICS.reset()
+        for stage in ('sentence_split', 'tokenize', 'tag', 'ne_chunk', 'sentiment'):
+            self.assertEqual(stages[stage]['count'], 1, stage)
+
+
+if __name__ == '__main__':
+    unittest.main()
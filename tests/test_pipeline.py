@@ -0,0 +1,204 @@
+"""Tests for AnalysisPipeline — batching with fake models, parity with real NLTK."""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import nltk
+
+from visual_assistant.cache import LRUCache
+from visual_assistant.pipeline import POS_DESCRIPTIONS, AnalysisPipeline
+
+
+def _nltk_data_available() -> bool:
+    for path in ('tokenizers/punkt', 'taggers/averaged_perceptron_tagger',
+                 'chunkers/maxent_ne_chunker', 'corpora/words', 'sentiment/vader_lexicon.zip'):
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            return False
+    return True
+
+
+class FakeTagger:
+    def __init__(self):
+        self.batches = []
+
+    def tag_sents(self, sents):
+        self.batches.append(len(sents))
+        return [self.tag(s) for s in sents]
+
+    def tag(self, tokens):
+        return [(t, 'NNP' if t[0].isupper() else 'NN') for t in tokens]
+
+
+class FakeChunker:
+    def __init__(self):
+        self.batches = []
+
+    def parse_sents(self, sents):
+        self.batches.append(len(sents))
+        return [self.parse(s) for s in sents]
+
+    def parse(self, tagged):
+        return nltk.Tree('S', [nltk.Tree('PERSON', [tagged[0]])] + tagged[1:])
+
+
+def _split(text):
+    return [s.strip() + '.' for s in text.split('.') if s.strip()]
+
+
+class TestBatching(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(nltk, sent_tokenize=_split, word_tokenize=str.split)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_pass_for_all_sentences_of_all_utterances(self):
+        tagger, chunker = FakeTagger(), FakeChunker()
+        pipeline = AnalysisPipeline(tagger=tagger, chunker=chunker)
+        results = pipeline.describe_many([("Alice runs. Bob walks.", False), ("Carol sings.", False)])
+        self.assertEqual(tagger.batches, [3])
+        self.assertEqual(chunker.batches, [3])
+        self.assertEqual(results[1], [
+            "Number of sentences: 1",
+            "\nAnalysing sentence 1: Carol sings.",
+            f"{POS_DESCRIPTIONS['NNP']}: Carol",
+            f"{POS_DESCRIPTIONS['NN']}: sings.",
+            "Named entities: PERSON: Carol",
+        ])
+
+    def test_hindi_is_translated_first(self):
+        pipeline = AnalysisPipeline(translate=lambda text, src, dest: "Hello there.",
+                                    tagger=FakeTagger(), chunker=FakeChunker())
+        result = pipeline.describe("नमस्ते", is_hindi=True)
+        self.assertEqual(result[:2], ["Translation: Hello there.", "Number of sentences: 1"])
+
+    def test_failed_chunker_is_reported_per_sentence(self):
+        class Broken(FakeChunker):
+            def parse(self, tagged):
+                raise RuntimeError("no model")
+        pipeline = AnalysisPipeline(tagger=FakeTagger(), chunker=Broken())
+        result = pipeline.describe("Alice runs. Bob walks.")
+        self.assertEqual(result.count("Note: Named entity recognition unavailable."), 2)
+
+    def test_failed_tagger_marks_sentence(self):
+        class Broken(FakeTagger):
+            def tag(self, tokens):
+                raise LookupError("tagger missing")
+        pipeline = AnalysisPipeline(tagger=Broken(), chunker=FakeChunker())
+        result = pipeline.describe("Alice runs.")
+        self.assertEqual(result[-1], "Note: Could not fully analyse sentence 1.")
+
+
+class CountingAnalyzer:
+    def __init__(self):
+        self.calls = 0
+
+    def polarity_scores(self, text):
+        self.calls += 1
+        return {'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.6}
+
+
+class TestSentenceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.split_calls = 0
+
+        def split(text):
+            self.split_calls += 1
+            return _split(text)
+        patcher = patch.multiple(nltk, sent_tokenize=split, word_tokenize=str.split)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tagger, self.chunker, self.analyzer = FakeTagger(), FakeChunker(), CountingAnalyzer()
+
+    def pipeline(self, cache):
+        return AnalysisPipeline(self.analyzer, tagger=self.tagger, chunker=self.chunker, cache=cache)
+
+    def test_repeated_utterance_skips_every_stage(self):
+        pipeline = self.pipeline(LRUCache(max_bytes=1 << 20))
+        first = pipeline.describe("Alice runs. Bob walks.")
+        second = pipeline.describe("Alice runs. Bob walks.")
+        self.assertEqual(second, first)
+        self.assertEqual((self.tagger.batches, self.chunker.batches), ([2], [2]))
+        self.assertEqual((self.analyzer.calls, self.split_calls), (2, 1))
+        self.assertEqual(pipeline.cache.stats()['hits'], 3)
+
+    def test_known_sentence_in_a_new_utterance(self):
+        pipeline = self.pipeline(LRUCache(max_bytes=1 << 20))
+        pipeline.describe("Alice runs.")
+        result = pipeline.describe("Carol sings.  Alice   runs.")
+        self.assertEqual(self.tagger.batches, [1, 1])
+        self.assertIn("\nAnalysing sentence 2: Alice   runs.", result)
+        self.assertIn("Named entities: PERSON: Alice", result)
+
+    def test_failures_are_not_cached(self):
+        class Flaky(FakeChunker):
+            broken = True
+
+            def parse(self, tagged):
+                if self.broken:
+                    raise RuntimeError("no model")
+                return super().parse(tagged)
+        self.chunker = Flaky()
+        pipeline = self.pipeline(LRUCache())
+        self.assertIn("Note: Named entity recognition unavailable.", pipeline.describe("Alice runs."))
+        self.chunker.broken = False
+        self.assertIn("Named entities: PERSON: Alice", pipeline.describe("Alice runs."))
+
+    def test_results_survive_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'analysis.sqlite')
+            cache = LRUCache(path=path)
+            first = self.pipeline(cache).describe("Alice runs. Bob walks.")
+            cache.close()
+            cache = LRUCache(path=path)
+            self.assertEqual(self.pipeline(cache).describe("Alice runs. Bob walks."), first)
+            self.assertEqual(self.tagger.batches, [2])
+            self.assertEqual(cache.stats()['disk_hits'], 3)
+            cache.close()
+
+
+def _legacy_describe(text, analyzer):
+    """The per-sentence process_text loop AnalysisPipeline replaced."""
+    description = []
+    sentences = nltk.sent_tokenize(text)
+    description.append(f"Number of sentences: {len(sentences)}")
+    for i, sentence in enumerate(sentences, 1):
+        description.append(f"\nAnalysing sentence {i}: {sentence}")
+        tagged = nltk.pos_tag(nltk.word_tokenize(sentence))
+        word_types = {}
+        for word, tag in tagged:
+            if tag in POS_DESCRIPTIONS:
+                word_types.setdefault(POS_DESCRIPTIONS[tag], []).append(word)
+        for category, words in word_types.items():
+            description.append(f"{category}: {', '.join(words)}")
+        entities = [f"{chunk.label()}: {' '.join(c[0] for c in chunk)}"
+                    for chunk in nltk.ne_chunk(tagged) if hasattr(chunk, 'label')]
+        if entities:
+            description.append(f"Named entities: {', '.join(entities)}")
+        scores = analyzer.polarity_scores(sentence)
+        c = scores['compound']
+        label = "positive" if c >= 0.05 else ("negative" if c <= -0.05 else "neutral")
+        description.append(f"Sentiment: {label} (compound={c:.2f}, pos={scores['pos']:.2f}, "
+                           f"neg={scores['neg']:.2f}, neu={scores['neu']:.2f})")
+    return description
+
+
+@unittest.skipUnless(_nltk_data_available(), "NLTK data not downloaded")
+class TestParityWithNltk(unittest.TestCase):
+
+    def test_same_descriptions_as_per_sentence_code(self):
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        analyzer = SentimentIntensityAnalyzer()
+        pipeline = AnalysisPipeline(analyzer)
+        for text in ("John went to New Delhi yesterday. He loved it!",
+                     "The medicine is not working and I feel terrible.",
+                     "Call Priya at 5 pm."):
+            self.assertEqual(pipeline.describe(text), _legacy_describe(text, analyzer))
+
+
+if __name__ == '__main__':
+    unittest.main()
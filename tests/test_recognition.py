@@ -0,0 +1,74 @@
+"""Tests for concurrent bilingual recognition with a scripted local backend."""
+import time
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from visual_assistant import recognition
+from visual_assistant.recognition import ScriptedRecognizer, recognize_bilingual
+
+
+class UnknownValueError(Exception):
+    pass
+
+
+class RequestError(Exception):
+    pass
+
+
+FAKE_SR = types.SimpleNamespace(UnknownValueError=UnknownValueError, RequestError=RequestError)
+
+
+class TestRecognizeBilingual(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.object(recognition, 'sr', FAKE_SR)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_english_speaker_pays_one_round_trip_not_two(self):
+        backend = ScriptedRecognizer({'hi-IN': 'hello there', 'en-US': 'hello there'}, latency=0.2)
+        start = time.perf_counter()
+        result = recognize_bilingual(backend, b'audio', self.pool)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result, ('hello there', False))
+        self.assertLess(elapsed, 0.35)  # sequential attempts would take 0.4 s
+
+    def test_hindi_wins_without_waiting_for_english(self):
+        backend = ScriptedRecognizer({'hi-IN': 'नमस्ते', 'en-US': 'namaste'},
+                                     latency={'hi-IN': 0.05, 'en-US': 0.4})
+        start = time.perf_counter()
+        result = recognize_bilingual(backend, b'audio', self.pool)
+        self.assertEqual(result, ('नमस्ते', True))
+        self.assertLess(time.perf_counter() - start, 0.3)
+
+    def test_fast_english_still_waits_for_hindi_verdict(self):
+        backend = ScriptedRecognizer({'hi-IN': 'नमस्ते', 'en-US': 'namaste'},
+                                     latency={'hi-IN': 0.1, 'en-US': 0.0})
+        self.assertEqual(recognize_bilingual(backend, b'audio', self.pool), ('नमस्ते', True))
+
+    def test_nothing_understood(self):
+        backend = ScriptedRecognizer({})
+        with self.assertRaises(UnknownValueError):
+            recognize_bilingual(backend, b'audio', self.pool)
+
+    def test_service_error_only_when_no_language_succeeds(self):
+        backend = ScriptedRecognizer({'hi-IN': RequestError('quota'), 'en-US': 'fine'})
+        self.assertEqual(recognize_bilingual(backend, b'audio', self.pool), ('fine', False))
+        backend = ScriptedRecognizer({'hi-IN': RequestError('quota')})
+        with self.assertRaises(RequestError):
+            recognize_bilingual(backend, b'audio', self.pool)
+
+    def test_deadline(self):
+        backend = ScriptedRecognizer({'hi-IN': 'नमस्ते'}, latency=0.5)
+        start = time.perf_counter()
+        with self.assertRaises(RequestError):
+            recognize_bilingual(backend, b'audio', self.pool, deadline=0.1)
+        self.assertLess(time.perf_counter() - start, 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
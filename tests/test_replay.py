@@ -0,0 +1,159 @@
+"""
+Tests for the audio-file replay harness, with a stubbed recognizer and no audio hardware.
+"""
+import json
+import os
+import tempfile
+import time
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import audio as audio_module, recognition, replay, visually
+from visual_assistant.recognition import ScriptedRecognizer
+from visual_assistant.replay import TranscriptRecognizer, load_items, word_error_rate
+
+from test_audio import FakeAudio, pcm16, utterance
+
+
+class UnknownValueError(Exception):
+    pass
+
+
+class RequestError(Exception):
+    pass
+
+
+class WaitTimeoutError(Exception):
+    pass
+
+
+FAKE_SR = types.SimpleNamespace(
+    UnknownValueError=UnknownValueError, RequestError=RequestError,
+    WaitTimeoutError=WaitTimeoutError, Recognizer=MagicMock, Microphone=MagicMock,
+)
+
+
+def fake_loader(path):
+    return types.SimpleNamespace(path=path)
+
+
+class TestLoadItems(unittest.TestCase):
+
+    def test_directory_with_sidecar_transcripts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, text in (('a.wav', 'hello there'), ('b.flac', 'नमस्ते दुनिया')):
+                open(os.path.join(tmp, name), 'wb').close()
+                with open(os.path.join(tmp, os.path.splitext(name)[0] + '.txt'), 'w', encoding='utf-8') as fh:
+                    fh.write(text + '\n')
+            open(os.path.join(tmp, 'orphan.wav'), 'wb').close()
+
+            items = load_items(tmp)
+        self.assertEqual([os.path.basename(i.path) for i in items], ['a.wav', 'b.flac'])
+        self.assertEqual(items[0].transcript, 'hello there')
+        self.assertEqual([i.is_hindi for i in items], [False, True])
+
+    def test_manifest_paths_are_relative_to_it(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = os.path.join(tmp, 'manifest.jsonl')
+            with open(manifest, 'w', encoding='utf-8') as fh:
+                fh.write(json.dumps({'audio': 'clips/one.wav', 'transcript': 'namaste', 'language': 'hi'}) + '\n')
+                fh.write('not json\n')
+            items = load_items(manifest)
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0].path, os.path.join(tmp, 'clips/one.wav'))
+        self.assertTrue(items[0].is_hindi)
+
+
+class TestWordErrorRate(unittest.TestCase):
+
+    def test_identical_ignoring_case_and_punctuation(self):
+        self.assertEqual(word_error_rate("Hello, there!", "hello there"), 0.0)
+
+    def test_substitution_and_deletion(self):
+        self.assertAlmostEqual(word_error_rate("call the doctor now", "call a doctor"), 0.5)
+
+    def test_empty_hypothesis(self):
+        self.assertEqual(word_error_rate("call the doctor", ""), 1.0)
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        for module in (visually, recognition, replay):
+            patcher = patch.object(module, 'sr', FAKE_SR)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.assistant.engine = None
+        self.addCleanup(self.assistant.speech.close)
+        self.assistant.store_in_firebase = MagicMock(return_value=True)
+        patcher = patch.object(self.assistant.pipeline, 'describe',
+                               side_effect=lambda text, is_hindi=False: [f"\nAnalysing sentence 1: {text}"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.items = [
+            replay._item('en1.wav', 'call the doctor'),
+            replay._item('hi1.wav', 'डॉक्टर को फोन करो'),
+            replay._item('en2.wav', 'take the medicine'),
+            replay._item('hi2.wav', 'दवा लो'),
+        ]
+
+    def test_stub_recognizer_replays_every_file_through_the_pipeline(self):
+        self.assistant.recognizer_backend = TranscriptRecognizer()
+        with patch('sys.stdout'):
+            report = replay.replay(self.assistant, self.items, workers=2, audio_loader=fake_loader)
+        results = report['results']
+        self.assertEqual([r['recognised'] for r in results], [i.transcript for i in self.items])
+        self.assertEqual([r['is_hindi'] for r in results], [False, True, False, True])
+        self.assertTrue(all(r['language_ok'] and r['wer'] == 0.0 for r in results))
+        self.assertEqual(self.assistant.store_in_firebase.call_count, 4)
+        summary = report['summary']
+        self.assertEqual((summary['files'], summary['errors'], summary['mean_wer']), (4, 0, 0.0))
+        for key in ('load_ms', 'recognize_ms', 'process_ms', 'store_ms', 'total_ms'):
+            self.assertIn(key, results[0])
+
+    @unittest.skipUnless(audio_module.numpy_available(), "numpy missing")
+    def test_preprocessed_pcm_is_still_recognised(self):
+        self.assertTrue(self.assistant.preprocessor.enabled)
+        self.assistant.recognizer_backend = TranscriptRecognizer()
+
+        def loader(path):
+            return FakeAudio(pcm16(utterance(44100)), 44100, 2)
+
+        with patch('sys.stdout'):
+            report = replay.replay(self.assistant, self.items, workers=2, audio_loader=loader)
+        self.assertEqual([r['recognised'] for r in report['results']], [i.transcript for i in self.items])
+        self.assertEqual(report['summary']['mean_wer'], 0.0)
+        self.assertEqual(self.assistant.preprocessor.stats()['calls'], 4)
+
+    def test_files_run_in_parallel(self):
+        self.assistant.recognizer_backend = TranscriptRecognizer(latency=0.1)
+        start = time.perf_counter()
+        with patch('sys.stdout'):
+            report = replay.replay(self.assistant, self.items, workers=4, audio_loader=fake_loader)
+        self.assertEqual(report['summary']['errors'], 0)
+        self.assertLess(time.perf_counter() - start, 0.3)  # four files one at a time take 0.4 s
+
+    def test_misrecognition_is_scored(self):
+        self.assistant.recognizer_backend = ScriptedRecognizer({'en-US': 'call a doctor'})
+        with patch('sys.stdout'):
+            report = replay.replay(self.assistant, self.items[:1], audio_loader=fake_loader)
+        result = report['results'][0]
+        self.assertAlmostEqual(result['wer'], 1 / 3, places=3)
+        self.assertTrue(result['language_ok'])
+
+    def test_unreadable_file_is_reported_not_raised(self):
+        self.assistant.recognizer_backend = TranscriptRecognizer()
+
+        def loader(path):
+            raise OSError("bad header")
+
+        report = replay.replay(self.assistant, self.items[:1], audio_loader=loader)
+        self.assertEqual(report['summary']['errors'], 1)
+        self.assertIn('bad header', report['results'][0]['error'])
+        self.assertIn('1 errors', replay.format_report(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
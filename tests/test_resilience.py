@@ -0,0 +1,178 @@
+"""Tests for the circuit breakers and call deadlines."""
+import threading
+import time
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import recognition, visually
+from visual_assistant.recognition import ScriptedRecognizer, recognize_bilingual
+from visual_assistant.resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError,
+                                         DeadlineExceeded, breaker, call_with_deadline)
+from visual_assistant.translation import TranslationBackend
+
+
+class UnknownValue(Exception):
+    pass
+
+
+class ServiceDown(Exception):
+    pass
+
+
+SR = types.SimpleNamespace(UnknownValueError=UnknownValue, RequestError=ServiceDown)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail():
+    raise OSError("down")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.breaker = CircuitBreaker('svc', window=10, failure_rate=0.5, min_calls=4,
+                                      reset_timeout=30.0, clock=self.clock)
+
+    def test_opens_on_failure_rate_and_rejects(self):
+        for ok in (True, False, True, False):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_success() if ok else self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(_fail)
+        self.assertEqual(self.breaker.stats()['rejected'], 1)
+
+    def test_needs_min_calls_before_tripping(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_lets_one_trial_through(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now = 30.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.clock.now = 60.0
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.stats(), {'state': CLOSED, 'failure_rate': 0.0,
+                                                'calls': 1, 'rejected': 1})
+
+    def test_state_is_exported_as_a_gauge(self):
+        with patch.object(visually.METRICS, 'set_gauge') as gauge:
+            for _ in range(4):
+                self.breaker.record_failure()
+        gauge.assert_any_call('circuit_state', 2, service='svc')
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_slow_call_is_abandoned(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        start = time.perf_counter()
+        with self.assertRaises(DeadlineExceeded):
+            call_with_deadline(release.wait, 0.05, 5)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_result_and_errors_pass_through(self):
+        self.assertEqual(call_with_deadline(sum, 1.0, [1, 2]), 3)
+        with self.assertRaises(OSError):
+            call_with_deadline(_fail, 1.0)
+
+
+class SlowBackend(TranslationBackend):
+    remote = True
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def translate_many(self, texts, src='hi', dest='en'):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [text.upper() for text in texts]
+
+
+class TestTranslateFailover(unittest.TestCase):
+
+    def setUp(self):
+        visually._translation_cache.clear()
+        self.addCleanup(visually._translation_cache.clear)
+
+    def test_hung_backend_trips_the_breaker_then_fails_over_at_once(self):
+        backend = SlowBackend(0.5)
+        with patch.object(visually, '_translation_backend', backend), \
+                patch.object(visually, '_translate_deadline', 0.02):
+            for i in range(4):
+                self.assertEqual(visually._safe_translate(f"t{i}"), f"t{i}")
+            self.assertEqual(breaker('translate').state, OPEN)
+            start = time.perf_counter()
+            self.assertEqual(visually._safe_translate("fast"), "fast")
+            self.assertLess(time.perf_counter() - start, 0.01)
+        self.assertEqual(backend.calls, 4)
+
+    def test_cached_translations_still_served_while_open(self):
+        visually._translation_cache.put(("एक", 'hi', 'en'), "one")
+        circuit = breaker('translate')
+        for _ in range(circuit.min_calls):
+            circuit.record_failure()
+        self.assertEqual(visually._safe_translate_many(["एक", "दो"]), ["one", "दो"])
+
+
+class TestRecognitionFailover(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.object(recognition, 'sr', SR)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.pool.shutdown)
+        self.breaker = CircuitBreaker('recognize', min_calls=2)
+
+    def test_open_circuit_raises_without_calling_the_service(self):
+        backend = ScriptedRecognizer({'hi-IN': ServiceDown("503"), 'en-US': ServiceDown("503")})
+        for _ in range(2):
+            with self.assertRaises(ServiceDown):
+                recognize_bilingual(backend, b'', self.pool, breaker=self.breaker)
+        calls = len(backend.calls)
+        with self.assertRaises(ServiceDown):
+            recognize_bilingual(backend, b'', self.pool, breaker=self.breaker)
+        self.assertEqual(len(backend.calls), calls)
+
+    def test_unintelligible_audio_is_not_a_service_failure(self):
+        backend = ScriptedRecognizer({})
+        for _ in range(3):
+            with self.assertRaises(UnknownValue):
+                recognize_bilingual(backend, b'', self.pool, breaker=self.breaker)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_capture_speech_reports_the_outage(self):
+        assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(assistant.speech.close)
+        assistant.recognition_breaker = self.breaker
+        assistant.recognizer_backend = MagicMock()
+        for _ in range(2):
+            self.breaker.record_failure()
+        with patch.object(visually, 'sr', SR), patch.object(assistant, 'speak') as speak:
+            self.assertEqual(assistant.recognize_audio(object()), (None, False))
+        assistant.recognizer_backend.recognize.assert_not_called()
+        speak.assert_called_once_with("Speech recognition service unavailable: still offline")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Tests for structured analysis results and their columnar binary export."""
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import nltk
+
+from visual_assistant import batch, results, visually
+from visual_assistant.pipeline import AnalysisPipeline
+from visual_assistant.results import FAILED, NER_FAILED, AnalysisResult, SentenceRecord
+
+
+class FakeTagger:
+    def tag_sents(self, sents):
+        return [[(t, 'NNP' if t[0].isupper() else ('.' if t == '.' else 'NN')) for t in s]
+                for s in sents]
+
+
+class FakeChunker:
+    def parse_sents(self, sents):
+        return [nltk.Tree('S', [nltk.Tree('PERSON', [s[0]])] + s[1:]) for s in sents]
+
+
+class Analyzer:
+    def polarity_scores(self, text):
+        return {'neg': 0.0, 'neu': 0.4, 'pos': 0.6, 'compound': 0.42}
+
+
+def _sample() -> list:
+    return [
+        AnalysisResult(["Number of sentences: 2"], [
+            SentenceRecord.from_analysis("Alice sings.", [("Alice", 'NNP'), ("sings", 'VBZ'), (".", '.')],
+                                         [("PERSON", "Alice")], Analyzer().polarity_scores("")),
+            SentenceRecord.from_analysis("Odd tag.", [("Odd", 'XYZ'), ("tag", 'NN')], status=NER_FAILED),
+        ]),
+        AnalysisResult(["Note: Basic text analysis failed.", "Words found: x"], sentence_count=0),
+        AnalysisResult(["Number of sentences: 1", "\nAnalysing sentence 1: नमस्ते।",
+                        "Content word: नमस्ते"], sentence_count=1),
+        AnalysisResult(["Number of sentences: 1"], [SentenceRecord("Broken", status=FAILED)]),
+        AnalysisResult(),
+    ]
+
+
+class TestAnalysisResult(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(nltk, sent_tokenize=lambda t: [s.strip() + ' .' for s in t.split('.') if s.strip()],
+                                 word_tokenize=str.split)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pipeline = AnalysisPipeline(Analyzer(), tagger=FakeTagger(), chunker=FakeChunker())
+
+    def test_records_render_the_description_lazily(self):
+        result = self.pipeline.describe("Alice sings. Bob sleeps.")
+        self.assertFalse(result.rendered)
+        self.assertEqual(result.sentence_count, 2)
+        self.assertEqual(result.sentences[0].tokens, ("Alice", "sings", "."))
+        self.assertEqual(result.sentences[0].tags, ('NNP', 'NN', '.'))
+        self.assertEqual(result.sentences[1].entities, (("PERSON", "Bob"),))
+        self.assertEqual(result.sentences[1].sentiment['compound'], 0.42)
+        self.assertEqual(result[:5], [
+            "Number of sentences: 2",
+            "\nAnalysing sentence 1: Alice sings .",
+            "Proper noun, singular: Alice",
+            "Noun, singular: sings",
+            "Named entities: PERSON: Alice",
+        ])
+        self.assertTrue(result.rendered)
+        self.assertEqual(result[5], "Sentiment: positive (compound=0.42, pos=0.60, neg=0.00, neu=0.40)")
+
+    def test_failures_render_their_notes(self):
+        lines = list(_sample()[0]) + list(_sample()[3])
+        self.assertIn("Note: Named entity recognition unavailable.", lines)
+        self.assertIn("Noun, singular: tag", lines)
+        self.assertFalse(any(line.endswith(": Odd") for line in lines))
+        self.assertEqual(lines[-1], "Note: Could not fully analyse sentence 1.")
+
+    def test_pickle_carries_records_not_lines(self):
+        result = _sample()[0]
+        list(result)
+        copy = pickle.loads(pickle.dumps(result))
+        self.assertFalse(copy.rendered)
+        self.assertEqual(copy, result)
+        self.assertEqual(copy.sentences, result.sentences)
+
+
+class TestColumnarExport(unittest.TestCase):
+
+    def test_round_trip_over_several_blocks(self):
+        buffer = io.BytesIO()
+        sample = _sample()
+        results.dump(sample, buffer)
+        results.dump(sample[:2], buffer)
+        buffer.seek(0)
+        loaded = results.load(buffer)
+        self.assertEqual(len(loaded), 7)
+        for got, expected in zip(loaded, sample + sample[:2]):
+            self.assertEqual(got.sentences, expected.sentences)
+            self.assertEqual(got.sentence_count, expected.sentence_count)
+            self.assertEqual(list(got), list(expected))
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            results.load(io.BytesIO(b'{"id": 0}\n'))
+        buffer = io.BytesIO()
+        results.dump(_sample(), buffer)
+        with self.assertRaises(ValueError):
+            results.load(io.BytesIO(buffer.getvalue()[:-3]))
+
+    def test_batch_columns_output(self):
+        class FakePipeline:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def describe_many(self, utterances):
+                return [AnalysisResult([f"Words: {len(text.split())}"]) for text, _ in utterances]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            src, out = os.path.join(tmp, 'in.txt'), os.path.join(tmp, 'out.bin')
+            with open(src, 'w', encoding='utf-8') as fh:
+                fh.write("one\ntwo words\n\nthree more words\n")
+            with patch.object(batch, 'AnalysisPipeline', FakePipeline):
+                count = batch.run_analyze([src], out, workers=1, fmt='columns')
+            with open(out, 'rb') as fh:
+                loaded = results.load(fh)
+        self.assertEqual(count, 3)
+        self.assertEqual([list(r) for r in loaded], [["Words: 1"], ["Words: 2"], ["Words: 3"]])
+
+
+class TestStorageUsesSentenceCount(unittest.TestCase):
+
+    def test_sentence_count_read_without_rendering(self):
+        assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(assistant.speech.close)
+        assistant._firebase_writer = MagicMock()
+        result = _sample()[0]
+        with patch.object(visually, 'FIREBASE_ENABLED', True):
+            self.assertTrue(assistant.store_in_firebase({'raw_text': "Alice sings.", 'processed': result}))
+            assistant.store_in_firebase({'processed': ["\nAnalysing sentence 1: x"]})
+        self.assertFalse(result.rendered)
+        counts = [call.args[0]['sentence_count'] for call in assistant._firebase_writer.submit.call_args_list]
+        self.assertEqual(counts, [2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
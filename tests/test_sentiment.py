@@ -0,0 +1,167 @@
+"""
+Tests for BatchSentimentScorer: parity with nltk's polarity_scores on a
+small synthetic lexicon (the real VADER lexicon isn't needed).
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import nltk
+
+from visual_assistant import sentiment
+from visual_assistant.pipeline import AnalysisPipeline
+
+try:
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+except ImportError:  # pragma: no cover
+    SentimentIntensityAnalyzer = None
+
+LEXICON = {
+    'good': 1.9, 'great': 3.1, 'happy': 2.7, 'love': 3.2, 'nice': 1.8, 'fun': 2.3,
+    'bad': -2.5, 'terrible': -2.1, 'sad': -2.1, 'hate': -2.7, 'pain': -2.3,
+    'sick': -2.3, 'okay': 0.9, 'hurt': -2.4, 'zero': 0.0, 'kind': 2.4, 'lol': 2.9,
+}
+
+CORPUS = [
+    "The food is good.",
+    "The food is GOOD and the service is okay.",
+    "The food is very good!!",
+    "The food is VERY good, but the staff is terrible.",
+    "I am not happy.",
+    "I don't love this place.",
+    "It isn't really that bad.",
+    "I was never so happy.",
+    "It was never this bad at all.",
+    "This is so good.",
+    "He is the least happy person.",
+    "At least it is nice.",
+    "Least fun of all.",
+    "The very least happy moment.",
+    "She is kind of sad today.",
+    "It's sort of nice, I guess.",
+    "He is a kind man.",
+    "I have been under the weather and sick.",
+    "That was a bad ass party, lol!",
+    "You are the bomb and that is good.",
+    "It is the kiss of death for a good plan.",
+    "Yeah right, that is great.",
+    "Good good good, bad bad.",
+    "Good and not good and good.",
+    "Really? Are you happy??",
+    "Why so sad???? Happy now!!!!!",
+    "HAPPY happy HAPPY sad.",
+    "ALL CAPS GREAT.",
+    "I extremely hate the pain.",
+    "He hardly hurt anyone, but it was still bad.",
+    "Great, :) the, trip,was 'fun'.",
+    "BUT it was okay.",
+    "zero zero okay",
+    "",
+    "a b c",
+    "Not bad, not bad at all, but NOT great either!",
+    "kind of kind of good",
+]
+
+
+def _lexicon_file(directory: str) -> str:
+    path = os.path.join(directory, 'lexicon.txt')
+    # nltk's lexicon parser can't cope with a trailing newline.
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write('\n'.join(f"{word}\t{value}\t0.5\t[1, 2]" for word, value in LEXICON.items()))
+    return path
+
+
+@unittest.skipUnless(sentiment.numpy_available() and SentimentIntensityAnalyzer,
+                     "numpy or nltk missing")
+class TestBatchSentimentScorer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(tmp.cleanup)
+        cls.analyzer = SentimentIntensityAnalyzer(lexicon_file='file:' + _lexicon_file(tmp.name))
+        cls.scorer = sentiment.BatchSentimentScorer.from_analyzer(cls.analyzer)
+
+    def assertScoresClose(self, got, expected, text):
+        self.assertEqual(set(got), set(expected))
+        for key in expected:
+            self.assertAlmostEqual(got[key], expected[key], delta=1e-3, msg=f"{key} for {text!r}")
+
+    def test_batch_matches_polarity_scores(self):
+        batch = self.scorer.polarity_scores_many(CORPUS)
+        self.assertEqual(len(batch), len(CORPUS))
+        for text, got in zip(CORPUS, batch):
+            self.assertScoresClose(got, self.analyzer.polarity_scores(text), text)
+
+    def test_single_text_matches(self):
+        for text in CORPUS:
+            self.assertScoresClose(self.scorer.polarity_scores(text),
+                                   self.analyzer.polarity_scores(text), text)
+
+    def test_scores_do_not_depend_on_batch_neighbours(self):
+        alone = self.scorer.polarity_scores_many(["I am not happy."])
+        mixed = self.scorer.polarity_scores_many(["BAD BAD", "I am not happy.", "Very good!"])
+        self.assertEqual(alone[0], mixed[1])
+
+    def test_empty_batch(self):
+        self.assertEqual(self.scorer.polarity_scores_many([]), [])
+        self.assertEqual(self.scorer.polarity_scores_many(["", "?"]),
+                         [{'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}] * 2)
+
+
+@unittest.skipUnless(sentiment.numpy_available(), "numpy missing")
+class TestPipelineUsesBatchScorer(unittest.TestCase):
+
+    class Analyzer:
+        lexicon = {'good': 1.9, 'bad': -2.5}
+
+        def __init__(self):
+            from nltk.sentiment.vader import VaderConstants
+            self.constants = VaderConstants()
+            self.calls = 0
+
+        def polarity_scores(self, text):
+            self.calls += 1
+            return {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}
+
+    def setUp(self):
+        patcher = patch.multiple(nltk, sent_tokenize=lambda t: [s.strip() + '.' for s in t.split('.') if s.strip()],
+                                 word_tokenize=str.split)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tagger = type('Tagger', (), {'tag_sents': lambda self, sents: [[(w, 'NN') for w in s] for s in sents]})
+        chunker = type('Chunker', (), {'parse_sents': lambda self, sents: [[] for _ in sents]})
+        self.analyzer = self.Analyzer()
+        self.pipeline = AnalysisPipeline(self.analyzer, tagger=tagger(), chunker=chunker())
+
+    def test_several_sentences_are_scored_in_one_batch(self):
+        with patch.object(sentiment.BatchSentimentScorer, 'polarity_scores_many',
+                          autospec=True, side_effect=lambda self, texts: [
+                              {'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.5} for _ in texts]) as batch:
+            result = self.pipeline.describe("It is good. It is bad.")
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(self.analyzer.calls, 0)
+        self.assertEqual(sum(line.startswith("Sentiment: positive") for line in result), 2)
+
+    def test_single_sentence_uses_the_analyser(self):
+        self.pipeline.describe("It is good.")
+        self.assertEqual(self.analyzer.calls, 1)
+
+    def test_batch_failure_falls_back_to_the_analyser(self):
+        with patch.object(sentiment.BatchSentimentScorer, 'polarity_scores_many',
+                          side_effect=ValueError("boom")):
+            self.pipeline.describe("It is good. It is bad.")
+        self.assertEqual(self.analyzer.calls, 2)
+
+    def test_scorer_construction_failure_falls_back_to_the_analyser(self):
+        with patch.object(sentiment.BatchSentimentScorer, 'from_analyzer',
+                          side_effect=TypeError("malformed lexicon")) as build:
+            self.pipeline.describe("It is good. It is bad.")
+            self.pipeline.describe("It is good. It is bad.")
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(self.analyzer.calls, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
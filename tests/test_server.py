@@ -0,0 +1,284 @@
+"""
+Tests for the asyncio analysis server, on localhost with a fake pipeline
+analysing on one in-process thread.
+"""
+import asyncio
+import base64
+import json
+import os
+import struct
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+from visual_assistant import recognition, server
+from visual_assistant.recognition import ScriptedRecognizer
+from visual_assistant.server import AnalysisServer, ws_frame, ws_mask
+
+
+class UnknownValueError(Exception):
+    pass
+
+
+class RequestError(Exception):
+    pass
+
+
+FAKE_SR = types.SimpleNamespace(UnknownValueError=UnknownValueError, RequestError=RequestError)
+
+
+class FakePipeline:
+    """Stands in for AnalysisPipeline so these tests don't need NLTK data."""
+
+    delay = 0.0
+
+    def describe(self, text, is_hindi=False):
+        if self.delay:
+            time.sleep(self.delay)
+        return [f"Words: {len(text.split())}", f"Hindi: {is_hindi}"]
+
+
+def decode_chunked(body: bytes) -> bytes:
+    out = b''
+    while body:
+        size, _, rest = body.partition(b'\r\n')
+        size = int(size, 16)
+        if not size:
+            break
+        out += rest[:size]
+        body = rest[size + 2:]
+    return out
+
+
+class ServerTestCase(unittest.IsolatedAsyncioTestCase):
+
+    per_client = 2
+    recognizer_backend = None
+
+    async def asyncSetUp(self):
+        for module in (server, recognition):
+            patcher = patch.object(module, 'sr', FAKE_SR)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        FakePipeline.delay = 0.0
+        self.server = AnalysisServer(port=0, workers=0, per_client=self.per_client,
+                                     pipeline_factory=FakePipeline,
+                                     recognizer_backend=self.recognizer_backend,
+                                     audio_loader=lambda data: data)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def request(self, method, path, body=b'', headers=None):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        for name, value in (headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        writer.write(head.encode() + b'\r\n' + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        status = int(head.split()[1])
+        if b'chunked' in head:
+            body = decode_chunked(body)
+        return status, body
+
+    async def analyze(self, utterances, headers=None):
+        body = '\n'.join(json.dumps(u, ensure_ascii=False) for u in utterances).encode()
+        status, body = await self.request('POST', '/analyze', body, headers)
+        self.assertEqual(status, 200)
+        return [json.loads(line) for line in body.decode().splitlines()]
+
+
+class TestHttp(ServerTestCase):
+
+    async def test_health(self):
+        status, body = await self.request('GET', '/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['status'], 'ok')
+
+    async def test_single_utterance_streams_lines_then_done(self):
+        replies = await self.analyze([{'text': "hello there friend"}])
+        self.assertEqual(replies, [
+            {'id': 0, 'line': "Words: 3"},
+            {'id': 0, 'line': "Hindi: False"},
+            {'id': 0, 'done': True, 'text': "hello there friend", 'is_hindi': False},
+        ])
+
+    async def test_ndjson_batch_keeps_order_and_detects_hindi(self):
+        replies = await self.analyze([{'text': f"word {i}"} for i in range(5)] + [{'text': "नमस्ते"}])
+        done = [r for r in replies if r.get('done')]
+        self.assertEqual([r['id'] for r in done], list(range(6)))
+        self.assertTrue(done[-1]['is_hindi'])
+
+    async def test_first_lines_arrive_before_the_batch_finishes(self):
+        FakePipeline.delay = 0.2
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        body = '\n'.join(json.dumps({'text': f"u {i}"}) for i in range(4)).encode()
+        start = time.perf_counter()
+        writer.write(b"POST /analyze HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await reader.readuntil(b'\r\n\r\n')
+        await reader.readuntil(b'"id": 0')
+        first = time.perf_counter() - start
+        await reader.read()
+        total = time.perf_counter() - start
+        writer.close()
+        self.assertLess(first, total / 2)
+
+    async def test_bad_requests(self):
+        status, body = await self.request('POST', '/analyze', b'not json')
+        self.assertEqual(status, 400)
+        self.assertIn('error', json.loads(body))
+        status, _ = await self.request('GET', '/analyze')
+        self.assertEqual(status, 405)
+        status, _ = await self.request('GET', '/nope')
+        self.assertEqual(status, 404)
+        replies = await self.analyze([{'text': ""}, {'text': "fine"}])
+        self.assertEqual(replies[0], {'id': 0, 'error': "'text' must be a non-empty string"})
+        self.assertTrue(replies[-1]['done'])
+
+    async def test_oversized_body_is_rejected(self):
+        self.server.max_body = 10
+        status, _ = await self.request('POST', '/analyze', b'{"text": "far too long"}')
+        self.assertEqual(status, 413)
+
+    async def test_audio_disabled_without_a_recognizer(self):
+        status, body = await self.request('POST', '/analyze', b'RIFF', {'Content-Type': 'audio/wav'})
+        self.assertEqual(json.loads(body.decode().splitlines()[0])['error'],
+                         "audio input is not enabled on this server")
+
+
+class TestLimits(ServerTestCase):
+
+    per_client = 2
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.in_flight = {}
+        self.peak = {}
+        analyse = self.server._analyse
+
+        async def counting(uid, item):
+            client = item['client']
+            self.in_flight[client] = self.in_flight.get(client, 0) + 1
+            self.peak[client] = max(self.peak.get(client, 0), self.in_flight[client])
+            await asyncio.sleep(0.05)
+            try:
+                return await analyse(uid, item)
+            finally:
+                self.in_flight[client] -= 1
+        self.server._analyse = counting
+
+    async def test_in_flight_utterances_are_capped_per_client(self):
+        batches = [self.analyze([{'text': "x", 'client': name}] * 6, {'X-Client-Id': name})
+                   for name in ('kiosk-a', 'kiosk-b')]
+        # Two connections from the same client share its slots.
+        batches.append(self.analyze([{'text': "y", 'client': 'kiosk-a'}] * 6, {'X-Client-Id': 'kiosk-a'}))
+        results = await asyncio.gather(*batches)
+        self.assertEqual(self.peak, {'kiosk-a': 2, 'kiosk-b': 2})
+        self.assertTrue(all(sum(1 for r in replies if r.get('done')) == 6 for replies in results))
+        self.assertEqual(self.server.health()['clients'], 0)
+
+
+class TestAudio(ServerTestCase):
+
+    recognizer_backend = ScriptedRecognizer({'hi-IN': "नमस्ते दुनिया"})
+
+    async def test_audio_is_recognised_then_analysed(self):
+        status, body = await self.request('POST', '/analyze', b'RIFF....', {'Content-Type': 'audio/wav'})
+        self.assertEqual(status, 200)
+        replies = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(replies[-1], {'id': 0, 'done': True, 'text': "नमस्ते दुनिया", 'is_hindi': True})
+        self.assertIn({'id': 0, 'line': "Hindi: True"}, replies)
+
+
+class TestWebSocket(ServerTestCase):
+
+    recognizer_backend = ScriptedRecognizer({'en-US': "good morning"})
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write(("GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                      "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        head = await reader.readuntil(b'\r\n\r\n')
+        self.assertIn(b'101 Switching Protocols', head)
+        self.addCleanup(writer.close)
+        return reader, writer
+
+    @staticmethod
+    async def recv(reader):
+        head = await reader.readexactly(2)
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+        return head[0] & 0x0F, await reader.readexactly(length)
+
+    async def recv_until_done(self, reader):
+        replies = []
+        while True:
+            opcode, payload = await self.recv(reader)
+            self.assertEqual(opcode, 0x1)
+            replies.append(json.loads(payload))
+            if replies[-1].get('done') or 'error' in replies[-1]:
+                return replies
+
+    async def test_text_and_audio_messages(self):
+        reader, writer = await self.connect()
+        writer.write(ws_frame(0x1, json.dumps({'text': "one two"}).encode(), mask=b'abcd'))
+        replies = await self.recv_until_done(reader)
+        self.assertEqual(replies[0], {'id': 0, 'line': "Words: 2"})
+
+        writer.write(ws_frame(0x2, b'RIFF', mask=b'wxyz'))
+        replies = await self.recv_until_done(reader)
+        self.assertEqual(replies[-1]['text'], "good morning")
+        self.assertEqual(replies[-1]['id'], 1)
+
+        writer.write(ws_frame(0x8, struct.pack('!H', 1000), mask=b'abcd'))
+        opcode, _ = await self.recv(reader)
+        self.assertEqual(opcode, 0x8)
+
+    async def test_ping_and_fragmented_message(self):
+        reader, writer = await self.connect()
+        writer.write(ws_frame(0x9, b'hi', mask=b'abcd'))
+        self.assertEqual(await self.recv(reader), (0xA, b'hi'))
+        message = json.dumps({'text': "a b c"}).encode()
+        first = bytearray(ws_frame(0x1, message[:5], mask=b'abcd'))
+        first[0] &= 0x7F                                   # not final
+        writer.write(bytes(first) + ws_frame(0x0, message[5:], mask=b'efgh'))
+        replies = await self.recv_until_done(reader)
+        self.assertEqual(replies[0]['line'], "Words: 3")
+
+    async def test_unmasked_frame_closes_with_protocol_error(self):
+        reader, writer = await self.connect()
+        writer.write(ws_frame(0x1, json.dumps({'text': "a b"}).encode()))
+        self.assertEqual(await self.recv(reader), (0x8, struct.pack('!H', 1002)))
+
+    def test_mask_round_trip(self):
+        payload = os.urandom(1 << 20) + b'tail'
+        masked = ws_mask(payload, b'\x01\x02\x03\x04')
+        self.assertEqual(masked[:4], bytes(b ^ m for b, m in zip(payload[:4], b'\x01\x02\x03\x04')))
+        self.assertEqual(ws_mask(masked, b'\x01\x02\x03\x04'), payload)
+        self.assertEqual(ws_mask(b'', b'abcd'), b'')
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def test_process_pool_preloads_once_per_worker(self):
+        async def run():
+            srv = AnalysisServer(port=0, workers=2, pipeline_factory=FakePipeline)
+            await srv.start()
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(srv._pool, server._describe, "a b", False)
+            finally:
+                await srv.close()
+        self.assertEqual(asyncio.run(run()), ["Words: 2", "Hindi: False"])
+
+
+if __name__ == '__main__':
+    unittest.main()
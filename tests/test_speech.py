@@ -0,0 +1,187 @@
+"""Tests for the asynchronous speech queue, using a fake TTS engine."""
+import threading
+import time
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import visually
+from visual_assistant.speech import PRIORITY_HIGH, PRIORITY_LOW, SpeechQueue
+
+
+class FakeEngine:
+    """Mimics the pyttsx3 engine API with a simulated speaking delay."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.spoken = []
+        self.runs = 0
+        self.stops = 0
+        self._batch = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self._batch.append(text)
+
+    def runAndWait(self):
+        time.sleep(self.delay * len(self._batch))
+        self.spoken.extend(self._batch)
+        self._batch = []
+        self.runs += 1
+
+    def stop(self):
+        self.stops += 1
+
+
+def _engine_batch(engine):
+    def speak_batch(texts):
+        for text in texts:
+            engine.say(text)
+        engine.runAndWait()
+    return speak_batch
+
+
+class TestSpeechQueue(unittest.TestCase):
+
+    def test_say_does_not_wait_for_playback(self):
+        engine = FakeEngine(delay=0.05)
+        sq = SpeechQueue(_engine_batch(engine))
+        start = time.perf_counter()
+        for i in range(10):
+            sq.say(f"line {i}")
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(sq.flush(timeout=5))
+        self.assertEqual(engine.spoken, [f"line {i}" for i in range(10)])
+        sq.close()
+
+    def test_back_to_back_lines_are_coalesced(self):
+        engine = FakeEngine(delay=0.01)
+        gate = threading.Event()
+
+        def speak_batch(texts):
+            gate.wait(2)
+            _engine_batch(engine)(texts)
+
+        sq = SpeechQueue(speak_batch, max_batch=8)
+        for i in range(9):
+            sq.say(f"line {i}")
+        gate.set()
+        sq.flush(timeout=5)
+        # First line is picked up alone; the rest are coalesced into one run.
+        self.assertEqual(engine.runs, 2)
+        self.assertEqual(len(engine.spoken), 9)
+        sq.close()
+
+    def test_high_priority_jumps_the_queue(self):
+        gate = threading.Event()
+        order = []
+
+        def speak_batch(texts):
+            gate.wait(2)
+            order.extend(texts)
+
+        sq = SpeechQueue(speak_batch, max_batch=1)
+        sq.say("blocker")
+        time.sleep(0.05)
+        sq.say("filler", PRIORITY_LOW)
+        sq.say("normal")
+        sq.say("urgent", PRIORITY_HIGH)
+        gate.set()
+        sq.flush(timeout=5)
+        self.assertEqual(order, ["blocker", "urgent", "normal", "filler"])
+        sq.close()
+
+    def test_cancel_drops_stale_output_and_stops_engine(self):
+        engine = FakeEngine(delay=0.05)
+        sq = SpeechQueue(_engine_batch(engine), on_cancel=engine.stop, max_batch=1)
+        for i in range(20):
+            sq.say(f"stale {i}")
+        time.sleep(0.02)
+        dropped = sq.cancel()
+        sq.say("fresh")
+        sq.flush(timeout=5)
+        self.assertGreater(dropped, 0)
+        self.assertEqual(engine.stops, 1)
+        self.assertEqual(engine.spoken[-1], "fresh")
+        self.assertLess(len(engine.spoken), 20)
+        sq.close()
+
+    def test_idle_work_runs_between_utterances(self):
+        engine = FakeEngine(delay=0.01)
+        work = list(range(5))
+        done = []
+
+        def on_idle():
+            if work:
+                done.append(work.pop(0))
+            return bool(work)
+
+        sq = SpeechQueue(_engine_batch(engine), on_idle=on_idle, idle_interval=0.01)
+        sq.say("hello")
+        sq.flush(timeout=5)
+        deadline = time.monotonic() + 2
+        while work and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(done, [0, 1, 2, 3, 4])
+        self.assertEqual(engine.spoken, ["hello"])
+        sq.close()
+
+
+class TestAssistantSpeech(unittest.TestCase):
+
+    def _assistant(self, engine):
+        with patch.object(visually.pyttsx3, 'init', return_value=engine):
+            return visually.VisuallyImpairedAssistant()
+
+    def test_process_text_overlaps_with_playback(self):
+        engine = FakeEngine(delay=0.05)
+        assistant = self._assistant(engine)
+        lines = [f"Line {i}" for i in range(10)]
+        with patch.object(assistant.pipeline, 'describe', return_value=lines):
+            start = time.perf_counter()
+            result = assistant.process_text("hello world")
+            elapsed = time.perf_counter() - start
+        self.assertEqual(result, lines)
+        self.assertLess(elapsed, 0.25)  # speaking all ten would take 0.5 s
+        assistant.speech.flush(timeout=5)
+        self.assertEqual(engine.spoken[-10:], lines)
+        self.assertLess(engine.runs, 10)
+        assistant.speech.close()
+
+    def test_barge_in_listens_while_speaking(self):
+        engine = FakeEngine(delay=0.2)
+        with patch.dict(os.environ, {'VA_BARGE_IN': '1'}):
+            assistant = self._assistant(engine)
+        self.addCleanup(assistant.speech.close)
+        self.assertTrue(assistant.barge_in)
+        assistant.calibrator = MagicMock(needs_full=False)
+        busy = []
+        assistant.recognizer.listen = lambda source, **kwargs: busy.append(assistant.speech.busy)
+        with patch.object(assistant, 'recognize_audio', return_value=(None, False)):
+            assistant.capture_speech()
+        self.assertEqual(busy, [True])
+
+        with patch.object(visually, 'StreamingPipeline') as pipeline:
+            assistant.streaming_pipeline()
+        self.assertNotIn('gate', pipeline.call_args.kwargs)
+
+    def test_without_barge_in_output_finishes_first(self):
+        assistant = self._assistant(FakeEngine(delay=0.01))
+        self.addCleanup(assistant.speech.close)
+        self.assertFalse(assistant.barge_in)
+        assistant.calibrator = MagicMock(needs_full=False)
+        busy = []
+        assistant.recognizer.listen = lambda source, **kwargs: busy.append(assistant.speech.busy)
+        with patch.object(assistant, 'recognize_audio', return_value=(None, False)):
+            assistant.capture_speech()
+        self.assertEqual(busy, [False])
+
+        with patch.object(visually, 'StreamingPipeline') as pipeline:
+            assistant.streaming_pipeline()
+        self.assertIn('gate', pipeline.call_args.kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for lazy imports, background model warm-up and the startup profiler."""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from visual_assistant.startup import ModelWarmup, StartupProfiler
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_does_not_pull_in_heavy_dependencies(self):
+        code = (
+            "import sys, visual_assistant.visually; "
+            "print(sorted(m for m in ('nltk', 'speech_recognition', 'pyttsx3', 'colorama', 'numpy') "
+            "if m in sys.modules))"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC)
+        with tempfile.TemporaryDirectory() as tmp:  # the module writes its log to cwd
+            out = subprocess.run([sys.executable, '-c', code], env=env, cwd=tmp,
+                                 capture_output=True, text=True, timeout=60)
+        self.assertEqual(out.returncode, 0, out.stderr)
+        self.assertEqual(out.stdout.strip().splitlines()[-1], '[]')
+
+
+class SlowWarmup(ModelWarmup):
+    LOADERS = {
+        'punkt': lambda: time.sleep(0.1),
+        'tagger': lambda: time.sleep(0.1),
+        'chunker': lambda: time.sleep(0.1),
+        'vader': lambda: 'analyzer',
+    }
+
+
+class TestModelWarmup(unittest.TestCase):
+
+    def test_loaders_run_in_parallel_after_prepare(self):
+        order = []
+        profiler = StartupProfiler()
+        start = time.perf_counter()
+        warmup = SlowWarmup(prepare=lambda: order.append('prepare'), profiler=profiler)
+        self.assertEqual(warmup.result('vader', timeout=5), 'analyzer')
+        warmup.wait(timeout=5)
+        self.assertLess(time.perf_counter() - start, 0.25)  # serial would be 0.3 s
+        names = [r[0] for r in profiler.records()]
+        self.assertEqual(names[0], 'nltk_resources')
+        self.assertIn('load_tagger', names)
+        self.assertEqual(order, ['prepare'])
+
+    def test_failed_load_degrades_to_none(self):
+        class Broken(ModelWarmup):
+            LOADERS = {'vader': lambda: 1 / 0}
+        self.assertIsNone(Broken().result('vader', timeout=5))
+
+    def test_done_callback_fires_once(self):
+        fired = threading.Event()
+        calls = []
+        warmup = SlowWarmup()
+        warmup.add_done_callback(lambda: (calls.append(1), fired.set()))
+        self.assertTrue(fired.wait(5))
+        self.assertEqual(calls, [1])
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def test_report_lists_phases(self):
+        profiler = StartupProfiler()
+        with profiler.phase('assistant_init'):
+            pass
+        profiler.mark('first_prompt')
+        report = profiler.report()
+        self.assertIn('assistant_init', report)
+        self.assertIn('first_prompt', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
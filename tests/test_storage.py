@@ -0,0 +1,106 @@
+"""Tests for the background Firebase writer against an in-process fake db.reference."""
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from visual_assistant.storage import FirebaseWriter, new_entry_key
+
+
+class FakeReference:
+    """Minimal stand-in for firebase_admin.db.Reference."""
+
+    def __init__(self):
+        self.data = {}
+        self.updates = 0
+        self.down = False
+        self.gate = None
+
+    def update(self, values):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.down:
+            raise ConnectionError("backend unreachable")
+        self.updates += 1
+        self.data.update(values)
+
+    def child(self, path):
+        raise AssertionError("writer must use multi-path update(), not child().set()")
+
+
+class TestFirebaseWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.spool = os.path.join(self.tmp.name, 'spool.jsonl')
+
+    def test_keys_never_collide(self):
+        keys = {new_entry_key() for _ in range(5000)}
+        self.assertEqual(len(keys), 5000)
+
+    def test_entries_are_batched_into_multi_path_updates(self):
+        ref = FakeReference()
+        ref.gate = threading.Event()
+        writer = FirebaseWriter(ref, self.spool, batch_size=50)
+        keys = [writer.submit({'word_count': i}) for i in range(30)]
+        ref.gate.set()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(set(ref.data), set(keys))
+        self.assertLessEqual(ref.updates, 2)  # first entry may go alone
+        writer.close()
+
+    def test_spools_when_down_and_drains_after_recovery(self):
+        ref = FakeReference()
+        ref.down = True
+        writer = FirebaseWriter(ref, self.spool, retry_interval=0.05)
+        keys = [writer.submit({'n': i}) for i in range(5)]
+        writer.flush(timeout=5)
+        with open(self.spool, encoding='utf-8') as fh:
+            spooled = [json.loads(line)['key'] for line in fh]
+        self.assertEqual(sorted(spooled), sorted(keys))
+
+        ref.down = False
+        writer._retry_at = 0.0
+        writer.submit({'n': 'after'})
+        writer.flush(timeout=5)
+        writer.close()
+        self.assertTrue(set(keys) <= set(ref.data))
+        self.assertFalse(os.path.exists(self.spool))
+        self.assertFalse(os.path.exists(self.spool + '.draining'))
+        self.assertEqual(writer.stats()['drained'], 5)
+
+    def test_spool_left_by_previous_run_is_drained_on_start(self):
+        with open(self.spool, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps({'key': 'entry_old', 'value': {'n': 1}}) + '\n')
+        ref = FakeReference()
+        writer = FirebaseWriter(ref, self.spool)
+        writer.close()
+        self.assertEqual(ref.data, {'entry_old': {'n': 1}})
+
+    def test_spool_rotation_errors_keep_the_writer_running(self):
+        ref = FakeReference()
+        ref.down = True
+        writer = FirebaseWriter(ref, self.spool, retry_interval=0.05)
+        keys = [writer.submit({'n': i}) for i in range(3)]
+        self.assertTrue(writer.flush(timeout=5))
+
+        ref.down = False
+        writer._retry_at = 0.0
+        with patch('visual_assistant.storage.os.replace', side_effect=PermissionError("read-only")):
+            keys.append(writer.submit({'n': 'during'}))
+            self.assertTrue(writer.flush(timeout=5))
+        self.assertTrue(writer._thread.is_alive())
+        self.assertTrue(os.path.exists(self.spool))
+
+        keys.append(writer.submit({'n': 'after'}))
+        self.assertTrue(writer.flush(timeout=5))
+        writer.close()
+        self.assertEqual(set(ref.data), set(keys))
+        self.assertFalse(os.path.exists(self.spool))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Tests for the streaming capture pipeline, driven from generated WAV files.
+"""
+import os
+import struct
+import tempfile
+import threading
+import time
+import unittest
+import wave
+
+from visual_assistant.streaming import PhraseSegmenter, RingBuffer, StreamingPipeline
+
+RATE = 16000
+CHUNK = 1024
+
+
+def tone(seconds: float, amplitude: int = 3000) -> bytes:
+    n = int(RATE * seconds)
+    return struct.pack(f'<{n}h', *((amplitude if (i // 20) % 2 else -amplitude) for i in range(n)))
+
+
+def silence(seconds: float) -> bytes:
+    return b'\x00\x00' * int(RATE * seconds)
+
+
+def write_wav(path: str, frames: bytes) -> None:
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(frames)
+
+
+class WaveSource:
+    """The sr.AudioFile source shape, over the stdlib wave module."""
+    CHUNK = CHUNK
+
+    def __init__(self, path: str):
+        self._wav = wave.open(path, 'rb')
+        self.SAMPLE_RATE = self._wav.getframerate()
+        self.SAMPLE_WIDTH = self._wav.getsampwidth()
+        self.stream = self
+
+    def read(self, frames: int) -> bytes:
+        return self._wav.readframes(frames)
+
+    def close(self):
+        self._wav.close()
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_wraps_around(self):
+        ring = RingBuffer(8)
+        ring.write(b'abcdef')
+        self.assertEqual(ring.read(4), b'abcd')
+        ring.write(b'ghijk')
+        self.assertEqual(ring.read(7), b'efghijk')
+        self.assertEqual(len(ring), 0)
+
+    def test_overwrites_oldest_when_full(self):
+        ring = RingBuffer(4)
+        ring.write(b'abcdef')
+        self.assertEqual(ring.dropped, 2)
+        self.assertEqual(ring.read(4), b'cdef')
+
+    def test_lossless_writer_waits_for_reader(self):
+        ring = RingBuffer(4, lossless=True)
+        ring.write(b'abcd')
+        writer = threading.Thread(target=ring.write, args=(b'ef',))
+        writer.start()
+        time.sleep(0.05)
+        self.assertTrue(writer.is_alive())
+        self.assertEqual(ring.read(2), b'ab')
+        writer.join(1)
+        self.assertEqual(ring.read(4), b'cdef')
+        self.assertEqual(ring.dropped, 0)
+
+    def test_lossless_write_larger_than_capacity(self):
+        ring = RingBuffer(4, lossless=True)
+        writer = threading.Thread(target=ring.write, args=(b'abcdefghij',), daemon=True)
+        writer.start()
+        received = b''
+        while len(received) < 10:
+            chunk = ring.read(2, timeout=1)
+            self.assertTrue(chunk)
+            received += chunk
+        writer.join(1)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual((received, ring.dropped), (b'abcdefghij', 0))
+
+    def test_close_returns_partial_then_empty(self):
+        ring = RingBuffer(8)
+        ring.write(b'ab')
+        ring.close()
+        self.assertEqual(ring.read(4), b'ab')
+        self.assertEqual(ring.read(4), b'')
+
+
+class TestPhraseSegmenter(unittest.TestCase):
+
+    def frames(self, pcm: bytes):
+        size = CHUNK * 2
+        return [pcm[i:i + size] for i in range(0, len(pcm), size)]
+
+    def test_one_phrase_between_silences(self):
+        seg = PhraseSegmenter(RATE, 2, CHUNK * 2, threshold=300)
+        phrases = [p for f in self.frames(silence(1) + tone(1) + silence(1)) if (p := seg.feed(f))]
+        self.assertEqual(len(phrases), 1)
+        # tone plus pre-roll and the closing pause
+        self.assertGreater(len(phrases[0]), len(tone(1)))
+
+    def test_click_is_discarded(self):
+        seg = PhraseSegmenter(RATE, 2, CHUNK * 2, threshold=300)
+        phrases = [p for f in self.frames(silence(0.5) + tone(0.05) + silence(1)) if (p := seg.feed(f))]
+        self.assertEqual(phrases, [])
+
+    def test_flush_closes_open_phrase(self):
+        seg = PhraseSegmenter(RATE, 2, CHUNK * 2, threshold=300)
+        for f in self.frames(tone(1)):
+            self.assertIsNone(seg.feed(f))
+        self.assertIsNotNone(seg.flush())
+
+
+class TestStreamingPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'three.wav')
+        write_wav(self.path, silence(0.5) + (tone(0.6) + silence(1.0)) * 3)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_pipeline(self, recognize, output=None, **options):
+        source = WaveSource(self.path)
+        outputs = []
+        stream = StreamingPipeline(
+            source,
+            recognize=recognize,
+            analyse=lambda text, is_hindi: [f"analysed {text}"],
+            output=output or (lambda text, is_hindi, lines: outputs.append((text, lines))),
+            audio_factory=lambda frames, rate, width: (frames, rate, width),
+            lossless=True,
+            **options,
+        )
+        stats = stream.run()
+        source.close()
+        return stats, outputs
+
+    def test_every_phrase_reaches_output_in_order(self):
+        count = iter(range(100))
+        stats, outputs = self.run_pipeline(lambda audio: (f"phrase {next(count)}", False))
+        self.assertEqual([text for text, _ in outputs], ['phrase 0', 'phrase 1', 'phrase 2'])
+        self.assertEqual(outputs[0][1], ['analysed phrase 0'])
+        self.assertEqual(stats['phrases'], 3)
+        self.assertEqual(stats['completed'], 3)
+        self.assertEqual(stats['dropped_bytes'], 0)
+
+    def test_audio_factory_receives_source_format(self):
+        seen = []
+
+        def recognize(audio):
+            seen.append(audio)
+            return "x", False
+
+        self.run_pipeline(recognize)
+        frames, rate, width = seen[0]
+        self.assertEqual((rate, width), (RATE, 2))
+        self.assertGreater(len(frames), len(tone(0.6)))
+
+    def test_recognition_overlaps_with_output(self):
+        events = []
+        lock = threading.Lock()
+
+        def recognize(audio):
+            with lock:
+                events.append(('recognize', time.perf_counter()))
+            return "x", False
+
+        def output(text, is_hindi, lines):
+            start = time.perf_counter()
+            time.sleep(0.2)
+            with lock:
+                events.append(('output', start))
+
+        stats, _ = self.run_pipeline(recognize, output=output)
+        recognised = sorted(t for kind, t in events if kind == 'recognize')
+        first_output = min(t for kind, t in events if kind == 'output')
+        self.assertEqual(stats['completed'], 3)
+        # The later phrases were recognised while the first was still being output.
+        self.assertLess(recognised[2], first_output + 0.2)
+
+    def test_failed_phrase_is_reported_and_skipped(self):
+        errors = []
+        count = iter(range(100))
+
+        def recognize(audio):
+            n = next(count)
+            if n == 1:
+                raise ValueError("unintelligible")
+            return f"phrase {n}", False
+
+        stats, outputs = self.run_pipeline(recognize, on_error=lambda stage, exc: errors.append(stage))
+        self.assertEqual([text for text, _ in outputs], ['phrase 0', 'phrase 2'])
+        self.assertEqual(errors, ['recognize'])
+        self.assertEqual(stats['errors'], 1)
+
+    def test_gate_drops_audio(self):
+        stats, outputs = self.run_pipeline(lambda audio: ("x", False), gate=lambda: True)
+        self.assertEqual(outputs, [])
+        self.assertGreater(stats['gated_chunks'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for budgeted spoken summaries.
+"""
+import unittest
+from unittest.mock import patch
+
+from visual_assistant import visually
+from visual_assistant.summary import (
+    MORE_DETAILS_HINT, is_detail_request, speaking_seconds, summarize,
+)
+
+DESCRIPTION = [
+    "Number of sentences: 2",
+    "\nAnalysing sentence 1: John took the red tablets to the hospital.",
+    "Proper noun, singular: John",
+    "Verb, past tense: took",
+    "Determiner: the, the",
+    "Adjective: red",
+    "Noun, plural: tablets",
+    "Preposition/subordinating conjunction: to",
+    "Noun, singular: hospital",
+    "Named entities: PERSON: John",
+    "Sentiment: neutral (compound=0.00, pos=0.00, neg=0.00, neu=1.00)",
+    "\nAnalysing sentence 2: I feel much better today.",
+    "Personal pronoun: I",
+    "Verb, non-3rd person singular present: feel",
+    "Adverb: much",
+    "Adjective, comparative: better",
+    "Noun, singular: today",
+    "Sentiment: positive (compound=0.44, pos=0.49, neg=0.00, neu=0.51)",
+]
+
+
+class TestSummarize(unittest.TestCase):
+
+    def test_tight_budget_keeps_names_and_nouns_first(self):
+        spoken = summarize(DESCRIPTION, max_seconds=12)
+        text = ' | '.join(spoken)
+        self.assertIn("named entities: PERSON: John", text)
+        self.assertIn("proper noun, singular: John", text)
+        self.assertIn("noun, plural: tablets", text)
+        self.assertNotIn("Determiner", text)
+        self.assertNotIn("preposition", text)
+        self.assertEqual(spoken[-1], MORE_DETAILS_HINT)
+        self.assertLessEqual(sum(speaking_seconds(line) for line in spoken), 12)
+
+    def test_lines_keep_their_original_order(self):
+        spoken = summarize(DESCRIPTION, max_seconds=12)[:-1]
+        lowered = [line.lower() for line in DESCRIPTION]
+        positions = [lowered.index(s.split(', ', 1)[1].lower()) for s in spoken]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_no_budget_drops_only_headers_and_scores(self):
+        spoken = summarize(DESCRIPTION, max_seconds=None)
+        self.assertNotIn(MORE_DETAILS_HINT, spoken)
+        self.assertFalse(any('Analysing sentence' in s or 'Number of sentences' in s for s in spoken))
+        self.assertIn("Sentence 2, sentiment: positive", spoken)
+        self.assertEqual(len(spoken), len(DESCRIPTION) - 3)
+
+    def test_single_sentence_has_no_sentence_prefix(self):
+        spoken = summarize(["\nAnalysing sentence 1: Hi John.", "Proper noun, singular: John"],
+                           max_seconds=None)
+        self.assertEqual(spoken, ["Proper noun, singular: John"])
+
+    def test_long_word_list_is_truncated(self):
+        lines = ["Noun, plural: " + ', '.join(f"word{i}" for i in range(40))]
+        spoken = summarize(lines, max_seconds=None, max_chars=120)
+        self.assertRegex(spoken[0], r"^Noun, plural: word0, .* and \d+ more$")
+        self.assertEqual(spoken[-1], MORE_DETAILS_HINT)
+
+    def test_only_category_lines_get_a_sentence_prefix(self):
+        lines = DESCRIPTION[:12] + ["Note: Named entity recognition unavailable."] + DESCRIPTION[12:]
+        spoken = summarize(lines, max_seconds=None)
+        self.assertIn("Note: Named entity recognition unavailable.", spoken)
+        self.assertIn("Sentence 2, noun, singular: today", spoken)
+        self.assertFalse(any(s.startswith("Sentence") and "note:" in s for s in spoken))
+
+    def test_analysis_notes_are_always_kept(self):
+        spoken = summarize(["Note: Basic text analysis failed.", "Words found: a, b"], max_seconds=5)
+        self.assertEqual(spoken, ["Note: Basic text analysis failed."])
+
+
+class TestDetailRequest(unittest.TestCase):
+
+    def test_recognises_requests(self):
+        for text in ("More details", "more details.", "  Full analysis!", "पूरा विवरण"):
+            self.assertTrue(is_detail_request(text), text)
+
+    def test_ordinary_speech_is_not_a_request(self):
+        for text in ("I want more details about the train", "", None):
+            self.assertFalse(is_detail_request(text))
+
+
+class TestAssistantVerbosity(unittest.TestCase):
+
+    def setUp(self):
+        self.assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(self.assistant.speech.close)
+        self.spoken = []
+        patcher = patch.object(self.assistant, 'speak',
+                               side_effect=lambda text, is_hindi=False, **kw: self.spoken.append(text))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(self.assistant.pipeline, 'describe', return_value=DESCRIPTION)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_summary_mode_speaks_less_but_returns_everything(self):
+        self.assistant.verbosity = 'summary'
+        self.assistant.speech_budget = 12
+        result = self.assistant.process_text("John took the red tablets to the hospital.")
+        self.assertEqual(result, DESCRIPTION)
+        self.assertLess(len(self.spoken), len(DESCRIPTION))
+        self.assertEqual(self.spoken[-1], MORE_DETAILS_HINT)
+
+        self.spoken.clear()
+        self.assertTrue(self.assistant.speak_details())
+        self.assertEqual(self.spoken, DESCRIPTION)
+
+    def test_full_mode_is_unchanged(self):
+        self.assistant.verbosity = 'full'
+        self.assistant.process_text("John took the red tablets to the hospital.")
+        self.assertEqual(self.spoken, DESCRIPTION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Tests for batch translation and the pluggable translation backends."""
+import json
+import os
+import tempfile
+import threading
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import visually
+from visual_assistant.translation import (DictionaryBackend, GoogleTranslateBackend,
+                                          HTTPTranslateBackend, TranslationBackend, load_backend)
+
+
+class FakeGoogle:
+    """googletrans-like client that upper-cases each line; counts requests."""
+
+    def __init__(self, drop_lines=False):
+        self.requests = []
+        self.drop_lines = drop_lines
+
+    def translate(self, text, src='hi', dest='en'):
+        self.requests.append(text)
+        lines = text.split('\n')
+        if self.drop_lines and len(lines) > 1:
+            lines = lines[:-1]
+        return types.SimpleNamespace(text='\n'.join(line.upper() for line in lines))
+
+
+class CountingBackend(TranslationBackend):
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.resets = 0
+
+    def translate_many(self, texts, src='hi', dest='en'):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise OSError("offline")
+        return [f"EN {text}" for text in texts]
+
+    def reset(self):
+        self.resets += 1
+
+
+class TestGoogleBackend(unittest.TestCase):
+
+    def test_lines_are_sent_in_one_request(self):
+        client = FakeGoogle()
+        backend = GoogleTranslateBackend(lambda: client)
+        out = backend.translate_many(["\nAnalysing sentence 1: नमस्ते", "", "Noun: दवा "])
+        self.assertEqual(client.requests, ["Analysing sentence 1: नमस्ते\nNoun: दवा"])
+        self.assertEqual(out, ["\nANALYSING SENTENCE 1: नमस्ते", "", "NOUN: दवा "])
+
+    def test_mismatched_reply_falls_back_to_one_per_line(self):
+        client = FakeGoogle(drop_lines=True)
+        out = GoogleTranslateBackend(lambda: client).translate_many(["a", "b"])
+        self.assertEqual(out, ["A", "B"])
+        self.assertEqual(len(client.requests), 3)
+
+
+class TestDictionaryBackend(unittest.TestCase):
+
+    def test_longest_phrase_wins_and_unknown_words_pass_through(self):
+        backend = DictionaryBackend({'दवा': 'medicine', 'दो बार': 'twice', 'दो': 'two', 'लो': 'take'})
+        self.assertEqual(backend.translate("दो बार दवा लो।"), "twice medicine take.")
+        self.assertEqual(backend.translate("Noun, singular: दो"), "Noun, singular: two")
+
+    def test_tsv_and_json_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tsv = os.path.join(tmp, 'hi-en.tsv')
+            with open(tsv, 'w', encoding='utf-8') as fh:
+                fh.write("# hindi\tenglish\nनमस्ते\thello\nदुनिया\tworld\n")
+            path = os.path.join(tmp, 'hi-en.json')
+            with open(path, 'w', encoding='utf-8') as fh:
+                json.dump({'नमस्ते': 'hi'}, fh, ensure_ascii=False)
+            self.assertEqual(load_backend('dictionary:' + tsv).translate("नमस्ते दुनिया"), "hello world")
+            self.assertEqual(load_backend('dictionary:' + path).translate("नमस्ते"), "hi")
+
+    def test_unknown_spec(self):
+        with self.assertRaises(ValueError):
+            load_backend('deepl')
+
+
+class _LibreTranslate(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append(payload)
+        body = json.dumps({'translatedText': [f"<{q}>" for q in payload['q']]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+class TestHTTPBackend(unittest.TestCase):
+
+    def test_batch_is_one_request_to_a_local_server(self):
+        server = HTTPServer(('127.0.0.1', 0), _LibreTranslate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        backend = load_backend(f"http://127.0.0.1:{server.server_port}/translate")
+        self.assertIsInstance(backend, HTTPTranslateBackend)
+        self.assertEqual(backend.translate_many(["एक", "दो"]), ["<एक>", "<दो>"])
+        self.assertEqual(_LibreTranslate.requests[-1],
+                         {'q': ["एक", "दो"], 'source': 'hi', 'target': 'en', 'format': 'text'})
+
+
+class TestSafeTranslateMany(unittest.TestCase):
+
+    def setUp(self):
+        visually._translation_cache.clear()
+        self.addCleanup(visually._translation_cache.clear)
+
+    def test_only_uncached_texts_are_sent_once(self):
+        backend = CountingBackend()
+        with patch.object(visually, '_translation_backend', backend):
+            visually._safe_translate("एक")
+            out = visually._safe_translate_many(["एक", "दो", "दो", "तीन"])
+        self.assertEqual(out, ["EN एक", "EN दो", "EN दो", "EN तीन"])
+        self.assertEqual(backend.batches, [["एक"], ["दो", "तीन"]])
+
+    def test_failure_returns_originals_uncached(self):
+        backend = CountingBackend(fail=True)
+        with patch.object(visually, '_translation_backend', backend):
+            self.assertEqual(visually._safe_translate_many(["एक", "दो"]), ["एक", "दो"])
+        self.assertEqual(backend.resets, 1)
+        self.assertIsNone(visually._translation_cache.get(("एक", 'hi', 'en')))
+
+    def test_hindi_description_is_translated_in_one_round_trip(self):
+        backend = CountingBackend()
+        assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(assistant.speech.close)
+        assistant.speech.say = MagicMock()
+        lines = [f"Noun, singular: शब्द{i}" for i in range(12)]
+        with patch.object(visually, '_translation_backend', backend):
+            assistant.speak_lines(lines, is_hindi=True)
+        self.assertEqual(len(backend.batches), 1)
+        self.assertEqual([c.args[0] for c in assistant.speech.say.call_args_list],
+                         [f"EN {line}" for line in lines])
+
+    def test_failed_batch_is_not_retried_line_by_line(self):
+        backend = CountingBackend(fail=True)
+        assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(assistant.speech.close)
+        assistant.speech.say = MagicMock()
+        lines = [f"Noun, singular: शब्द{i}" for i in range(10)]
+        with patch.object(visually, '_translation_backend', backend):
+            assistant.speak_lines(lines, is_hindi=True)
+        self.assertEqual(len(backend.batches), 1)
+        self.assertEqual([c.args[0] for c in assistant.speech.say.call_args_list], lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
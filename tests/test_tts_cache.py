@@ -0,0 +1,164 @@
+"""
+Tests for pre-rendered speech clips, with a fake engine and player.
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from visual_assistant import visually
+from visual_assistant.tts_cache import TTSCache
+
+SETTINGS = (150, 0.9, 'voice-1')
+
+
+class RenderingEngine:
+    """pyttsx3-shaped engine: save_to_file writes a clip on runAndWait."""
+
+    def __init__(self, clip_bytes=1000):
+        self.clip_bytes = clip_bytes
+        self.spoken = []
+        self.rendered = []
+        self._say = []
+        self._save = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return 'voice-1'
+
+    def say(self, text):
+        self._say.append(text)
+
+    def save_to_file(self, text, path):
+        self._save.append((text, path))
+
+    def runAndWait(self):
+        self.spoken.extend(self._say)
+        for text, path in self._save:
+            with open(path, 'wb') as fh:
+                fh.write(b'\0' * self.clip_bytes)
+            self.rendered.append(text)
+        self._say, self._save = [], []
+
+    def stop(self):
+        pass
+
+
+class FakePlayer:
+    available = True
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, path):
+        self.played.append(os.path.basename(path))
+        return True
+
+    def stop(self):
+        pass
+
+
+class TestTTSCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = os.path.join(self.tmp.name, 'clips')
+
+    def test_render_then_hit(self):
+        cache = TTSCache(self.dir, player=FakePlayer())
+        self.assertIsNone(cache.lookup("Ready for next input.", SETTINGS))
+        path = cache.render(RenderingEngine(), "Ready for next input.", SETTINGS)
+        self.assertTrue(os.path.isfile(path))
+        self.assertEqual(cache.lookup("Ready for next input.", SETTINGS), path)
+        self.assertEqual(cache.stats()['renders'], 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_key_covers_rate_volume_and_voice(self):
+        keys = {TTSCache.key("hello", s) for s in
+                (SETTINGS, (200, 0.9, 'voice-1'), (150, 0.5, 'voice-1'), (150, 0.9, 'voice-2'))}
+        self.assertEqual(len(keys), 4)
+
+    def test_size_bound_evicts_least_recently_played(self):
+        cache = TTSCache(self.dir, max_bytes=2500, player=FakePlayer())
+        engine = RenderingEngine(clip_bytes=1000)
+        first = cache.render(engine, "first", SETTINGS)
+        cache.render(engine, "second", SETTINGS)
+        cache.lookup("first", SETTINGS)           # first is now more recent than second
+        cache.render(engine, "third", SETTINGS)
+        self.assertIsNotNone(cache.lookup("first", SETTINGS))
+        self.assertIsNone(cache.lookup("second", SETTINGS))
+        self.assertTrue(os.path.isfile(first))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], 2500)
+
+    def test_clips_survive_restart(self):
+        TTSCache(self.dir, player=FakePlayer()).render(RenderingEngine(), "Listening", SETTINGS)
+        self.assertIsNotNone(TTSCache(self.dir, player=FakePlayer()).lookup("Listening", SETTINGS))
+
+    def test_empty_render_is_not_cached(self):
+        cache = TTSCache(self.dir, player=FakePlayer())
+        self.assertIsNone(cache.render(RenderingEngine(clip_bytes=0), "silent", SETTINGS))
+        self.assertIsNone(cache.lookup("silent", SETTINGS))
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+class TestAssistantClips(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.engine = RenderingEngine()
+        with patch.object(visually.pyttsx3, 'init', return_value=self.engine):
+            self.assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(self.assistant.speech.close)
+        self.player = FakePlayer()
+        self.assistant.tts_cache = TTSCache(os.path.join(tmp.name, 'clips'), player=self.player)
+
+    def wait_for_renders(self):
+        deadline = time.monotonic() + 5
+        while self.assistant._render_queue and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assistant.speech.flush(timeout=5)
+        time.sleep(0.05)  # the last render finishes after the queue empties
+
+    def test_prompts_and_labels_play_from_clips(self):
+        queued = self.assistant.prewarm_speech(["Ready for next input.", "Noun, singular"])
+        self.assertEqual(queued, 2)
+        self.wait_for_renders()
+        self.assertEqual(sorted(self.engine.rendered), ["Noun, singular", "Ready for next input."])
+
+        with patch('sys.stdout'):
+            self.assistant.speak("Ready for next input.")
+            self.assistant.speak("Noun, singular: doctor, mother")
+            self.assistant.speak("Something new")
+        self.assistant.speech.flush(timeout=5)
+
+        self.assertEqual(len(self.player.played), 2)
+        self.assertEqual(self.engine.spoken, ["doctor, mother", "Something new"])
+        self.assertEqual(self.assistant.prewarm_speech(["Ready for next input."]), 0)
+
+    def test_repeated_lines_are_rendered_after_a_few_uses(self):
+        with patch('sys.stdout'):
+            for _ in range(visually.RENDER_AFTER_USES):
+                self.assistant.speak("Please wait.")
+                self.assistant.speech.flush(timeout=5)
+            self.wait_for_renders()
+            self.assistant.speak("Please wait.")
+        self.assistant.speech.flush(timeout=5)
+        self.assertEqual(self.engine.rendered, ["Please wait."])
+        self.assertEqual(len(self.player.played), 1)
+
+    def test_without_cache_everything_is_live(self):
+        self.assistant.tts_cache = None
+        with patch('sys.stdout'):
+            self.assistant.speak("Ready for next input.")
+        self.assistant.speech.flush(timeout=5)
+        self.assertEqual(self.engine.spoken, ["Ready for next input."])
+
+
+if __name__ == '__main__':
+    unittest.main()
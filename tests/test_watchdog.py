@@ -0,0 +1,131 @@
+"""Tests for the memory/turn watchdog and component recycling."""
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from visual_assistant import visually
+from visual_assistant.recognition import GoogleRecognizer
+from visual_assistant.watchdog import Watchdog, current_rss
+
+MIB = 1024 * 1024
+
+
+class TestWatchdog(unittest.TestCase):
+
+    def test_recycles_every_n_turns(self):
+        calls = []
+        watchdog = Watchdog(max_turns=3, rss=lambda: None)
+        watchdog.register('a', lambda: calls.append('a'))
+        watchdog.register('b', lambda: calls.append('b'))
+        reasons = [watchdog.turn() for _ in range(7)]
+        self.assertEqual(reasons, [None, None, 'turns', None, None, 'turns', None])
+        self.assertEqual(calls, ['a', 'b', 'a', 'b'])
+        self.assertEqual(watchdog.stats()['recycles'], 2)
+
+    def test_memory_ceiling_with_cooldown(self):
+        rss = [100 * MIB]
+        watchdog = Watchdog(max_rss_mb=50, check_every=2, cooldown=4, rss=lambda: rss[0])
+        reasons = [watchdog.turn() for _ in range(8)]
+        # Sampled on even turns; after the first recycle RSS stays high, so the
+        # next one waits out the cooldown.
+        self.assertEqual(reasons, [None, 'memory', None, None, None, 'memory', None, None])
+        rss[0] = 10 * MIB
+        self.assertEqual([watchdog.turn() for _ in range(6)], [None] * 6)
+        self.assertEqual(watchdog.last_rss, 10 * MIB)
+
+    def test_failed_component_does_not_stop_the_others(self):
+        done = []
+        watchdog = Watchdog(rss=lambda: None)
+        watchdog.register('broken', MagicMock(side_effect=RuntimeError("boom")))
+        watchdog.register('fine', lambda: done.append(True))
+        self.assertEqual(watchdog.recycle(), ['broken'])
+        self.assertEqual(done, [True])
+
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            watchdog = Watchdog.from_env()
+        self.assertFalse(watchdog.enabled)
+        with patch.dict(os.environ, {'VA_MAX_RSS_MB': '512', 'VA_RECYCLE_TURNS': '1000'}):
+            watchdog = Watchdog.from_env()
+        self.assertEqual((watchdog.max_rss, watchdog.max_turns), (512 * MIB, 1000))
+
+    def test_current_rss(self):
+        rss = current_rss()
+        if rss is None:
+            self.skipTest("RSS not available on this platform")
+        self.assertGreater(rss, MIB)
+
+
+class TestAssistantRecycling(unittest.TestCase):
+
+    def setUp(self):
+        self.assistant = visually.VisuallyImpairedAssistant(microphone=False)
+        self.addCleanup(self.assistant.speech.close)
+        self.assistant.tts_cache = None
+
+    def test_tts_engine_is_rebuilt_on_the_speech_worker(self):
+        old, new = MagicMock(), MagicMock()
+        self.assistant.engine = old
+        with patch.object(self.assistant, '_new_engine', return_value=new):
+            self.assistant.recycle_tts()
+            self.assertIs(self.assistant.engine, old)
+            self.assistant._speak_batch(["hello"])
+        old.stop.assert_called_once()
+        self.assertIs(self.assistant.engine, new)
+        new.say.assert_called_once_with("hello")
+
+    def test_stalled_engine_is_replaced_and_counted(self):
+        old, new = MagicMock(), MagicMock()
+        old.runAndWait.side_effect = RuntimeError("stalled")
+        self.assistant.engine = old
+        with patch.object(self.assistant, '_new_engine', return_value=new), \
+                patch.object(visually.METRICS, 'inc') as inc:
+            self.assistant._speak_batch(["hello"])
+        inc.assert_called_once_with('tts_reinit')
+        new.say.assert_called_once_with("hello")
+
+    def test_failed_rebuild_is_retried_before_the_next_batch(self):
+        new = MagicMock()
+        self.assistant.recycle_tts()
+        with patch.object(self.assistant, '_new_engine', side_effect=[RuntimeError("no driver"), new]):
+            self.assistant._speak_batch(["lost"])
+            self.assertIsNone(self.assistant.engine)
+            self.assistant._speak_batch(["hello"])
+        self.assertIs(self.assistant.engine, new)
+
+    def test_recognizer_keeps_its_calibration(self):
+        self.assistant.recognizer.energy_threshold = 412.0
+        self.assistant.recognizer_backend = GoogleRecognizer(self.assistant.recognizer)
+        old = self.assistant.recognizer
+        self.assistant.recycle_recognizer()
+        self.assertIsNot(self.assistant.recognizer, old)
+        self.assertEqual(self.assistant.recognizer.energy_threshold, 412.0)
+        self.assertIs(self.assistant.calibrator.recognizer, self.assistant.recognizer)
+        self.assertIs(self.assistant.recognizer_backend.recognizer, self.assistant.recognizer)
+
+    def test_nlp_pipeline_keeps_cache_and_hindi_mode(self):
+        self.assistant.hindi_mode = 'translate'
+        old = self.assistant.pipeline
+        with patch.object(visually, 'load_sentiment_analyzer', return_value='vader'):
+            self.assistant.recycle_nlp()
+        self.assertIsNot(self.assistant.pipeline, old)
+        self.assertIs(self.assistant.pipeline.cache, old.cache)
+        self.assertEqual(self.assistant.hindi_mode, 'translate')
+        self.assertEqual(self.assistant.pipeline.sentiment_analyzer, 'vader')
+
+    def test_session_survives_a_recycle_mid_stream(self):
+        self.assistant.watchdog = Watchdog(max_turns=2, rss=lambda: None)
+        self.assistant.watchdog.register('nlp', self.assistant.recycle_nlp)
+        with patch.object(self.assistant, 'speak'), \
+                patch.object(visually.AnalysisPipeline, 'describe', return_value=["Noun, singular: x"]):
+            self.assistant._analyse_phrase("first", False)
+            self.assistant._analyse_phrase("second", False)
+        self.assertEqual(self.assistant.watchdog.recycles, 1)
+        self.assertEqual(self.assistant.last_description, ["Noun, singular: x"])
+        with patch.object(self.assistant, 'speak') as speak:
+            self.assertTrue(self.assistant.speak_details())
+        speak.assert_called_once_with("Noun, singular: x", False)
+
+
+if __name__ == '__main__':
+    unittest.main()